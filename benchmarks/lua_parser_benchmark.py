@@ -0,0 +1,106 @@
+"""
+Benchmark of the package LUA parser on large synthetic files.
+
+Compares the single-pass tokenizer (core.lua_parser) with the previous
+regex-per-match implementation on LUA files of a few megabytes with
+thousands of depot and DLC entries.
+
+Usage (from the repository root):
+    python benchmarks/lua_parser_benchmark.py [--dlcs 20000] [--depots 2000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.lua_parser import parse_lua  # noqa: E402
+
+
+def legacy_parse_lua(content, game_data):
+    """The parser ProcessZipTask used before the tokenizer"""
+    all_app_matches = list(re.finditer(r'addappid\((.*?)\)(.*)', content, re.IGNORECASE))
+    if not all_app_matches:
+        raise ValueError("LUA file is invalid; no 'addappid' entries found.")
+
+    first_app_match = all_app_matches.pop(0)
+    first_app_args = first_app_match.group(1).strip()
+    game_data['appid'] = first_app_args.split(',')[0].strip()
+
+    comment_part = first_app_match.group(2)
+    game_name_match = re.search(r'--\s*(.*)', comment_part)
+    game_data['game_name'] = game_name_match.group(1).strip() if game_name_match else f"App_{game_data['appid']}"
+
+    game_data['depots'] = {}
+    game_data['dlcs'] = {}
+    for match in all_app_matches:
+        args_str = match.group(1).strip()
+        args = [arg.strip() for arg in args_str.split(',')]
+        app_id = args[0]
+
+        comment_part = match.group(2)
+        desc_match = re.search(r'--\s*(.*)', comment_part)
+        desc = desc_match.group(1).strip() if desc_match else f"Depot {app_id}"
+
+        if len(args) > 2 and args[2].strip('"'):
+            depot_key = args[2].strip('"')
+            game_data['depots'][app_id] = {'key': depot_key, 'desc': desc}
+        else:
+            game_data['dlcs'][app_id] = desc
+
+
+def generate_lua(depots, dlcs, seed=0):
+    rng = random.Random(seed)
+    lines = ["addappid(1000000) -- Benchmark Game: Definitive Edition"]
+    for i in range(depots):
+        depot_id = 1000001 + i
+        key = "".join(rng.choice("0123456789abcdef") for _ in range(64))
+        lines.append(f'addappid({depot_id},1,"{key}") -- Benchmark Game Content {i}')
+        lines.append(f'setManifestid({depot_id},"{rng.getrandbits(63)}",{rng.getrandbits(33)})')
+    for i in range(dlcs):
+        lines.append(f"addappid({2000000 + i}) -- Benchmark Game - Cosmetic Pack #{i} (Deluxe)")
+    lines.append('addtoken(1000000,"1234567890123456789")')
+    return "\n".join(lines) + "\n"
+
+
+def best_of(repeat, func):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--depots", type=int, default=2000)
+    parser.add_argument("--dlcs", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    content = generate_lua(args.depots, args.dlcs)
+    print(
+        f"LUA file: {len(content) / 1024 / 1024:.1f} MB, "
+        f"{content.count(chr(10))} lines, {args.depots} depots, {args.dlcs} DLCs"
+    )
+
+    legacy_time = best_of(args.repeat, lambda: legacy_parse_lua(content, {}))
+    new_time = best_of(args.repeat, lambda: parse_lua(content).apply({}))
+
+    legacy_data, new_data = {}, {}
+    legacy_parse_lua(content, legacy_data)
+    parse_lua(content).apply(new_data)
+    same = all(legacy_data[key] == new_data[key] for key in ("appid", "game_name", "depots", "dlcs"))
+
+    print(f"legacy regex parser: {legacy_time * 1000:8.1f} ms")
+    print(f"tokenizer:           {new_time * 1000:8.1f} ms ({legacy_time / new_time:.2f}x)")
+    print(f"same depots/DLCs:    {same}")
+
+
+if __name__ == "__main__":
+    main()
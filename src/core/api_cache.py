@@ -0,0 +1,180 @@
+"""
+API Cache - Single-file SQLite store for Steam API responses
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+from utils.logger import get_internationalized_logger
+
+logger = get_internationalized_logger()
+
+API_CACHE_FILENAME = "api_cache.sqlite"
+# Reads only move an entry up the LRU order when its access time is older
+# than this, so hot lookups stay read-only
+ACCESS_TIME_RESOLUTION = 3600
+
+
+class ApiCache:
+    """
+    Key/value cache of JSON values in one SQLite file.
+
+    Every entry carries its own expiry (or none, for data that never
+    changes), an optional grace period during which it is still returned
+    but flagged stale, so callers can serve it while they refresh it, and
+    the time it was last read (to within ``ACCESS_TIME_RESOLUTION``, so
+    most reads do not write). Lookups are primary key queries; when the
+    values outgrow ``max_size_bytes`` the least recently used entries are
+    evicted down to 80% of the limit.
+
+    Several processes (batch ingest workers) can share the file; the
+    database is in WAL mode and writers wait for each other.
+    """
+
+    def __init__(self, cache_dir: str, max_size_bytes: int):
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, API_CACHE_FILENAME)
+        self.max_size_bytes = max_size_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_size = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if not os.path.exists(self.path):
+            self._remove_legacy_files()
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL, stale_until REAL, accessed_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (accessed_at)")
+        conn.commit()
+        self._total_size = conn.execute("SELECT TOTAL(size) FROM entries").fetchone()[0]
+        self._conn = conn
+        return conn
+
+    def _remove_legacy_files(self):
+        """Drop the one-JSON-file-per-entry cache this store replaces"""
+        removed = 0
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                    removed += 1
+                except OSError:
+                    pass
+        if removed:
+            logger.debug(f"Removed {removed} legacy API cache files")
+
+    def get(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """
+        Cached value of key.
+
+        Returns:
+            tuple: (value, fresh) where fresh is False once the entry's TTL
+                   has passed, or None on a miss or after the grace period
+        """
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, expires_at, stale_until, accessed_at FROM entries WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    return None
+                value, expires_at, stale_until, accessed_at = row
+                now = time.time()
+                if stale_until is not None and stale_until <= now:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    conn.commit()
+                    return None
+                if now - accessed_at > ACCESS_TIME_RESOLUTION:
+                    conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+                    conn.commit()
+                return json.loads(value), expires_at is None or expires_at > now
+            except (sqlite3.Error, ValueError) as e:
+                logger.warning(f"API cache read failed for {key}: {e}")
+                return None
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: Optional[float] = None,
+        stale_seconds: float = 0,
+    ) -> bool:
+        """
+        Store value under key. Without ttl_seconds it never expires;
+        otherwise it is served as stale for stale_seconds after expiring.
+        """
+        try:
+            data = json.dumps(value, separators=(",", ":"))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Cannot cache {key}: {e}")
+            return False
+
+        now = time.time()
+        expires_at = stale_until = None
+        if ttl_seconds is not None:
+            expires_at = now + ttl_seconds
+            stale_until = expires_at + stale_seconds
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, data, len(data), expires_at, stale_until, now),
+                )
+                conn.commit()
+                self._total_size += len(data) - (row[0] if row else 0)
+                if self._total_size > self.max_size_bytes:
+                    self._evict(conn)
+                return True
+            except sqlite3.Error as e:
+                logger.warning(f"API cache write failed for {key}: {e}")
+                return False
+
+    def delete(self, key: str):
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"API cache delete failed for {key}: {e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used entries down to 80% of the size limit"""
+        # Other processes write to the same file, so the running total is
+        # only a hint; recount before evicting
+        self._total_size = conn.execute("SELECT TOTAL(size) FROM entries").fetchone()[0]
+        target = self.max_size_bytes * 0.8
+        if self._total_size <= target:
+            return
+
+        removed = []
+        freed = 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if self._total_size - freed <= target:
+                break
+            removed.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM entries WHERE key = ?", removed)
+        conn.commit()
+        self._total_size -= freed
+        logger.info(
+            f"API cache cleanup: removed {len(removed)} entries, freed {freed / (1024 * 1024):.1f} MB"
+        )
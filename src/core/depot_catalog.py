@@ -0,0 +1,165 @@
+"""
+Depot Catalog - Indexed lookups of known depot descriptions from depots.ini
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional
+
+from utils.logger import get_internationalized_logger
+
+from core.ini_parser import DEPOTS_INI_PATH, iter_depots_ini
+
+logger = get_internationalized_logger()
+
+DEPOT_CATALOG_PATH = "data/depot_catalog.sqlite"
+
+# SQLite's default limit on parameters per statement is 999
+_LOOKUP_BATCH_SIZE = 500
+
+
+class DepotCatalog:
+    """
+    Depot descriptions from depots.ini, indexed in SQLite.
+
+    Nothing is read until the first lookup. The INI is then converted once
+    into an on-disk table keyed by depot id, together with the size and
+    modification time of the INI it came from; later runs open the index
+    directly and only rebuild it when the INI changes. Lookups are point
+    queries, so memory use does not grow with the size of the INI.
+    """
+
+    def __init__(self, ini_path: str = DEPOTS_INI_PATH, index_path: str = DEPOT_CATALOG_PATH):
+        self.ini_path = ini_path
+        self.index_path = index_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._source: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _ini_fingerprint(self) -> Optional[str]:
+        try:
+            stat = os.stat(self.ini_path)
+        except OSError:
+            return None
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _open(self) -> Optional[sqlite3.Connection]:
+        """Connection to an index matching the current INI, or None"""
+        fingerprint = self._ini_fingerprint()
+        if fingerprint is None:
+            if self._source != "missing":
+                logger.warning(f"'{self.ini_path}' not found. Will rely on LUA and API for depot names.")
+            self._close()
+            self._source = "missing"
+            return None
+        if self._conn is not None and self._source == fingerprint:
+            return self._conn
+
+        self._close()
+        try:
+            conn = self._connect()
+            if conn is None or _read_source(conn) != fingerprint:
+                if conn is not None:
+                    conn.close()
+                self._rebuild(fingerprint)
+                conn = self._connect()
+        except (OSError, sqlite3.Error, UnicodeError) as e:
+            logger.error(f"Could not index '{self.ini_path}': {e}", exc_info=True)
+            self._source = fingerprint
+            return None
+
+        self._conn = conn
+        self._source = fingerprint
+        return conn
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not os.path.exists(self.index_path):
+            return None
+        try:
+            conn = sqlite3.connect(self.index_path, check_same_thread=False)
+            _read_source(conn)
+            return conn
+        except sqlite3.Error as e:
+            logger.warning(f"Ignoring unreadable depot catalog {self.index_path}: {e}")
+            return None
+
+    def _rebuild(self, fingerprint: str):
+        """Index the INI into a temporary database and swap it in"""
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        temp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        conn = sqlite3.connect(temp_path)
+        try:
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("CREATE TABLE depots (depot_id INTEGER PRIMARY KEY, description TEXT)")
+            conn.executemany(
+                "INSERT OR REPLACE INTO depots VALUES (?, ?)",
+                ((int(depot_id), description)
+                 for depot_id, description in iter_depots_ini(self.ini_path)
+                 if depot_id.isdigit() and depot_id.isascii()),
+            )
+            conn.execute("INSERT INTO meta VALUES ('source', ?)", (fingerprint,))
+            conn.commit()
+            count = conn.execute("SELECT COUNT(*) FROM depots").fetchone()[0]
+        except BaseException:
+            conn.close()
+            os.remove(temp_path)
+            raise
+        conn.close()
+
+        os.replace(temp_path, self.index_path)
+        logger.info(f"Successfully indexed {count} depot descriptions from '{self.ini_path}'.")
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def describe(self, depot_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Known descriptions of the given depots.
+
+        Returns:
+            dict: Description per depot id, for the ids found in depots.ini
+        """
+        ids = [int(depot_id) for depot_id in depot_ids
+               if str(depot_id).isdigit() and str(depot_id).isascii()]
+        if not ids:
+            return {}
+
+        descriptions = {}
+        with self._lock:
+            conn = self._open()
+            if conn is None:
+                return {}
+            try:
+                for start in range(0, len(ids), _LOOKUP_BATCH_SIZE):
+                    batch = ids[start:start + _LOOKUP_BATCH_SIZE]
+                    rows = conn.execute(
+                        "SELECT depot_id, description FROM depots WHERE depot_id IN "
+                        f"({','.join('?' * len(batch))})",
+                        batch,
+                    )
+                    for depot_id, description in rows:
+                        descriptions[str(depot_id)] = description
+            except sqlite3.Error as e:
+                logger.error(f"Depot catalog lookup failed: {e}")
+                self._close()
+                self._source = None
+        return descriptions
+
+    def get(self, depot_id: str, default: Optional[str] = None) -> Optional[str]:
+        return self.describe([depot_id]).get(str(depot_id), default)
+
+
+def _read_source(conn: sqlite3.Connection) -> Optional[str]:
+    row = conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+    return row[0] if row else None
+
+
+depot_catalog = DepotCatalog()
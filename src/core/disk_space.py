@@ -0,0 +1,208 @@
+"""
+Disk Space - Pre-flight space check and file preallocation for downloads
+"""
+
+import errno
+import os
+import shutil
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.logger import get_internationalized_logger
+
+from .tasks.installed_manifests import (
+    install_dir_for,
+    installed_manifests,
+    plan_update,
+    read_manifest_files,
+)
+from .tasks.workspace import SessionWorkspace
+
+logger = get_internationalized_logger()
+
+# Room left for DepotDownloaderMod's staging files and the filesystem
+SAFETY_MARGIN_BYTES = 512 * 1024 * 1024
+# Smaller files are left to DepotDownloaderMod; fragmentation only
+# matters for the big archives
+PREALLOCATE_MIN_FILE_SIZE = 64 * 1024 * 1024
+# EDepotFileFlag.Directory
+DIRECTORY_FLAG = 64
+
+
+@dataclass
+class SpaceCheck:
+    """Outcome of a pre-flight disk space check"""
+
+    path: str
+    required: int  # bytes the selected depots still need, margin included
+    free: int  # bytes available to the user on the target filesystem
+    unknown_depots: List[str] = field(default_factory=list)  # no size known
+    on_disk: int = 0  # bytes of the selected depots already installed
+
+    @property
+    def enough(self) -> bool:
+        return self.free >= self.required
+
+    @property
+    def missing(self) -> int:
+        return max(0, self.required - self.free)
+
+
+def depot_required_bytes(game_data: Dict[str, Any], depot_id: str) -> int:
+    """
+    Size on disk of one depot: from its manifest when it was decoded,
+    otherwise from the sizes reported by Steam. 0 when unknown.
+    """
+    summary = game_data.get("manifest_info", {}).get(str(depot_id))
+    if summary and summary.get("size"):
+        return int(summary["size"])
+    return int(game_data.get("depot_sizes", {}).get(str(depot_id), 0) or 0)
+
+
+def _remaining_bytes(game_data: Dict[str, Any], depot_id: str, install_dir: str) -> Optional[int]:
+    """
+    Bytes of one depot not on disk yet, or None when that cannot be told
+    from its manifest.
+
+    With a recorded install the update plan says what will be downloaded.
+    Otherwise files already in install_dir (a resumed download) count with
+    the size they have.
+    """
+    manifest_id = game_data.get("manifests", {}).get(depot_id)
+    workspace = SessionWorkspace.from_game_data(game_data)
+    if not manifest_id or not workspace or not os.path.isdir(install_dir):
+        return None
+    manifest_path = workspace.manifest_path(depot_id, manifest_id)
+    if not os.path.exists(manifest_path):
+        return None
+
+    depot_key = game_data.get("depots", {}).get(depot_id, {}).get("key")
+    try:
+        installed = installed_manifests.installed_manifest(install_dir, depot_id)
+        if installed:
+            old_manifest_id, old_manifest_path = installed
+            return plan_update(
+                depot_id,
+                old_manifest_id,
+                old_manifest_path,
+                manifest_id,
+                manifest_path,
+                install_dir,
+                depot_key,
+                installed_manifests.repair_files(install_dir, depot_id),
+            ).download_size
+
+        remaining = 0
+        for filename, manifest_file in read_manifest_files(manifest_path, depot_key).items():
+            try:
+                on_disk = os.stat(os.path.join(install_dir, filename)).st_size
+            except OSError:
+                on_disk = 0
+            remaining += max(0, manifest_file.size - on_disk)
+        return remaining
+    except Exception as e:
+        logger.debug(f"Counting depot {depot_id} at full size: {e}")
+        return None
+
+
+def _existing_parent(path: str) -> str:
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def check_disk_space(
+    game_data: Dict[str, Any], selected_depots: Iterable[str], dest_path: str
+) -> SpaceCheck:
+    """
+    Compare the space the selected depots still need with what dest_path
+    has free. Bytes already in the game's install directory are not
+    counted again; depots with nothing installed count at full size.
+    """
+    install_dir = install_dir_for(game_data, dest_path)
+    required = 0
+    on_disk = 0
+    unknown = []
+    for depot_id in selected_depots:
+        size = depot_required_bytes(game_data, depot_id)
+        remaining = _remaining_bytes(game_data, depot_id, install_dir)
+        if remaining is not None:
+            required += remaining
+            on_disk += max(0, size - remaining)
+        elif size:
+            required += size
+        else:
+            unknown.append(str(depot_id))
+
+    free = shutil.disk_usage(_existing_parent(dest_path)).free
+    check = SpaceCheck(
+        path=dest_path,
+        required=required + SAFETY_MARGIN_BYTES if required else 0,
+        free=free,
+        unknown_depots=unknown,
+        on_disk=on_disk,
+    )
+    logger.debug(
+        f"Disk space pre-flight for {dest_path}: need {check.required} bytes, "
+        f"{on_disk} already on disk, {free} free, unknown sizes for {unknown or 'no'} depots"
+    )
+    return check
+
+
+def preallocate_depot_files(manifest_path: str, install_dir: str) -> int:
+    """
+    Reserve disk space for the large files of a depot before it downloads.
+
+    Files listed in the manifest that do not exist yet and are at least
+    PREALLOCATE_MIN_FILE_SIZE are created at full size with
+    posix_fallocate, so they are laid out contiguously and a full disk
+    shows up as ENOSPC now rather than at 95%. Does nothing on platforms
+    without posix_fallocate.
+
+    Returns:
+        int: Bytes preallocated
+
+    Raises:
+        OSError: ENOSPC when the files do not fit; other errors are logged
+    """
+    if not hasattr(os, "posix_fallocate"):
+        return 0
+
+    try:
+        from steam.core.manifest import DepotManifest
+
+        with open(manifest_path, "rb") as f:
+            manifest = DepotManifest(f.read())
+    except Exception as e:
+        logger.warning(f"Cannot preallocate from {os.path.basename(manifest_path)}: {e}")
+        return 0
+
+    allocated = 0
+    for mapping in manifest.payload.mappings:
+        if mapping.flags & DIRECTORY_FLAG or mapping.size < PREALLOCATE_MIN_FILE_SIZE:
+            continue
+        # Manifests use Windows separators
+        relative_path = mapping.filename.replace("\\", "/").rstrip("\x00")
+        path = os.path.normpath(os.path.join(install_dir, relative_path))
+        if not path.startswith(os.path.normpath(install_dir) + os.sep) or os.path.exists(path):
+            continue
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            os.posix_fallocate(fd, 0, mapping.size)
+        except OSError as e:
+            os.close(fd)
+            os.remove(path)
+            if e.errno == errno.ENOSPC:
+                raise
+            logger.warning(f"Could not preallocate {relative_path}: {e}")
+            continue
+        os.close(fd)
+        allocated += mapping.size
+
+    return allocated
@@ -831,6 +831,10 @@ class GameManager:
                     else:
                         shutil.rmtree(game_dir, ignore_errors=True)
                         deleted_items.append(f"Game directory: {game_dir}")
+
+                        from core.tasks.installed_manifests import installed_manifests
+
+                        installed_manifests.forget(game_dir)
                         logger.debug(f"Deleted game directory: {game_dir}")
                 except Exception as e:
                     errors.append(f"Failed to delete game directory: {e}")
@@ -1,40 +1,37 @@
-import configparser
 from utils.logger import get_internationalized_logger
-import logging
-import os
 
 logger = get_internationalized_logger()
 
-def parse_depots_ini():
-    """
-    Parses the depots.ini file to create a dictionary of known depot descriptions.
+DEPOTS_INI_PATH = 'config/depots.ini'
 
-    Returns:
-        dict: A dictionary mapping depot IDs (as strings) to their descriptions.
-              Returns an empty dictionary if the file is not found or is invalid.
+def iter_depots_ini(ini_path=DEPOTS_INI_PATH):
     """
-    ini_path = 'config/depots.ini'
-    depot_descriptions = {}
+    Streams the [depots] section of a depots.ini file.
 
-    if not os.path.exists(ini_path):
-        logger.warning(f"'{ini_path}' not found. Will rely on LUA and API for depot names.")
-        return depot_descriptions
+    The file is read line by line rather than through configparser, so
+    community files with hundreds of thousands of entries never have to
+    be held in memory at once. Keys are lower-cased, both "=" and ":"
+    separate keys from values, and lines starting with "#" or ";" are
+    comments, as with configparser.
 
-    try:
-        config = configparser.ConfigParser()
-        # Read the file with 'utf-8' encoding to handle a wide range of characters.
-        config.read(ini_path, encoding='utf-8')
-        
-        if 'depots' in config:
-            for depot_id, description in config['depots'].items():
-                depot_descriptions[depot_id] = description.strip()
-            logger.info(f"Successfully parsed {len(depot_descriptions)} depot descriptions from '{ini_path}'.")
-        else:
-            logger.warning(f"No [depots] section found in '{ini_path}'.")
+    Yields:
+        tuple: (depot_id, description) pairs, as strings.
+    """
+    in_depots = False
+    with open(ini_path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] in '#;':
+                continue
+            if line[0] == '[' and line[-1] == ']':
+                in_depots = line[1:-1].strip().lower() == 'depots'
+                continue
+            if not in_depots:
+                continue
 
-    except configparser.Error as e:
-        logger.error(f"Error parsing '{ini_path}': {e}", exc_info=True)
-    except Exception as e:
-        logger.error(f"An unexpected error occurred while reading '{ini_path}': {e}", exc_info=True)
-        
-    return depot_descriptions
+            eq = line.find('=')
+            colon = line.find(':')
+            sep = min(eq, colon) if eq >= 0 and colon >= 0 else max(eq, colon)
+            if sep <= 0:
+                continue
+            yield line[:sep].strip().lower(), line[sep + 1:].strip()
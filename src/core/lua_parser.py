@@ -0,0 +1,237 @@
+"""
+LUA Parser - Single-pass tokenizer for the LUA file of a game package
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.logger import get_internationalized_logger
+
+logger = get_internationalized_logger()
+
+# One line. The first alternative is the common addappid(id[, flag, "key"])
+# with an optional comment, already split into id, key and comment; the
+# second is any single directive call and/or "-- comment". Lines that do
+# not fit (several calls, stray text...) land in the last group and go
+# through the general tokenizer.
+LINE_PATTERN = re.compile(
+    r'^addappid\((\d+)(?:,[ \t]*\w*[ \t]*,[ \t]*"([^"\n]*)")?\)[ \t\r]*(?:--[ \t]*([^\n]*))?$'
+    r'|^[ \t]*(?:([A-Za-z_]\w*)[ \t]*\(([^()\n]*)\)[ \t]*;?[ \t]*)?(?:--[ \t]*([^\n]*))?[ \t\r]*$'
+    r'|^(.*)$',
+    re.MULTILINE,
+)
+# One directive call: name(args), optionally followed by ';'
+CALL_PATTERN = re.compile(r'\s*([A-Za-z_]\w*)\s*\(([^()]*)\)\s*;?')
+# One argument: a quoted string or a bare token
+ARG_PATTERN = re.compile(r'"([^"]*)"|([^,\s]+)')
+
+
+@dataclass
+class LuaDiagnostic:
+    """A problem found on one line of the LUA file"""
+
+    line_number: int
+    severity: str  # "error" or "warning"
+    message: str
+    text: str = ""
+
+    def __str__(self) -> str:
+        return f"line {self.line_number}: {self.message} ({self.text.strip()[:80]})"
+
+
+class LuaParseError(ValueError):
+    """The LUA file cannot be used; carries the diagnostics collected so far"""
+
+    def __init__(self, message: str, diagnostics: Optional[List[LuaDiagnostic]] = None):
+        super().__init__(message)
+        self.diagnostics = diagnostics or []
+
+
+@dataclass
+class LuaParser:
+    """
+    Tokenizes a package LUA file line by line.
+
+    Lines can be fed as they are read (so the appid is known after the
+    first ``addappid`` line), every line is matched once by compiled
+    patterns and the results go straight into the depot and DLC maps.
+    Supported directives:
+
+    - ``addappid(appid)``: the first one is the game itself, later ones
+      without a key are DLCs
+    - ``addappid(depot_id, flag, "key")``: a depot and its decryption key
+    - ``setManifestid(depot_id, "manifest_id"[, size])``: pinned manifest
+    - ``addtoken(appid, "token")``: app access token
+
+    Comments (``-- text``) after a directive are its description. Unknown
+    directives and malformed lines are reported as warnings with their
+    line number and skipped; a file without a usable first ``addappid``
+    raises LuaParseError.
+    """
+
+    appid: Optional[str] = None
+    game_name: Optional[str] = None
+    depots: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    dlcs: Dict[str, str] = field(default_factory=dict)
+    manifests: Dict[str, str] = field(default_factory=dict)
+    manifest_sizes: Dict[str, int] = field(default_factory=dict)
+    tokens: Dict[str, str] = field(default_factory=dict)
+    diagnostics: List[LuaDiagnostic] = field(default_factory=list)
+    line_number: int = 0
+
+    def feed(self, line: str):
+        """Tokenize one line"""
+        self.line_number += 1
+        if self.line_number == 1:
+            line = line.lstrip("\ufeff")
+        self._consume((LINE_PATTERN.match(line),))
+
+    def feed_lines(self, lines: Iterable[str]) -> "LuaParser":
+        for line in lines:
+            self.feed(line)
+        return self
+
+    def _consume(self, matches: Iterable[re.Match]):
+        """Handle the matches of LINE_PATTERN, one per line"""
+        findall = ARG_PATTERN.findall
+        depots = self.depots
+        dlcs = self.dlcs
+        line_number = self.line_number - 1
+        for match in matches:
+            line_number += 1
+            app_id, key, desc, name, args_text, comment, other = match.groups()
+            # Fast path for the bulk of every file: depots and DLCs
+            if app_id is not None and self.appid is not None and app_id.isascii():
+                if desc:
+                    desc = desc.rstrip()
+                if key:
+                    depots[app_id] = {"key": key, "desc": desc or f"Depot {app_id}"}
+                else:
+                    dlcs[app_id] = desc or f"Depot {app_id}"
+                continue
+            if app_id is not None:
+                name, args_text, comment = "addappid", match.group(0), desc
+                args = [app_id, "", key] if key else [app_id]
+            elif name is None:
+                if other is not None:
+                    self.line_number = line_number
+                    self._tokenize(other)
+                continue
+            else:
+                args = [quoted or bare for quoted, bare in findall(args_text)]
+            comment = comment.rstrip() if comment else ""
+
+            self.line_number = line_number
+            self._dispatch(name, args, comment, match)
+        self.line_number = line_number
+
+    def _tokenize(self, line: str):
+        """General path: several directives on one line, stray text..."""
+        code, _, comment = line.partition("--")
+        comment = comment.strip()
+        pos = 0
+        end = len(code.rstrip())
+        while pos < end:
+            match = CALL_PATTERN.match(code, pos)
+            if not match:
+                self._warn("unexpected text", line)
+                return
+            pos = match.end()
+            args = [quoted or bare for quoted, bare in ARG_PATTERN.findall(match.group(2))]
+            self._dispatch(match.group(1), args, comment, line)
+
+    def _dispatch(self, name: str, args: List[str], comment: str, line):
+        handler = self._HANDLERS.get(name) or self._HANDLERS.get(name.lower())
+        if handler:
+            handler(self, args, comment, line)
+        else:
+            self._warn(f"unknown directive '{name}'", line)
+
+    def _warn(self, message: str, line):
+        # line is the text or, on the fast path, the line's match
+        text = line if isinstance(line, str) else line.group(0)
+        self.diagnostics.append(LuaDiagnostic(self.line_number, "warning", message, text))
+
+    def _valid_id(self, args: List[str], line, directive: str) -> Optional[str]:
+        if not args or not (args[0].isdigit() and args[0].isascii()):
+            self._warn(f"{directive} needs a numeric id", line)
+            return None
+        return args[0]
+
+    def _add_app_id(self, args: List[str], comment: str, line):
+        app_id = self._valid_id(args, line, "addappid")
+        if app_id is None:
+            if self.appid is None:
+                self.diagnostics[-1].severity = "error"
+                raise LuaParseError(
+                    f"LUA file is invalid; line {self.line_number}: the first addappid needs a numeric appid",
+                    self.diagnostics,
+                )
+            return
+
+        if self.appid is None:
+            self.appid = app_id
+            self.game_name = comment or f"App_{app_id}"
+        elif len(args) > 2 and args[2]:
+            self.depots[app_id] = {"key": args[2], "desc": comment or f"Depot {app_id}"}
+        else:
+            self.dlcs[app_id] = comment or f"Depot {app_id}"
+
+    def _set_manifest_id(self, args: List[str], comment: str, line):
+        depot_id = self._valid_id(args, line, "setManifestid")
+        if depot_id is None:
+            return
+        if len(args) < 2 or not args[1]:
+            self._warn("setManifestid needs a manifest id", line)
+            return
+        self.manifests[depot_id] = args[1]
+        if len(args) > 2 and args[2].isdigit():
+            self.manifest_sizes[depot_id] = int(args[2])
+
+    def _add_token(self, args: List[str], comment: str, line):
+        app_id = self._valid_id(args, line, "addtoken")
+        if app_id is None:
+            return
+        if len(args) < 2 or not args[1]:
+            self._warn("addtoken needs a token", line)
+            return
+        self.tokens[app_id] = args[1]
+
+    # Keys are lower case; the exact spelling used by packages is listed
+    # too so the common case needs a single lookup
+    _HANDLERS = {
+        "addappid": _add_app_id,
+        "setmanifestid": _set_manifest_id,
+        "setManifestid": _set_manifest_id,
+        "addtoken": _add_token,
+    }
+
+    def apply(self, game_data: Dict[str, Any]):
+        """
+        Store the parsed package in game_data.
+
+        Raises:
+            LuaParseError: If no addappid was found
+        """
+        if self.appid is None:
+            raise LuaParseError(
+                "LUA file is invalid; no 'addappid' entries found.", self.diagnostics
+            )
+        game_data["appid"] = self.appid
+        game_data["game_name"] = self.game_name
+        game_data["depots"] = self.depots
+        game_data["dlcs"] = self.dlcs
+        if self.manifests:
+            game_data["lua_manifests"] = self.manifests
+        if self.manifest_sizes:
+            game_data["lua_manifest_sizes"] = self.manifest_sizes
+        if self.tokens:
+            game_data["app_tokens"] = self.tokens
+
+
+def parse_lua(content: str) -> LuaParser:
+    """Tokenize a whole LUA file with a single scan of the text"""
+    parser = LuaParser(line_number=1)
+    parser._consume(LINE_PATTERN.finditer(content.lstrip("\ufeff")))
+    return parser
@@ -0,0 +1,162 @@
+"""
+Manifest Info - Offline depot sizes and file counts from Steam depot manifests
+"""
+
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+from utils.logger import get_internationalized_logger
+
+from core.steam_api import api_cache
+
+logger = get_internationalized_logger()
+
+# EDepotFileFlag.Directory
+DIRECTORY_FLAG = 64
+
+
+@dataclass
+class ManifestSummary:
+    """What a depot manifest says about the files it describes"""
+
+    depot_id: str
+    manifest_id: str
+    size: int  # uncompressed size on disk, in bytes
+    compressed_size: int
+    file_count: int
+    chunk_count: int
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ManifestSummary":
+        return cls(
+            depot_id=str(data["depot_id"]),
+            manifest_id=str(data["manifest_id"]),
+            size=int(data["size"]),
+            compressed_size=int(data.get("compressed_size", 0)),
+            file_count=int(data["file_count"]),
+            chunk_count=int(data["chunk_count"]),
+        )
+
+
+# Manifest ids never change content, so summaries are cached forever
+_summaries: Dict[str, ManifestSummary] = {}
+_lock = threading.Lock()
+
+
+def _cache_key(manifest_id: str) -> str:
+    return f"manifest:{manifest_id}"
+
+
+def _load_cached(manifest_id: str) -> Optional[ManifestSummary]:
+    with _lock:
+        summary = _summaries.get(manifest_id)
+    if summary:
+        return summary
+
+    cached = api_cache.get(_cache_key(manifest_id))
+    if cached is None:
+        return None
+    try:
+        summary = ManifestSummary.from_dict(cached[0])
+    except (TypeError, ValueError, KeyError) as e:
+        logger.warning(f"Could not read cached manifest summary {manifest_id}: {e}")
+        return None
+
+    with _lock:
+        _summaries[manifest_id] = summary
+    return summary
+
+
+def _store_cached(summary: ManifestSummary):
+    with _lock:
+        _summaries[summary.manifest_id] = summary
+    # No TTL: a manifest id always describes the same files
+    api_cache.put(_cache_key(summary.manifest_id), summary.to_dict())
+
+
+def decode_manifest(path: str, depot_id: str, manifest_id: str) -> ManifestSummary:
+    """
+    Decode a binary depot manifest (raw or zip compressed).
+
+    Raises:
+        ImportError: If the steam package is not installed
+        Exception: If the file is not a valid depot manifest
+    """
+    from steam.core.manifest import DepotManifest
+
+    with open(path, "rb") as f:
+        manifest = DepotManifest(f.read())
+
+    file_count = 0
+    for mapping in manifest.payload.mappings:
+        if not mapping.flags & DIRECTORY_FLAG:
+            file_count += 1
+
+    return ManifestSummary(
+        depot_id=str(depot_id),
+        manifest_id=str(manifest_id),
+        size=manifest.size_original,
+        compressed_size=manifest.size_compressed,
+        file_count=file_count,
+        chunk_count=manifest.metadata.unique_chunks,
+    )
+
+
+def get_manifest_summary(
+    path: str, depot_id: str, manifest_id: str
+) -> Optional[ManifestSummary]:
+    """
+    Summary of one depot manifest, decoded once per manifest id.
+
+    Returns:
+        ManifestSummary or None if the manifest cannot be decoded
+    """
+    manifest_id = str(manifest_id)
+    summary = _load_cached(manifest_id)
+    if summary:
+        return summary
+
+    try:
+        summary = decode_manifest(path, depot_id, manifest_id)
+    except ImportError:
+        logger.warning("`steam` package not found. Cannot decode depot manifests.")
+        return None
+    except Exception as e:
+        logger.warning(f"Could not decode manifest {os.path.basename(path)}: {e}")
+        return None
+
+    _store_cached(summary)
+    logger.debug(
+        f"Manifest {manifest_id} of depot {depot_id}: {summary.size} bytes, "
+        f"{summary.file_count} files, {summary.chunk_count} chunks"
+    )
+    return summary
+
+
+def summarize_manifests(
+    manifest_dir: str, manifests: Dict[str, str]
+) -> Dict[str, ManifestSummary]:
+    """
+    Summaries of the given depots' manifests found in manifest_dir.
+
+    Args:
+        manifest_dir: Directory holding <depot>_<manifest>.manifest files
+        manifests: Manifest id per depot id
+
+    Returns:
+        dict: ManifestSummary per depot id, for every manifest that decoded
+    """
+    summaries = {}
+    for depot_id, manifest_id in manifests.items():
+        path = os.path.join(manifest_dir, f"{depot_id}_{manifest_id}.manifest")
+        if not os.path.exists(path):
+            continue
+        summary = get_manifest_summary(path, depot_id, manifest_id)
+        if summary:
+            summaries[depot_id] = summary
+    return summaries
@@ -12,9 +12,9 @@ from datetime import datetime
 from utils.i18n import tr
 from typing import Any, Dict, List
 
-import requests
 from PyQt6.QtCore import QMutex, QMutexLocker, QObject, QThread, pyqtSignal
 
+from utils.http_client import http_client
 from utils.logger import get_internationalized_logger
 
 logger = get_internationalized_logger()
@@ -59,26 +59,15 @@ class OnlineFixesManager(QObject):
     def __init__(self):
         super().__init__()
 
-        # HTTP Client com timeout configurado e otimizações
-        self.http_client = requests.Session()
-
-        # Configurar headers para melhor performance
-        self.http_client.headers.update(
-            {
-                "User-Agent": "Bifrost-OnlineFixes/1.0",
-                "Accept": "application/octet-stream",
-                "Accept-Encoding": "gzip, deflate",
-            }
-        )
-
-        # Headers para melhor performance
-        self.http_client.headers.update(
-            {
-                "User-Agent": "Bifrost-OnlineFixes/1.0",
-                "Accept": "application/octet-stream",
-                "Accept-Encoding": "gzip, deflate",
-            }
-        )
+        # Cliente HTTP compartilhado (pool de conexões e limites globais)
+        self.http_client = http_client
+
+        # Headers enviados em todas as requisições
+        self.http_headers = {
+            "User-Agent": "Bifrost-OnlineFixes/1.0",
+            "Accept": "application/octet-stream",
+            "Accept-Encoding": "gzip, deflate",
+        }
 
         # Lock para thread safety (apenas para check, download usa QThread)
         self._fix_check_mutex = QMutex()
@@ -263,7 +252,9 @@ class OnlineFixesManager(QObject):
             url = "https://store.steampowered.com/api/appdetails"
             params = {"appids": appid}
 
-            response = self.http_client.get(url, params=params, timeout=5)
+            response = self.http_client.get(
+                url, params=params, headers=self.http_headers, timeout=5
+            )
             response.raise_for_status()
 
             data = response.json()
@@ -288,7 +279,10 @@ class OnlineFixesManager(QObject):
 
             # Usar HEAD request com timeout menor para verificação rápida
             response = self.http_client.head(
-                generic_url, timeout=self.check_timeout, allow_redirects=True
+                generic_url,
+                headers=self.http_headers,
+                timeout=self.check_timeout,
+                allow_redirects=True,
             )
             logger.debug(f"Generic fix check for {appid} -> {response.status_code}")
 
@@ -321,7 +315,10 @@ class OnlineFixesManager(QObject):
 
                 # Usar timeout configurado para verificação
                 response = self.http_client.head(
-                    online_url, timeout=self.check_timeout, allow_redirects=True
+                    online_url,
+                    headers=self.http_headers,
+                    timeout=self.check_timeout,
+                    allow_redirects=True,
                 )
                 logger.debug(
                     f"Online-fix check ({online_url}) for {appid} -> {response.status_code}"
@@ -499,7 +496,9 @@ class OnlineFixesManager(QObject):
             # Download do arquivo com validações
             logger.info(f"Downloading {fix_type} fix from {download_url}")
 
-            response = self.http_client.get(download_url, stream=True, timeout=30)
+            response = self.http_client.get(
+                download_url, headers=self.http_headers, stream=True, timeout=30
+            )
             response.raise_for_status()
             total = int(response.headers.get("Content-Length", 0))
 
@@ -703,7 +702,7 @@ class OnlineFixesManager(QObject):
     def cleanup(self):
         """Limpa recursos do gerenciador"""
         try:
-            self.http_client.close()
+            # O cliente HTTP é compartilhado e continua aberto
             logger.info("OnlineFixesManager cleanup completed")
         except Exception as e:
             logger.error(f"Error during OnlineFixesManager cleanup: {e}")
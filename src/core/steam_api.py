@@ -1,16 +1,19 @@
 import json
 from utils.logger import get_internationalized_logger
 import logging
-import os
-import subprocess
-import sys
-import tempfile
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from functools import wraps
 from typing import Any, Dict
 
 import requests
 
+from core.api_cache import ApiCache
+from core.steam_client_worker import SteamClientError, steam_client_worker
+from utils.circuit_breaker import CircuitBreaker
+from utils.http_client import http_client
+
 logger = get_internationalized_logger()
 
 
@@ -21,6 +24,8 @@ class SteamAPIConfig:
     # Cache settings
     CACHE_DIR = "api_cache"
     CACHE_EXPIRATION_SECONDS = 21600  # 6 hours - more responsive cache
+    CACHE_STALE_SECONDS = 7 * 86400  # served while refreshing for this long after expiring
+    NEGATIVE_CACHE_SECONDS = 300  # a source that failed for an app is not asked again for this long
     MAX_CACHE_SIZE_MB = 50  # Limit cache size
 
     # Network settings
@@ -30,7 +35,45 @@ class SteamAPIConfig:
 
     # Performance settings
     MAX_CONCURRENT_REQUESTS = 5
-    CONNECTION_POOL_SIZE = 10
+    PRODUCT_INFO_BATCH_SIZE = 100  # apps per bulk get_product_info request
+
+    # Circuit breaker: skip a source after this many failures in a row,
+    # probing it again after the reset timeout
+    CIRCUIT_FAILURE_THRESHOLD = 3
+    CIRCUIT_RESET_SECONDS = 60
+
+    # The rate limited Web API is only asked when steam.client has not
+    # answered after this long, has no answer, or its circuit is open
+    WEB_API_HEDGE_SECONDS = 1.5
+
+
+api_cache = ApiCache(
+    SteamAPIConfig.CACHE_DIR, SteamAPIConfig.MAX_CACHE_SIZE_MB * 1024 * 1024
+)
+
+# Background refreshes of stale cache entries, at most one per appid
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=SteamAPIConfig.MAX_CONCURRENT_REQUESTS, thread_name_prefix="api-refresh"
+)
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+# steam.client lookups and their hedged Web API requests
+_source_executor = ThreadPoolExecutor(
+    max_workers=SteamAPIConfig.MAX_CONCURRENT_REQUESTS * 2, thread_name_prefix="api-source"
+)
+
+STEAM_CLIENT_SOURCE = "steam_client"
+WEB_API_SOURCE = "web_api"
+
+circuit_breakers = {
+    source: CircuitBreaker(
+        source,
+        SteamAPIConfig.CIRCUIT_FAILURE_THRESHOLD,
+        SteamAPIConfig.CIRCUIT_RESET_SECONDS,
+    )
+    for source in (STEAM_CLIENT_SOURCE, WEB_API_SOURCE)
+}
 
 
 def retry(
@@ -79,158 +122,318 @@ def get_depot_info_from_api(app_id):
     """
     Fetches depot and app info for a given app_id using a multi-tiered approach.
 
+    Cached data is returned right away; once it is older than
+    CACHE_EXPIRATION_SECONDS it is still returned, and a refresh runs in
+    the background.
+
     Returns:
         dict: A dictionary containing 'depots' and 'installdir'.
               Returns an empty dict on failure.
     """
-    os.makedirs(SteamAPIConfig.CACHE_DIR, exist_ok=True)
-    cache_file = os.path.join(SteamAPIConfig.CACHE_DIR, f"{app_id}_depot_details.json")
+    cached = _load_cached_depot_info(app_id)
+    if cached is not None:
+        cached_data, fresh = cached
+        if not fresh:
+            _schedule_refresh(app_id)
+        return cached_data
 
-    if os.path.exists(cache_file):
-        try:
-            file_age = time.time() - os.path.getmtime(cache_file)
-            if file_age < SteamAPIConfig.CACHE_EXPIRATION_SECONDS:
-                logger.debug(
-                    f"Loading app details for AppID: {app_id} from local cache."
-                )
-                with open(cache_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            logger.warning(
-                f"Could not read cache file {cache_file}. Fetching fresh data. Error: {e}"
-            )
+    return _fetch_depot_info(app_id)
 
-    logger.debug(
-        f"Attempting to fetch app info for AppID {app_id} using steam.client (priority)..."
-    )
-    api_data = _fetch_with_steam_client(app_id)
 
-    if not api_data or not api_data.get("depots"):
-        logger.warning(
-            f"steam.client method failed for AppID {app_id}. Falling back to public Web API."
+def _fetch_depot_info(app_id):
+    """
+    Asks steam.client for app_id and hedges with the Web API: the Store
+    request is only sent when steam.client has not answered after
+    WEB_API_HEDGE_SECONDS, answered without depots, or its circuit is
+    open. The first answer with depots wins. If the Web API wins, the
+    steam.client answer (which also has depot sizes, OS lists and
+    languages) is merged into the cache when it arrives.
+    """
+    logger.debug(f"Fetching app info for AppID {app_id} from steam.client")
+    futures = {
+        _source_executor.submit(
+            _fetch_from_source, STEAM_CLIENT_SOURCE, app_id, _fetch_with_steam_client
+        ): STEAM_CLIENT_SOURCE,
+    }
+
+    def start_web_api():
+        logger.debug(f"Hedging AppID {app_id} with the Web API")
+        future = _source_executor.submit(
+            _fetch_from_source, WEB_API_SOURCE, app_id, _fetch_with_web_api
         )
-        api_data = _fetch_with_web_api(app_id)
+        futures[future] = WEB_API_SOURCE
+        return future
 
-    # Total game size is already calculated in _fetch_with_steam_client()
-    # No need for additional depot size fetching
+    api_data = {}
+    pending = set(futures)
+    hedged = circuit_breakers[STEAM_CLIENT_SOURCE].state == CircuitBreaker.OPEN
+    if hedged:
+        pending.add(start_web_api())
+    while pending:
+        done, pending = wait(
+            pending,
+            timeout=None if hedged else SteamAPIConfig.WEB_API_HEDGE_SECONDS,
+            return_when=FIRST_COMPLETED,
+        )
+        for future in done:
+            answer = future.result()
+            if answer and answer.get("depots"):
+                api_data = answer
+                logger.debug(f"{futures[future]} answered first for AppID {app_id}")
+                break
+        if api_data:
+            break
+        if not hedged:
+            # steam.client is slow or came back empty
+            hedged = True
+            pending.add(start_web_api())
+
+    if not api_data:
+        logger.warning(f"No metadata source could describe AppID {app_id}")
+        return {}
 
     # Cache the successful response
-    if api_data and api_data.get("depots"):
-        try:
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(api_data, f, indent=2)
-            logger.debug(f"Cached API response for AppID: {app_id}")
-            _cleanup_cache_if_needed()
-        except (IOError, TypeError) as e:
-            logger.warning(f"Failed to cache API response for AppID {app_id}: {e}")
+    _store_cached_depot_info(app_id, api_data)
 
+    for future in pending:
+        if futures[future] == STEAM_CLIENT_SOURCE:
+            future.add_done_callback(
+                lambda late, first=api_data: _merge_late_answer(app_id, first, late)
+            )
     return api_data
 
 
+def _merge_late_answer(app_id, first, late_future):
+    """Fold the slower, richer steam.client answer into the cached entry"""
+    try:
+        late = late_future.result()
+    except Exception:
+        return
+    if not late or not late.get("depots"):
+        return
+    _store_cached_depot_info(app_id, _merge_depot_info(late, first))
+    logger.debug(f"Merged late steam.client answer for AppID {app_id} into the cache")
+
+
+def _merge_depot_info(primary, secondary):
+    """Depot info from primary, with gaps filled from secondary"""
+    merged = dict(secondary)
+    merged.update({key: value for key, value in primary.items() if value})
+    depots = {depot_id: dict(info) for depot_id, info in secondary.get("depots", {}).items()}
+    for depot_id, info in primary.get("depots", {}).items():
+        depots.setdefault(depot_id, {}).update(
+            {key: value for key, value in info.items() if value}
+        )
+    merged["depots"] = depots
+    return merged
+
+
+def _fetch_from_source(source, app_id, fetch):
+    """
+    Depot info of app_id from one source, or {} without calling it when
+    it failed for this app recently or its circuit is open.
+
+    A source that raises counts as failing for the circuit breaker; one
+    that answers without depots only gets a negative cache entry for the
+    app. Either way the app is not asked from that source again for
+    NEGATIVE_CACHE_SECONDS.
+    """
+    negative_key = f"failed:{source}:{app_id}"
+    if api_cache.get(negative_key) is not None:
+        logger.debug(f"Skipping {source} for AppID {app_id}: it failed recently")
+        return {}
+    breaker = circuit_breakers[source]
+    if not breaker.allow():
+        logger.debug(f"Skipping {source} for AppID {app_id}: circuit open")
+        return {}
+
+    try:
+        api_data = fetch(app_id)
+    except Exception as e:
+        logger.warning(f"{source} lookup of AppID {app_id} failed: {type(e).__name__}: {e}")
+        breaker.record_failure()
+        api_data = {}
+    else:
+        breaker.record_success()
+
+    if not api_data or not api_data.get("depots"):
+        api_cache.put(negative_key, True, SteamAPIConfig.NEGATIVE_CACHE_SECONDS)
+    return api_data
+
+
+def _schedule_refresh(app_id):
+    """Refetch the depot info of app_id in the background, once at a time"""
+    app_id = str(app_id)
+    with _refreshing_lock:
+        if app_id in _refreshing:
+            return
+        _refreshing.add(app_id)
+
+    def refresh():
+        try:
+            logger.debug(f"Refreshing stale app details for AppID: {app_id}")
+            _fetch_depot_info(app_id)
+        except Exception as e:
+            logger.warning(f"Background refresh of AppID {app_id} failed: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(app_id)
+
+    try:
+        _refresh_executor.submit(refresh)
+    except RuntimeError:
+        # Interpreter shutting down
+        with _refreshing_lock:
+            _refreshing.discard(app_id)
+
+
+def prefetch_depot_info(app_ids) -> Dict[str, Dict[str, Any]]:
+    """
+    Fills the depot info cache for many apps at once.
+
+    The appids are deduplicated, the ones with a fresh cache entry are
+    skipped and the rest are requested from steam.client in batches of
+    PRODUCT_INFO_BATCH_SIZE apps, all over the one session of the Steam
+    client worker. Apps Steam does not answer for are left out; a later
+    get_depot_info_from_api call still tries the Web API for them.
+
+    Returns:
+        dict: Depot info per appid, for every app that is now cached
+    """
+    results = {}
+    missing = []
+    for app_id in dict.fromkeys(str(app_id) for app_id in app_ids):
+        cached = _load_cached_depot_info(app_id)
+        if cached is not None and cached[1]:
+            results[app_id] = cached[0]
+        else:
+            missing.append(app_id)
+
+    total = len(results) + len(missing)
+    if not missing:
+        return results
+    if not steam_client_worker.is_available():
+        logger.warning("`steam[client]` package not found. Cannot prefetch app info.")
+        return results
+
+    logger.info(
+        f"Prefetching app info for {len(missing)} apps "
+        f"({len(results)} already cached)"
+    )
+    breaker = circuit_breakers[STEAM_CLIENT_SOURCE]
+    batch_size = SteamAPIConfig.PRODUCT_INFO_BATCH_SIZE
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        if not breaker.allow():
+            logger.warning("Skipping bulk product info requests: steam.client circuit open")
+            break
+        try:
+            apps = steam_client_worker.get_product_info(batch).get("apps", {})
+        except SteamClientError as e:
+            logger.error(f"Bulk product info request failed: {e}")
+            breaker.record_failure()
+            # The worker already reconnected once; later batches would fail too
+            break
+        breaker.record_success()
+
+        for app_id in batch:
+            app_data = apps.get(app_id)
+            if not app_data:
+                continue
+            api_data = _parse_product_info(app_data)
+            if api_data.get("depots") and _store_cached_depot_info(app_id, api_data):
+                results[app_id] = api_data
+
+    logger.debug(f"Prefetched app info for {len(results)}/{total} apps")
+    return results
+
+
+def _depot_info_cache_key(app_id) -> str:
+    return f"depot_details:{app_id}"
+
+
+def _load_cached_depot_info(app_id):
+    """
+    Cached depot info of an app as (data, fresh), or None if missing or
+    too old to serve even while refreshing.
+    """
+    cached = api_cache.get(_depot_info_cache_key(app_id))
+    if cached is None:
+        return None
+    cached_data, fresh = cached
+    if fresh:
+        logger.debug(f"Loading app details for AppID: {app_id} from local cache.")
+    return cached_data, fresh
+
+
+def _store_cached_depot_info(app_id, api_data) -> bool:
+    stored = api_cache.put(
+        _depot_info_cache_key(app_id),
+        api_data,
+        SteamAPIConfig.CACHE_EXPIRATION_SECONDS,
+        SteamAPIConfig.CACHE_STALE_SECONDS,
+    )
+    if stored:
+        logger.debug(f"Cached API response for AppID: {app_id}")
+    return stored
+
+
 def _fetch_with_steam_client(app_id):
     """
     Uses the steam.client library to get product info, including installdir.
     """
-    try:
-        from steam.client import SteamClient
-    except ImportError:
+    if not steam_client_worker.is_available():
         logger.warning(
             "`steam[client]` package not found. Skipping steam.client fetch method."
         )
         return {}
 
-    script_content = f"""
-import json, sys
-from steam.client import SteamClient
-try:
-    client = SteamClient()
-    client.anonymous_login()
-    if not client.logged_on:
-        sys.stderr.write("Failed to anonymously login to Steam.\\n")
-        sys.exit(1)
-    result = client.get_product_info(apps=[{app_id}], timeout=30)
-    client.logout()
-    print(json.dumps(result))
-except Exception as e:
-    sys.stderr.write(f"An exception occurred: {{e}}\\n")
-    sys.exit(1)
-"""
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".py", delete=False, encoding="utf-8"
-    ) as temp_file:
-        temp_file.write(script_content)
-        temp_script_path = temp_file.name
+    data = steam_client_worker.get_product_info([app_id])
+    app_data = data.get("apps", {}).get(str(app_id), {})
+    return _parse_product_info(app_data)
 
-    api_data = {}
-    raw_stdout = ""
-    try:
-        python_executable = sys.executable
-        result = subprocess.run(
-            [python_executable, temp_script_path],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            check=False,
-            encoding="utf-8",
-        )
-        raw_stdout = result.stdout.strip()
 
-        if result.returncode != 0:
-            logger.error(
-                f"steam.client subprocess failed. Stderr: {result.stderr.strip()}"
-            )
-            return {}
+def _parse_product_info(app_data):
+    """
+    Depot info of one app from its steam.client product info.
+    """
+    depot_info = {}
+    installdir = None
+    game_name = None
+    total_game_size = 0
 
-        data = json.loads(raw_stdout)
-        app_data = data.get("apps", {}).get(str(app_id), {})
+    if app_data:
+        installdir = app_data.get("config", {}).get("installdir")
+        game_name = app_data.get("name") or app_data.get("common", {}).get("name")
+        depots = app_data.get("depots", {})
 
-        depot_info = {}
-        installdir = None
-        game_name = None
+        # Calcular tamanho total do jogo a partir dos depots
         total_game_size = 0
+        for depot_id, depot_data in depots.items():
+            if not isinstance(depot_data, dict):
+                continue
+            config = depot_data.get("config", {})
 
-        if app_data:
-            installdir = app_data.get("config", {}).get("installdir")
-            game_name = app_data.get("name") or app_data.get("common", {}).get("name")
-            depots = app_data.get("depots", {})
-
-            # Calcular tamanho total do jogo a partir dos depots
-            total_game_size = 0
-            for depot_id, depot_data in depots.items():
-                if not isinstance(depot_data, dict):
-                    continue
-                config = depot_data.get("config", {})
-
-                # Extrair tamanho do depot se disponível nos manifests
-                depot_size = 0
-                if "manifests" in depot_data and "public" in depot_data["manifests"]:
-                    depot_size = int(depot_data["manifests"]["public"].get("size", 0))
-                    total_game_size += depot_size
-
-                depot_info[depot_id] = {
-                    "name": depot_data.get("name", f"Depot {depot_id}"),
-                    "oslist": config.get("oslist"),
-                    "language": config.get("language"),
-                    "steamdeck": config.get("steamdeck") == "1",
-                    "size": depot_size,
-                }
-
-        api_data = {
-            "depots": depot_info,
-            "installdir": installdir,
-            "game_name": game_name,
-            "total_game_size": total_game_size,
-        }
+            # Extrair tamanho do depot se disponível nos manifests
+            depot_size = 0
+            if "manifests" in depot_data and "public" in depot_data["manifests"]:
+                depot_size = int(depot_data["manifests"]["public"].get("size", 0))
+                total_game_size += depot_size
 
-    except Exception as e:
-        logger.error(
-            f"An unexpected error occurred in _fetch_with_steam_client: {e}",
-            exc_info=True,
-        )
-    finally:
-        os.unlink(temp_script_path)
+            depot_info[depot_id] = {
+                "name": depot_data.get("name", f"Depot {depot_id}"),
+                "oslist": config.get("oslist"),
+                "language": config.get("language"),
+                "steamdeck": config.get("steamdeck") == "1",
+                "size": depot_size,
+            }
 
-    return api_data
+    return {
+        "depots": depot_info,
+        "installdir": installdir,
+        "game_name": game_name,
+        "total_game_size": total_game_size,
+    }
 
 
 @retry(
@@ -248,11 +451,10 @@ def _fetch_with_web_api(app_id: str) -> Dict[str, Any]:
     headers = {
         "User-Agent": "Bifrost-Client/1.0",
         "Accept": "application/json",
-        "Connection": "close",
     }
 
     try:
-        response = requests.get(
+        response = http_client.get(
             url, params=params, timeout=SteamAPIConfig.DEFAULT_TIMEOUT, headers=headers
         )
         response.raise_for_status()
@@ -304,62 +506,9 @@ def _parse_web_api_response(app_id, data):
     }
 
 
-def _cleanup_cache_if_needed():
-    """Clean up cache if it exceeds size limit"""
-    try:
-        total_size = 0
-        cache_files = []
-
-        if not os.path.exists(SteamAPIConfig.CACHE_DIR):
-            return
-
-        total_size = 0
-        for filename in os.listdir(SteamAPIConfig.CACHE_DIR):
-            filepath = os.path.join(SteamAPIConfig.CACHE_DIR, filename)
-            if os.path.isfile(filepath):
-                size = os.path.getsize(filepath)
-                mtime = os.path.getmtime(filepath)
-                cache_files.append((filepath, size, mtime))
-                total_size += size
-
-        # Convert to MB
-        total_size_mb = total_size / (1024 * 1024)
-
-        if total_size_mb <= SteamAPIConfig.MAX_CACHE_SIZE_MB:
-            return
-
-        # Sort by modification time (oldest first)
-        cache_files.sort(key=lambda x: x[2])
-
-        # Remove oldest files until under limit
-        target_size = SteamAPIConfig.MAX_CACHE_SIZE_MB * 0.8 * 1024 * 1024  # 80% of max
-        current_size = total_size
-
-        removed_count = 0
-        for filepath, size, mtime in cache_files:
-            if current_size <= target_size:
-                break
-
-            try:
-                os.remove(filepath)
-                current_size -= size
-                removed_count += 1
-                logger.debug(f"Removed old cache file: {os.path.basename(filepath)}")
-            except Exception as e:
-                logger.warning(f"Error removing cache file {filepath}: {e}")
-
-        if removed_count > 0:
-            logger.info(
-                f"API cache cleanup: removed {removed_count} files, freed {(total_size - current_size) / (1024 * 1024):.1f} MB"
-            )
-
-    except Exception as e:
-        logger.error(f"Error during API cache cleanup: {e}")
-
-
 def get_depot_sizes_from_manifests(app_id, depots):
     """
-    Attempts to get depot sizes by downloading and analyzing manifests.
+    Attempts to get depot sizes from the public manifests in the product info.
 
     Args:
         app_id: Steam App ID
@@ -371,131 +520,37 @@ def get_depot_sizes_from_manifests(app_id, depots):
     depot_sizes = {}
     logger.debug(f"Getting depot sizes for AppID {app_id} with {len(depots)} depots")
 
-    try:
-        from steam.client import SteamClient
-
-        logger.debug("Steam client library available for depot size fetching")
-    except ImportError:
+    if not steam_client_worker.is_available():
         logger.warning("`steam[client]` package not found. Cannot fetch depot sizes.")
         return depot_sizes
 
-    script_content = f"""
-import json, sys, os
-from steam.client import SteamClient
-try:
-    client = SteamClient()
-    client.anonymous_login()
-    if not client.logged_on:
-        sys.stderr.write("Failed to anonymously login to Steam.\\n")
-        sys.exit(1)
-
-    depot_sizes = {{}}
-    depots_data = {json.dumps(depots)}
-
-    # Get product info which contains depot manifests
-    app_id = {app_id}
-    product_info = client.get_product_info([app_id])
-
-    sys.stderr.write(f"Product info structure: {{product_info}}\\n")
-
-    if product_info and 'apps' in product_info:
-        apps = product_info['apps']
-        sys.stderr.write(f"Available apps: {{list(apps.keys())}}\\n")
-
-        if str(app_id) in apps:
-            app_data = apps[str(app_id)]
-
-            if 'depots' in app_data:
-                app_depots = app_data['depots']
-                sys.stderr.write(f"Found {{len(app_depots)}} depots\\n")
-
-                for depot_id in depots_data.keys():
-                    try:
-                        if depot_id in app_depots:
-                            depot_data = app_depots[depot_id]
-                            if 'manifests' in depot_data and 'public' in depot_data['manifests']:
-                                depot_size = depot_data['manifests']['public'].get('size', 0)
-                                depot_sizes[depot_id] = int(depot_size)
-                                sys.stderr.write(f"Depot {{depot_id}}: {{depot_size}} bytes\\n")
-                            else:
-                                depot_sizes[depot_id] = 0
-                                sys.stderr.write(f"Depot {{depot_id}}: no public manifest\\n")
-                        else:
-                            depot_sizes[depot_id] = 0
-                            sys.stderr.write(f"Depot {{depot_id}}: not found\\n")
-                    except Exception as e:
-                        sys.stderr.write(f"Error getting size for depot {{depot_id}}: {{e}}\\n")
-                        depot_sizes[depot_id] = 0
-            else:
-                sys.stderr.write("No depots found in app data\\n")
-        else:
-            sys.stderr.write(f"AppID {{app_id}} not found in apps\\n")
-    else:
-        sys.stderr.write("No apps found in product info\\n")
-
-    client.logout()
-    print(json.dumps(depot_sizes))
-
-except Exception as e:
-    sys.stderr.write(f"Script error: {{e}}\\n")
-    sys.exit(1)
-"""
-
-    logger.debug(
-        f"Executing Steam client script to get depot sizes for {len(depots)} depots"
-    )
+    breaker = circuit_breakers[STEAM_CLIENT_SOURCE]
+    if not breaker.allow():
+        logger.warning("Skipping depot size lookup: steam.client circuit open")
+        return depot_sizes
     try:
-        import subprocess
-        import tempfile
+        product_info = steam_client_worker.get_product_info([app_id])
+    except SteamClientError as e:
+        logger.error(f"Failed to get depot sizes: {e}")
+        breaker.record_failure()
+        return depot_sizes
+    breaker.record_success()
 
-        # Create temporary script file
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".py", delete=False
-        ) as temp_script:
-            temp_script.write(script_content)
-            temp_script_path = temp_script.name
+    app_depots = product_info.get("apps", {}).get(str(app_id), {}).get("depots", {})
+    if not app_depots:
+        logger.debug(f"No depots found in product info of AppID {app_id}")
 
+    for depot_id in depots.keys():
+        depot_data = app_depots.get(str(depot_id))
         try:
-            python_executable = sys.executable
-            result = subprocess.run(
-                [python_executable, temp_script_path],
-                capture_output=True,
-                text=True,
-                timeout=60,
-                check=False,
-                encoding="utf-8",
-            )
-
-            logger.debug(f"Depot size script return code: {result.returncode}")
-            logger.debug(f"Depot size script stdout: {result.stdout}")
-            logger.debug(f"Depot size script stderr: {result.stderr}")
-
-            if result.returncode == 0:
-                try:
-                    depot_sizes = json.loads(result.stdout.strip())
-                    logger.debug(
-                        f"Successfully retrieved sizes for {len([s for s in depot_sizes.values() if s > 0])} depots"
-                    )
-                    logger.debug(f"Depot sizes: {depot_sizes}")
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse depot sizes JSON: {e}")
-                    logger.debug(f"Raw output: {result.stdout}")
+            if isinstance(depot_data, dict) and "public" in depot_data.get("manifests", {}):
+                depot_sizes[depot_id] = int(depot_data["manifests"]["public"].get("size", 0))
             else:
-                logger.error(
-                    f"Depot size script failed with return code {result.returncode}"
-                )
-                logger.error(f"Error output: {result.stderr}")
-        except Exception as e:
-            logger.error(f"Failed to get depot sizes: {e}")
-        finally:
-            # Clean up temporary script
-            try:
-                os.unlink(temp_script_path)
-            except (AttributeError, TypeError):
-                pass
-
-    except Exception as e:
-        logger.error(f"Failed to get depot sizes: {e}")
+                depot_sizes[depot_id] = 0
+                logger.debug(f"Depot {depot_id}: no public manifest")
+        except (TypeError, ValueError, AttributeError) as e:
+            logger.debug(f"Error getting size for depot {depot_id}: {e}")
+            depot_sizes[depot_id] = 0
 
     logger.debug(f"Final depot sizes dict: {depot_sizes}")
     return depot_sizes
@@ -0,0 +1,250 @@
+"""
+Steam Client Worker - Long-lived process holding one anonymous Steam session
+"""
+
+import atexit
+import importlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from utils.logger import get_internationalized_logger
+
+logger = get_internationalized_logger()
+
+DEFAULT_SESSION_FACTORY = "core.steam_client_worker:SteamClientSession"
+# Product info fixture used instead of Steam when set (see LocalProductInfoSession)
+STANDIN_ENV_VAR = "BIFROST_STEAM_STANDIN"
+CONNECT_RETRIES = 3
+
+
+class SteamClientError(Exception):
+    """The worker could not answer a request"""
+
+
+class SteamClientSession:
+    """
+    Anonymous steam.client session, kept logged on between requests.
+
+    Runs inside the worker process only, so the parent never imports
+    steam.client and gevent.
+    """
+
+    def __init__(self):
+        from steam.client import SteamClient
+
+        self.client = SteamClient()
+
+    def _ensure_logged_on(self):
+        if self.client.logged_on:
+            return
+        if self.client.connected:
+            self.client.disconnect()
+        # connect() retries forever by default; fail the request instead
+        if not self.client.connect(retry=CONNECT_RETRIES):
+            raise ConnectionError("Could not connect to a Steam CM server")
+        result = self.client.anonymous_login()
+        if not self.client.logged_on:
+            raise ConnectionError(f"Failed to anonymously login to Steam: {result!r}")
+
+    def get_product_info(self, app_ids, timeout):
+        # A None result means the request timed out, usually because the
+        # connection to the CM dropped; log on again and retry once
+        for attempt in range(2):
+            self._ensure_logged_on()
+            result = self.client.get_product_info(
+                apps=[int(app_id) for app_id in app_ids], timeout=timeout
+            )
+            if result is not None:
+                # Same shape as the JSON the per-call scripts used to print
+                return json.loads(json.dumps(result, default=str))
+            self.client.disconnect()
+        raise TimeoutError(f"No product info for {list(app_ids)} after reconnecting")
+
+    def close(self):
+        try:
+            if self.client.logged_on:
+                self.client.logout()
+            self.client.disconnect()
+        except Exception:
+            pass
+
+
+class LocalProductInfoSession:
+    """
+    Stand-in for SteamClientSession that answers from a JSON file.
+
+    The file holds a product info response, {"apps": {"<appid>": {...}}};
+    requests return the apps it knows. Selected by pointing the
+    BIFROST_STEAM_STANDIN environment variable at the file, so downloads
+    and ingests can be exercised without network access.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ[STANDIN_ENV_VAR]
+
+    def get_product_info(self, app_ids, timeout):
+        with open(self.path, "r", encoding="utf-8") as f:
+            apps = json.load(f).get("apps", {})
+        return {"apps": {str(a): apps[str(a)] for a in app_ids if str(a) in apps}}
+
+    def close(self):
+        pass
+
+
+def _load_session_factory(path: str):
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _worker_main(conn, session_factory: str, idle_timeout: float):
+    """
+    Worker process loop: answer requests until the parent hangs up or no
+    request arrived for idle_timeout seconds.
+    """
+    session = None
+    try:
+        while conn.poll(idle_timeout):
+            try:
+                request = conn.recv()
+            except EOFError:
+                break
+            if request is None:
+                break
+
+            command, app_ids, timeout = request
+            try:
+                if session is None:
+                    session = _load_session_factory(session_factory)()
+                if command != "get_product_info":
+                    raise ValueError(f"Unknown command {command!r}")
+                conn.send(("ok", session.get_product_info(app_ids, timeout)))
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+    except (BrokenPipeError, EOFError, OSError):
+        pass
+    finally:
+        if session is not None:
+            session.close()
+        conn.close()
+
+
+class SteamClientWorker:
+    """
+    Client side of the Steam metadata worker process.
+
+    The worker is started on the first request and keeps one anonymous
+    session open, so a lookup costs a single round trip instead of an
+    interpreter start, the steam.client import and a fresh CM login.
+    Requests are batched: any number of appids go out in one
+    get_product_info call. The worker exits after ``idle_timeout``
+    seconds without requests and is started again transparently; a
+    worker that died or stopped answering is replaced and the request
+    retried once.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[str] = None,
+        idle_timeout: float = 300,
+        request_timeout: float = 30,
+    ):
+        if session_factory is None:
+            session_factory = (
+                "core.steam_client_worker:LocalProductInfoSession"
+                if os.environ.get(STANDIN_ENV_VAR)
+                else DEFAULT_SESSION_FACTORY
+            )
+        self.session_factory = session_factory
+        self.idle_timeout = idle_timeout
+        self.request_timeout = request_timeout
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        """False when the default session cannot work (steam not installed)"""
+        if self.session_factory != DEFAULT_SESSION_FACTORY:
+            return True
+        return importlib.util.find_spec("steam") is not None
+
+    def _start(self):
+        # Spawned, not forked: the parent runs Qt threads
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_worker_main,
+            args=(child_conn, self.session_factory, self.idle_timeout),
+            name="SteamClientWorker",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        logger.debug(f"Started Steam client worker (pid {self._process.pid})")
+
+    def _stop(self, graceful: bool = True):
+        if self._conn is not None:
+            if graceful:
+                try:
+                    self._conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            self._process.join(timeout=5 if graceful else 0)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+            self._process = None
+
+    def get_product_info(
+        self, app_ids: Iterable[Any], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Product info of several apps in one request.
+
+        Returns:
+            dict: The steam.client response, {"apps": {"<appid>": {...}}, ...}
+
+        Raises:
+            SteamClientError: If the worker failed to answer
+        """
+        app_ids = [str(app_id) for app_id in app_ids]
+        timeout = timeout or self.request_timeout
+        with self._lock:
+            for attempt in range(2):
+                if self._process is None or not self._process.is_alive():
+                    self._stop(graceful=False)
+                    self._start()
+                try:
+                    self._conn.send(("get_product_info", app_ids, timeout))
+                    # The session retries once after reconnecting, and the
+                    # first request also pays for the login
+                    if not self._conn.poll(timeout * 2 + 30):
+                        self._stop(graceful=False)
+                        raise SteamClientError(f"Steam client worker timed out for {app_ids}")
+                    status, payload = self._conn.recv()
+                except (BrokenPipeError, EOFError, OSError) as e:
+                    # The worker exited (idle shutdown or crash); start a new one
+                    logger.debug(f"Steam client worker went away ({e}), restarting")
+                    self._stop(graceful=False)
+                    continue
+
+                if status == "ok":
+                    return payload
+                raise SteamClientError(payload)
+
+        raise SteamClientError(f"Steam client worker keeps exiting for {app_ids}")
+
+    def shutdown(self):
+        with self._lock:
+            self._stop()
+
+
+steam_client_worker = SteamClientWorker()
+atexit.register(steam_client_worker.shutdown)
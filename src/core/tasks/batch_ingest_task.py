@@ -0,0 +1,196 @@
+"""
+Batch Ingest - Process a whole folder of zips in parallel for triage
+"""
+
+import io
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.lua_parser import LuaParseError, LuaParser
+from core.steam_api import prefetch_depot_info
+from core.tasks.process_zip_task import ingest_cache
+from utils.logger import get_internationalized_logger
+
+logger = get_internationalized_logger()
+
+
+def ingest_zip(zip_path: str) -> Dict[str, Any]:
+    """
+    Process one zip and summarize it (runs in a worker process).
+
+    The result is registered with the ingest cache by ProcessZipTask, so
+    dropping the zip later is instant; the ingest workspace itself is not
+    needed for triage and is removed. The cache is pruned once by the
+    batch, not after every zip.
+    """
+    from core.tasks.process_zip_task import ProcessZipTask
+    from core.tasks.workspace import SessionWorkspace
+
+    row = {
+        "zip": os.path.basename(zip_path),
+        "zip_path": zip_path,
+        "appid": "",
+        "name": "",
+        "depots": 0,
+        "total_size": 0,
+        "missing_manifests": [],
+        "blacklisted_depots": [],
+        "error": "",
+    }
+    try:
+        game_data = ProcessZipTask().run(zip_path, prune_cache=False)
+    except Exception as e:
+        row["error"] = str(e) or type(e).__name__
+        return row
+
+    workspace = SessionWorkspace.from_game_data(game_data)
+    if workspace:
+        workspace.remove()
+
+    depots = game_data.get("depots", {})
+    manifests = game_data.get("manifests", {})
+    depot_sizes = game_data.get("depot_sizes", {})
+    row.update(
+        appid=game_data.get("appid", ""),
+        name=game_data.get("game_name", ""),
+        depots=len(depots),
+        total_size=game_data.get("total_game_size")
+        or sum(depot_sizes.get(depot_id, 0) for depot_id in depots),
+        missing_manifests=sorted(d for d in depots if d not in manifests),
+        blacklisted_depots=game_data.get("blacklisted_depots", []),
+    )
+    return row
+
+
+def peek_appid(zip_path: str) -> Optional[str]:
+    """AppID of a zip, read from the first addappid of its LUA file"""
+    try:
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            lua_files = [f for f in zip_ref.namelist() if f.endswith(".lua")]
+            if not lua_files:
+                return None
+            parser = LuaParser()
+            with zip_ref.open(lua_files[0]) as lua_file:
+                for line in io.TextIOWrapper(lua_file, encoding="utf-8"):
+                    parser.feed(line)
+                    if parser.appid is not None:
+                        return parser.appid
+    except (OSError, zipfile.BadZipFile, UnicodeDecodeError, LuaParseError):
+        pass
+    return None
+
+
+def _format_size(size_bytes: int) -> str:
+    if not size_bytes:
+        return "-"
+    if size_bytes >= 1024**3:
+        return f"{size_bytes / 1024**3:.2f} GB"
+    return f"{size_bytes / 1024**2:.0f} MB"
+
+
+def format_summary_table(rows: List[Dict[str, Any]]) -> str:
+    """Plain-text table of batch ingest results, one zip per line"""
+    headers = ["AppID", "Name", "Depots", "Size", "Missing manifests", "Blacklisted", "Zip"]
+    table = [headers]
+    for row in rows:
+        if row["error"]:
+            error = row["error"].splitlines()[0]
+            if len(error) > 60:
+                error = error[:57] + "..."
+            table.append(["-", f"ERROR: {error}", "-", "-", "-", "-", row["zip"]])
+            continue
+        table.append(
+            [
+                str(row["appid"]),
+                row["name"],
+                str(row["depots"]),
+                _format_size(row["total_size"]),
+                ", ".join(row["missing_manifests"]) or "-",
+                ", ".join(row["blacklisted_depots"]) or "-",
+                row["zip"],
+            ]
+        )
+
+    widths = [max(len(line[i]) for line in table) for i in range(len(headers))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in table]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+class BatchIngestTask(QObject):
+    """
+    Processes every zip of a folder across a pool of worker processes.
+
+    Each zip goes through the regular ProcessZipTask (LUA parsing, manifest
+    decoding, Steam API enrichment) in its own process, so a folder with
+    hundreds of packages uses every core and the slow API lookups overlap.
+    """
+
+    progress = pyqtSignal(str)
+
+    def __init__(self, max_workers: Optional[int] = None):
+        super().__init__()
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    @staticmethod
+    def find_zips(folder: str) -> List[str]:
+        return sorted(
+            os.path.join(folder, name)
+            for name in os.listdir(folder)
+            if name.lower().endswith(".zip") and os.path.isfile(os.path.join(folder, name))
+        )
+
+    def run(self, folder: str) -> List[Dict[str, Any]]:
+        """
+        TASK: Process every zip in folder.
+
+        Returns:
+            list: One summary row per zip, sorted by game name
+        """
+        zip_paths = self.find_zips(folder)
+        if not zip_paths:
+            self.progress.emit(f"No zip files found in {folder}")
+            return []
+
+        # One bulk lookup over a single Steam session for the whole folder,
+        # so the workers find the app info cached instead of each logging in
+        app_ids = [app_id for app_id in map(peek_appid, zip_paths) if app_id]
+        if app_ids:
+            self.progress.emit(f"Fetching Steam app info for {len(set(app_ids))} apps")
+            prefetch_depot_info(app_ids)
+
+        workers = min(self.max_workers, len(zip_paths))
+        self.progress.emit(f"Processing {len(zip_paths)} zips with {workers} worker processes")
+        logger.info(f"Batch ingest of {len(zip_paths)} zips from {folder}")
+
+        rows = []
+        # Workers are spawned, not forked: this process runs Qt threads
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = {executor.submit(ingest_zip, path): path for path in zip_paths}
+            for future in as_completed(futures):
+                zip_path = futures[future]
+                try:
+                    row = future.result()
+                except Exception as e:
+                    # The worker process itself died
+                    logger.error(f"Batch ingest of {zip_path} failed: {e}")
+                    row = {
+                        "zip": os.path.basename(zip_path),
+                        "zip_path": zip_path,
+                        "error": str(e) or type(e).__name__,
+                    }
+                rows.append(row)
+                self.progress.emit(
+                    f"[{len(rows)}/{len(zip_paths)}] {row['zip']}: "
+                    + (f"error: {row['error']}" if row["error"] else row["name"])
+                )
+
+        ingest_cache.prune()
+        rows.sort(key=lambda row: (bool(row["error"]), row.get("name", "").lower(), row["zip"]))
+        return rows
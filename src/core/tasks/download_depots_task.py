@@ -2,296 +2,233 @@ import logging
 from utils.logger import get_internationalized_logger
 import os
 import re
+import shutil
 import subprocess
 import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Optional
 
 import psutil
-from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .download_tuner import ConnectionTuner
+from .installed_manifests import (
+    UpdatePlan,
+    delete_removed_files,
+    install_dir_for,
+    installed_manifests,
+    plan_update,
+    write_filelist,
+)
+from .process_output import ProcessOutputMultiplexer
+from .progress_coalescer import ProgressCoalescer
+from .progress_parser import DepotProgressParser
+from .workspace import SessionWorkspace
 
 logger = get_internationalized_logger()
 
 
-class StreamReader(QObject):
-    """Reads output from a stream in a separate thread and emits it."""
+@dataclass
+class DepotDownload:
+    """A DepotDownloaderMod process started for one depot"""
 
-    new_line = pyqtSignal(str)
-
-    def __init__(self, stream):
-        super().__init__()
-        self.stream = stream
-        self._is_running = True
-
-    def run(self):
-        """Reads lines from the stream until it's closed or stopped."""
-        for line in iter(self.stream.readline, ""):
-            if not self._is_running:
-                break
-            self.new_line.emit(line)
-        self.stream.close()
-
-    def stop(self):
-        """Signals the reader to stop."""
-        self._is_running = False
+    depot_id: str
+    process: subprocess.Popen
+    connections: int
+    started_at: float
+    finished_at: Optional[float] = None
+    downloaded_bytes: Optional[int] = None
+    throughput_recorded: bool = False
 
 
 class DownloadDepotsTask(QObject):
     """
     A dedicated class for the download task. This is necessary because the task
     needs to emit progress signals during its long-running executiona .
+
+    Depots are scheduled concurrently: up to ``max_parallel_depots`` processes
+    run at once and the global connection budget is split between them.
     """
 
     progress = pyqtSignal(str)
+    progress_batch = pyqtSignal(list)  # coalesced depot output lines
     progress_percentage = pyqtSignal(int)
+    depot_progress = pyqtSignal(str, int)  # depot_id, percentage
     steamless_progress = pyqtSignal(str)
     bytes_downloaded = pyqtSignal(int, int)  # downloaded_bytes, total_bytes
 
     # Novos signals para controle de cancelamento
     process_started = pyqtSignal(object)  # subprocess.Popen
+    process_finished = pyqtSignal(int)  # pid
     depot_completed = pyqtSignal(str)  # depot_id
     cancellation_requested = pyqtSignal()
     finished = pyqtSignal()
     cancelled = pyqtSignal()  # New specific signal for cancellation
     error = pyqtSignal(str)
 
-    def __init__(self):
+    def __init__(self, max_parallel_depots=None, connection_budget=None):
         super().__init__()
-        self.percentage_regex = re.compile(r"(\d{1,3}\.\d{2})%")
-        self.bytes_regex = re.compile(
-            r"Depot (\d+) - Downloaded (\d+) bytes \((\d+) bytes uncompressed\)"
-        )
-        # Multiple patterns for different DepotDownloader versions/formats
-        self.alt_bytes_patterns = [
-            re.compile(r"Downloaded\s+(\d+)\s+bytes"),
-            re.compile(r"Downloaded\s+([\d.]+)\s*[KMGT]?B"),
-            re.compile(r"(\d+)\s+bytes\s+downloaded"),
-            re.compile(r"Progress:\s+(\d+\.?\d*)%"),
-        ]
-        self.last_percentage = -1
         self.steamless_integration = None
         self.game_data = None
-        self.total_downloaded = 0
-        self.total_uncompressed = 0
+        self.progress_parser: Optional[DepotProgressParser] = None
+        self.progress_coalescer: Optional[ProgressCoalescer] = None
+
+        # Scheduling limits (None = read from settings when the task runs)
+        self.max_parallel_depots = max_parallel_depots
+        self.connection_budget = connection_budget
+        self.connection_tuner: Optional[ConnectionTuner] = None
+        self._connections_per_process = 1
 
         # Controle de cancelamento
         self._should_stop = False
-        self._current_process = None
-        self._current_reader_thread = None
-        self._current_stream_reader = None
-
-    def _cleanup_reader_thread(self):
-        """Clean up reader thread and stream reader safely"""
-        if not self._current_reader_thread:
-            return
-
-        try:
-            # Stop stream reader first
-            if self._current_stream_reader:
-                try:
-                    self._current_stream_reader.stop()
-                except Exception as e:
-                    logger.debug(f"Error stopping stream reader: {e}")
-
-            # Quit thread and wait for completion with enhanced safety
-            if self._current_reader_thread:
-                try:
-                    if self._current_reader_thread.isRunning():
-                        self._current_reader_thread.quit()
-                        if not self._current_reader_thread.wait(5000):
-                            logger.warning(
-                                "Reader thread did not finish cleanly, terminating"
-                            )
-                            self._current_reader_thread.terminate()
-                            self._current_reader_thread.wait(2000)
-
-                    # Schedule deletion with error handling
-                    try:
-                        self._current_reader_thread.deleteLater()
-                    except Exception as e:
-                        if "wrapped C/C++ object" not in str(e):
-                            logger.debug(f"Error deleting reader thread: {e}")
-                except Exception as e:
-                    if "wrapped C/C++ object" not in str(e):
-                        logger.debug(f"Error in reader thread cleanup: {e}")
-
-            # Delete stream reader with error handling
-            if self._current_stream_reader:
-                try:
-                    self._current_stream_reader.deleteLater()
-                except Exception as e:
-                    if "wrapped C/C++ object" not in str(e):
-                        logger.debug(f"Error deleting stream reader: {e}")
-
-        except Exception as e:
-            if "wrapped C/C++ object" not in str(e):
-                logger.error(f"Error cleaning up reader thread: {e}")
-        finally:
-            # Always clear references
-            self._current_reader_thread = None
-            self._current_stream_reader = None
-
-    def run(self, game_data, selected_depots, dest_path):
+        self._active_downloads: Dict[str, DepotDownload] = {}
+        self._depot_downloads: Dict[str, DepotDownload] = {}
+        self._output: Optional[ProcessOutputMultiplexer] = None
+        # Manifest id, manifest path and install dir of each scheduled depot
+        self._depot_targets: Dict[str, tuple] = {}
+        # Incremental update plan of depots that are already installed
+        self._update_plans: Dict[str, UpdatePlan] = {}
+        self.workspace: Optional[SessionWorkspace] = None
+        self._owns_workspace = False
+        self._log_file = None
+
+    def run(self, game_data, selected_depots, dest_path, workspace_dir=None):
         """
         TASK: Prepares and executes the DepotDownloaderMod commands to download
         files directly into the final destination directory.
+
+        Keys, manifests and the raw DepotDownloaderMod log live in the session
+        workspace ``workspace_dir``; without one a private workspace is
+        created for this run and removed at the end.
         """
         logger.debug(f"Download task starting for {len(selected_depots)} depots.")
         self.game_data = game_data  # Store game_data for later use
         self._should_stop = False  # Reset cancel flag
 
+        if workspace_dir:
+            self.workspace = SessionWorkspace(workspace_dir)
+            self.workspace.ensure()
+            self._owns_workspace = False
+        else:
+            self.workspace = SessionWorkspace.create("download")
+            self._owns_workspace = True
+            ingest_workspace = SessionWorkspace.from_game_data(game_data)
+            if ingest_workspace and ingest_workspace.exists():
+                shutil.copytree(
+                    ingest_workspace.manifest_dir,
+                    self.workspace.manifest_dir,
+                    dirs_exist_ok=True,
+                )
+
+        try:
+            self._run_downloads(game_data, selected_depots, dest_path)
+        finally:
+            self._close_workspace()
+
+    def _run_downloads(self, game_data, selected_depots, dest_path):
+
+        max_parallel = self._get_max_parallel_depots()
         commands, skipped_depots = self._prepare_downloads(
-            game_data, selected_depots, dest_path
+            game_data, selected_depots, dest_path, max_parallel
         )
         if not commands:
-            self.progress.emit("No valid download commands to execute. Task finished.")
+            if self._update_plans and not skipped_depots:
+                self.progress.emit("All selected depots are up to date.")
+            else:
+                self.progress.emit("No valid download commands to execute. Task finished.")
             self.finished.emit()
             return
 
-        total_depots = len(commands)
+        if self._should_preallocate():
+            self._preallocate_files(commands)
 
-        try:
-            for i, command in enumerate(commands):
-                # Verificar cancelamento antes de cada depot
-                if self._should_stop:
-                    self.progress.emit("Download cancelled by user")
-                    self.cancelled.emit()
-                    return
-
-                depot_id = command[4]
-                self.progress.emit(
-                    f"--- Starting download for depot {depot_id} ({i + 1}/{total_depots}) ---"
-                )
-                self.last_percentage = -1
+        total_depots = len(commands)
+        pending = deque(commands)
+        started_depots = 0
+        # Output and progress reach the GUI in batches at a fixed rate
+        self.progress_coalescer = ProgressCoalescer()
+        # Sizes and totals are cached once for the whole session
+        self.progress_parser = DepotProgressParser(
+            [command[4] for command in commands],
+            self._progress_sizes(game_data),
+            game_data.get("total_game_size", 0),
+            frame_interval=self.progress_coalescer.flush_interval,
+        )
+        self._depot_downloads = {}
+        self.connection_tuner = ConnectionTuner(
+            default_connections=self._connections_per_process,
+            max_connections=self._get_connection_budget(),
+        )
 
-                try:
-                    self._current_process = subprocess.Popen(
-                        command,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        text=True,
-                        encoding="utf-8",
-                        creationflags=subprocess.CREATE_NO_WINDOW
-                        if sys.platform == "win32"
-                        else 0,
-                    )
+        logger.debug(
+            f"Scheduling {total_depots} depots with up to {max_parallel} parallel downloads"
+        )
 
-                    # Emitir signal que processo iniciou
-                    self.process_started.emit(self._current_process)
-
-                    reader_thread = QThread()
-                    stream_reader = StreamReader(self._current_process.stdout)
-                    stream_reader.moveToThread(reader_thread)
-
-                    stream_reader.new_line.connect(self._handle_downloader_output)
-                    reader_thread.started.connect(stream_reader.run)
-
-                    # Store thread reference for proper cleanup
-                    self._current_reader_thread = reader_thread
-                    self._current_stream_reader = stream_reader
-
-                    reader_thread.start()
-
-                    # Monitor process with cancellation check
-                    process_terminated_cleanly = False
-                    while self._current_process.poll() is None:
-                        if self._should_stop:
-                            self.progress.emit("Cancelando download atual...")
-                            try:
-                                self._current_process.terminate()
-                                # Wait up to 5 seconds for graceful termination
-                                try:
-                                    self._current_process.wait(timeout=5)
-                                    process_terminated_cleanly = True
-                                except subprocess.TimeoutExpired:
-                                    self.progress.emit("Forcing process termination...")
-                                    self._current_process.kill()
-                                    self._current_process.wait(timeout=2)
-                                    process_terminated_cleanly = True
-                            except (psutil.NoSuchProcess, OSError) as e:
-                                logger.debug(f"Process already terminated: {e}")
-                                process_terminated_cleanly = True
-                            break
-                        QThread.msleep(100)  # Small pause to avoid CPU overload
-
-                    # Wait for process completion if not cancelled
-                    if not self._should_stop:
-                        self._current_process.wait()
-
-                    # Limpar recursos da thread e processo com sincronização
-                    self._cleanup_reader_thread()
-
-                    # Check process result BEFORE cleanup
-                    process_returncode = (
-                        self._current_process.returncode
-                        if self._current_process
-                        else None
-                    )
+        # One reader watches the output of every depot process
+        self._output = ProcessOutputMultiplexer(self._handle_output_batch)
+        try:
+            self._log_file = open(self.workspace.log_path, "a", encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not open download log {self.workspace.log_path}: {e}")
 
-                    # Verificar se foi cancelado durante o processo
-                    if self._should_stop:
-                        if process_terminated_cleanly:
-                            self.progress.emit("Download cancelado com sucesso")
-                        else:
-                            self.progress.emit(
-                                "Download cancelado (pode haver processos residuais)"
-                            )
-                        self.cancelled.emit()
-                        return
-
-                    # Garantir cleanup do processo
-                    try:
-                        if (
-                            self._current_process
-                            and self._current_process.poll() is None
-                        ):
-                            self._current_process.terminate()
-                            try:
-                                self._current_process.wait(timeout=2)
-                            except subprocess.TimeoutExpired:
-                                self._current_process.kill()
-                                self._current_process.wait(timeout=1)
-                    except Exception as e:
-                        logger.error(f"Error cleaning up process: {e}")
-
-                    self._current_process = None
-
-                    if process_returncode == 0:
-                        self.depot_completed.emit(depot_id)
-                    elif process_returncode is not None:
-                        self.progress.emit(
-                            f"Warning: DepotDownloaderMod exited with code {process_returncode} for depot {depot_id}."
-                        )
+        try:
+            while pending or self._active_downloads:
+                # Verificar cancelamento antes de cada rodada do scheduler
+                if self._should_stop:
+                    self.progress.emit("Cancelando download atual...")
+                    terminated_cleanly = self._terminate_active_downloads()
+                    if terminated_cleanly:
+                        self.progress.emit("Download cancelado com sucesso")
                     else:
-                        # Process reference lost is not necessarily an error - can happen after successful completion
-                        logger.debug(
-                            f"Process reference lost for depot {depot_id} after completion."
-                        )
-                        self.depot_completed.emit(depot_id)
-
-                except FileNotFoundError:
-                    self.progress.emit(
-                        "ERROR: ./external/DepotDownloaderMod not found. Make sure it's in the external/ directory."
-                    )
-                    logger.critical("./external/DepotDownloaderMod not found.")
-                    self.error.emit("DepotDownloaderMod not found")
-                    raise
-                except Exception as e:
-                    if not self._should_stop:  # Only emit error if not cancelled
                         self.progress.emit(
-                            f"An unexpected error occurred during download: {e}"
+                            "Download cancelado (pode haver processos residuais)"
                         )
-                        logger.error(f"Download subprocess failed: {e}", exc_info=True)
-                        self.error.emit(f"Download error: {e}")
-                    raise
-
-            # Check cancellation before post-processing
-            if self._should_stop:
-                self.cancelled.emit()
-                return
+                    self.cancelled.emit()
+                    return
 
+                # Fill free slots with the next depots
+                while pending and len(self._active_downloads) < max_parallel:
+                    command = pending.popleft()
+                    started_depots += 1
+                    self._start_depot_download(command, started_depots, total_depots)
+
+                # Block until output arrives, a process closes its output
+                # (i.e. exits), cancellation wakes us up or buffered progress
+                # is due to be flushed
+                finished_depots = self._output.wait(
+                    self.progress_coalescer.time_until_flush()
+                )
+                for depot_id in finished_depots:
+                    download = self._active_downloads.get(depot_id)
+                    if download:
+                        self._finish_depot_download(download)
+                self._flush_progress()
+
+        except FileNotFoundError:
+            self._terminate_active_downloads()
+            self.progress.emit(
+                "ERROR: ./external/DepotDownloaderMod not found. Make sure it's in the external/ directory."
+            )
+            logger.critical("./external/DepotDownloaderMod not found.")
+            self.error.emit("DepotDownloaderMod not found")
+            raise
         except Exception as e:
-            if not self._should_stop:
-                self.error.emit(f"Task failed: {e}")
+            self._terminate_active_downloads()
+            if not self._should_stop:  # Only emit error if not cancelled
+                self.progress.emit(f"An unexpected error occurred during download: {e}")
+                logger.error(f"Download subprocess failed: {e}", exc_info=True)
+                self.error.emit(f"Download error: {e}")
             raise
+        finally:
+            self._output.close()
+            self._flush_progress(force=True)
+
+        # Check cancellation before post-processing
+        if self._should_stop:
+            self.cancelled.emit()
+            return
 
         if skipped_depots:
             self.progress.emit(
@@ -304,19 +241,10 @@ class DownloadDepotsTask(QObject):
             return
 
         self.progress.emit("--- Cleaning up temporary files ---")
-        for filename in ["keys.vdf", "manifest"]:
-            path = os.path.join(os.getcwd(), filename)
-            if os.path.exists(path):
-                try:
-                    if os.path.isdir(path):
-                        import shutil
-
-                        shutil.rmtree(path)
-                    else:
-                        os.remove(path)
-                    self.progress.emit(f"Removed '{filename}'.")
-                except OSError as e:
-                    self.progress.emit(f"Error removing '{filename}': {e}")
+        # The depot keys are only needed while DepotDownloaderMod runs; the
+        # manifests stay in the workspace until the session is finished
+        self.workspace.remove_keys()
+        self.progress.emit("Removed depot keys file.")
 
         # Check cancellation before post-processing
         if self._should_stop:
@@ -349,38 +277,209 @@ class DownloadDepotsTask(QObject):
         # Emit completion signal
         self.finished.emit()
 
-    def _prepare_downloads(self, game_data, selected_depots, dest_path):
+    def _start_depot_download(self, command, depot_number, total_depots):
+        """Launches DepotDownloaderMod for one depot and starts reading its output."""
+        depot_id = command[4]
+        self.progress.emit(
+            f"--- Starting download for depot {depot_id} ({depot_number}/{total_depots}) ---"
+        )
+
+        # Let the tuner pick the connection count for this process
+        connections = self._connections_per_process
+        if self.connection_tuner:
+            connections = self.connection_tuner.next_connections(
+                self._connections_per_process
+            )
+        command = list(command)
+        command[command.index("-max-downloads") + 1] = str(connections)
+        logger.debug(f"Depot {depot_id} uses {connections} connections")
+
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            creationflags=subprocess.CREATE_NO_WINDOW
+            if sys.platform == "win32"
+            else 0,
+        )
+        download = DepotDownload(
+            depot_id=depot_id,
+            process=process,
+            connections=connections,
+            started_at=time.monotonic(),
+        )
+        self._active_downloads[depot_id] = download
+        self._depot_downloads[depot_id] = download
+
+        # Emitir signal que processo iniciou
+        self.process_started.emit(process)
+
+        self._output.add(depot_id, process.stdout)
+
+    def _finish_depot_download(self, download):
+        """Collects the result of a depot whose process has exited."""
+        process = download.process
+        process.wait()
+        download.finished_at = time.monotonic()
+
+        self._active_downloads.pop(download.depot_id, None)
+        self.process_finished.emit(process.pid)
+
+        if process.returncode == 0:
+            self.progress_parser.mark_completed(download.depot_id)
+            self._flush_progress(force=True)
+            self._record_depot_throughput(download)
+            self._record_installed_depot(download.depot_id)
+            self.depot_completed.emit(download.depot_id)
+        else:
+            self._flush_progress(force=True)
+            self.progress.emit(
+                f"Warning: DepotDownloaderMod exited with code {process.returncode} for depot {download.depot_id}."
+            )
+
+    def _record_depot_throughput(self, download):
+        """Feeds the throughput of a finished depot to the connection tuner."""
+        download.downloaded_bytes = self.progress_parser.reported_bytes(
+            download.depot_id
+        )
+        if (
+            not self.connection_tuner
+            or download.throughput_recorded
+            or download.finished_at is None
+            or download.downloaded_bytes is None
+        ):
+            return
+
+        download.throughput_recorded = True
+        self.connection_tuner.record(
+            download.connections,
+            download.downloaded_bytes,
+            download.finished_at - download.started_at,
+        )
+
+    def _terminate_active_downloads(self):
+        """
+        Terminates every running depot process.
+
+        Returns:
+            bool: True if all processes were stopped cleanly
+        """
+        terminated_cleanly = True
+
+        for download in list(self._active_downloads.values()):
+            process = download.process
+            try:
+                if process.poll() is None:
+                    process.terminate()
+            except (psutil.NoSuchProcess, OSError) as e:
+                logger.debug(f"Process already terminated: {e}")
+
+        for download in list(self._active_downloads.values()):
+            process = download.process
+            try:
+                # Wait up to 5 seconds for graceful termination
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self.progress.emit("Forcing process termination...")
+                    process.kill()
+                    process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                logger.warning(f"Process {process.pid} did not exit after kill")
+                terminated_cleanly = False
+            except (psutil.NoSuchProcess, OSError) as e:
+                logger.debug(f"Process already terminated: {e}")
+
+            if self._output:
+                self._output.remove(download.depot_id)
+            self.process_finished.emit(process.pid)
+
+        self._active_downloads.clear()
+        return terminated_cleanly
+
+    def _should_preallocate(self):
+        """Whether large files are preallocated before downloading."""
+        try:
+            from utils.settings import get_download_setting
+
+            return get_download_setting("preallocate_files")
+        except Exception:
+            return False
+
+    def _preallocate_files(self, commands):
+        """
+        Reserves the space of each depot's large files before any download
+        starts, so a full disk fails the run immediately.
+        """
+        from core.disk_space import preallocate_depot_files
+
+        total = 0
+        for command in commands:
+            manifest_path = command[command.index("-manifestfile") + 1]
+            download_dir = command[command.index("-dir") + 1]
+            try:
+                total += preallocate_depot_files(manifest_path, download_dir)
+            except OSError as e:
+                self.progress.emit(
+                    f"ERROR: Not enough disk space in {download_dir} for depot {command[4]}: {e}"
+                )
+                logger.error(f"Preallocation failed for depot {command[4]}: {e}")
+                self.error.emit(f"Not enough disk space: {e}")
+                raise
+        if total:
+            self.progress.emit(f"Preallocated {total / 1024**3:.2f} GB for large files")
+
+    def _get_max_parallel_depots(self):
+        """Returns how many depot processes may run at once."""
+        if self.max_parallel_depots is None:
+            try:
+                from utils.settings import get_download_setting
+
+                self.max_parallel_depots = get_download_setting("max_parallel_depots")
+            except Exception:
+                self.max_parallel_depots = 1
+        return max(1, int(self.max_parallel_depots))
+
+    def _get_connection_budget(self):
+        """Returns the total number of connections shared by all depot processes."""
+        if self.connection_budget is None:
+            try:
+                from utils.settings import get_download_setting
+
+                self.connection_budget = get_download_setting("connection_budget")
+            except Exception:
+                self.connection_budget = 25
+        return max(1, int(self.connection_budget))
+
+    def _close_workspace(self):
+        """Closes the download log and removes a workspace owned by this run."""
+        if self._log_file:
+            try:
+                self._log_file.close()
+            except OSError:
+                pass
+            self._log_file = None
+        if self.workspace:
+            self.workspace.remove_keys()
+            if self._owns_workspace:
+                self.workspace.remove()
+
+    def _prepare_downloads(self, game_data, selected_depots, dest_path, max_parallel=1):
         """Prepares keys.vdf and command list."""
-        keys_path = os.path.join(os.getcwd(), "keys.vdf")
+        keys_path = os.path.abspath(self.workspace.keys_path)
         self.progress.emit(f"Generating depot keys file at {keys_path}")
         with open(keys_path, "w") as f:
             for depot_id in selected_depots:
                 if depot_id in game_data["depots"]:
                     f.write(f"{depot_id};{game_data['depots'][depot_id]['key']}\n")
 
-        safe_game_name_fallback = (
-            re.sub(r"[^\w\s-]", "", game_data.get("game_name", ""))
-            .strip()
-            .replace(" ", "_")
-        )
-        install_folder_name = game_data.get("installdir", safe_game_name_fallback)
-        if not install_folder_name:
-            install_folder_name = f"App_{game_data['appid']}"
-
-        # Sanitize directory name to remove filesystem-invalid characters
-        install_folder_name = re.sub(r'[<>:"/\\|?*]', "_", str(install_folder_name))
-
-        download_dir = os.path.join(
-            dest_path, "steamapps", "common", install_folder_name
-        )
+        download_dir = install_dir_for(game_data, dest_path)
         os.makedirs(download_dir, exist_ok=True)
         self.progress.emit(f"Download destination set to: {download_dir}")
 
-        # Create manifest directory if it doesn't exist
-        manifest_dir = os.path.join(os.getcwd(), "manifest")
-        os.makedirs(manifest_dir, exist_ok=True)
+        self.workspace.ensure()
 
-        commands = []
+        downloadable_depots = []
         skipped_depots = []
         for depot_id in selected_depots:
             manifest_id = game_data["manifests"].get(depot_id)
@@ -390,7 +489,47 @@ class DownloadDepotsTask(QObject):
                 )
                 skipped_depots.append(str(depot_id))
                 continue
+            downloadable_depots.append((depot_id, manifest_id))
+
+        self._depot_targets = {}
+        self._update_plans = {}
+        incremental = self._should_update_incrementally()
+        for depot_id, manifest_id in list(downloadable_depots):
+            manifest_path = os.path.abspath(
+                self.workspace.manifest_path(depot_id, manifest_id)
+            )
+            self._depot_targets[depot_id] = (manifest_id, manifest_path, download_dir)
+            if not incremental:
+                continue
+            plan = self._plan_depot_update(game_data, depot_id, download_dir)
+            if plan is None:
+                continue
+            if plan.up_to_date:
+                self.progress.emit(f"Depot {depot_id} is up to date, nothing to download.")
+                self._update_plans[depot_id] = plan
+                self._record_installed_depot(depot_id)
+                self.depot_completed.emit(depot_id)
+                downloadable_depots.remove((depot_id, manifest_id))
+                continue
+            self._update_plans[depot_id] = plan
+            self.progress.emit(
+                f"Depot {depot_id}: updating {len(plan.changed)} changed files "
+                f"({plan.download_size / 1024**3:.2f} GB), keeping "
+                f"{plan.unchanged_size / 1024**3:.2f} GB of unchanged files"
+            )
 
+        # Split the connection budget across the processes that run concurrently
+        concurrent_slots = max(1, min(max_parallel, len(downloadable_depots)))
+        max_downloads = max(1, self._get_connection_budget() // concurrent_slots)
+        self._connections_per_process = max_downloads
+        if downloadable_depots:
+            self.progress.emit(
+                f"Running up to {concurrent_slots} depot downloads at once "
+                f"with up to {max_downloads} connections each"
+            )
+
+        commands = []
+        for depot_id, manifest_id in downloadable_depots:
             commands.append(
                 [
                     "./external/DepotDownloaderMod",
@@ -401,127 +540,128 @@ class DownloadDepotsTask(QObject):
                     "-manifest",
                     str(manifest_id),
                     "-manifestfile",
-                    os.path.join("manifest", f"{depot_id}_{manifest_id}.manifest"),
+                    self._depot_targets[depot_id][1],
                     "-depotkeys",
                     keys_path,
                     "-max-downloads",
-                    "25",
+                    str(max_downloads),
                     "-dir",
                     download_dir,
                     "--validate",
                     "--no-compress",
                 ]
             )
+            plan = self._update_plans.get(depot_id)
+            if plan:
+                # Only the changed files are downloaded and validated
+                filelist_path = os.path.abspath(self.workspace.filelist_path(depot_id))
+                write_filelist(filelist_path, plan.changed)
+                commands[-1] += ["-filelist", filelist_path]
 
         return commands, skipped_depots
 
-    def _handle_downloader_output(self, line):
-        """Processes a line of output from the downloader."""
-        line = line.strip()
-        self.progress.emit(line)
-
-        # Check for percentage
-        match = self.percentage_regex.search(line)
-        if match:
-            percentage = float(match.group(1))
-            int_percentage = int(percentage)
-
-            if int_percentage != self.last_percentage:
-                self.progress_percentage.emit(int_percentage)
-                self.last_percentage = int_percentage
-
-                # Calculate bytes based on percentage and total size
-                if self.game_data:
-                    # Try depot_sizes first, fallback to total_game_size
-                    depot_sizes = self.game_data.get("depot_sizes", {})
-                    if depot_sizes:
-                        total_size = sum(
-                            depot_sizes.get(depot_id, 0)
-                            for depot_id in depot_sizes.keys()
-                        )
-                    else:
-                        total_size = self.game_data.get("total_game_size", 0)
-
-                    # Also use actual downloaded bytes if available
-                    if self.total_downloaded > 0:
-                        actual_downloaded = self.total_downloaded
-                        # Use actual downloaded bytes as total size if it's larger
-                        if actual_downloaded > total_size:
-                            total_size = actual_downloaded
-                        calculated_bytes = actual_downloaded
-                    else:
-                        if total_size > 0:
-                            calculated_bytes = int((percentage / 100.0) * total_size)
-                            calculated_bytes = max(
-                                calculated_bytes, self.total_downloaded
-                            )  # Use actual if higher
-                        else:
-                            calculated_bytes = self.total_downloaded
-
-                    self.bytes_downloaded.emit(calculated_bytes, total_size)
-
-        # Check for bytes information - try multiple patterns
-        bytes_match = self.bytes_regex.search(line)
-        if bytes_match:
-            depot_id = bytes_match.group(1)
-            downloaded = int(bytes_match.group(2))
-            uncompressed = int(bytes_match.group(3))
-
-            self.total_downloaded += downloaded
-            self.total_uncompressed += uncompressed
-
-            # Emit signal with downloaded bytes
-            if self.game_data and self.game_data.get("depot_sizes"):
-                depot_sizes = self.game_data.get("depot_sizes", {})
-                total_size = sum(
-                    depot_sizes.get(depot_id, 0) for depot_id in depot_sizes.keys()
-                )
-                self.bytes_downloaded.emit(self.total_downloaded, total_size)
+    def _should_update_incrementally(self):
+        """Whether installed depots are updated from a manifest diff."""
+        try:
+            from utils.settings import get_download_setting
+
+            return get_download_setting("incremental_updates")
+        except Exception:
+            return False
+
+    def _plan_depot_update(self, game_data, depot_id, download_dir):
+        """
+        Diffs the manifest the depot is installed with against the new one.
+        Returns None when the depot needs a full download.
+        """
+        installed = installed_manifests.installed_manifest(download_dir, depot_id)
+        manifest_id, manifest_path, _ = self._depot_targets[depot_id]
+        if not installed or not os.path.exists(manifest_path):
+            return None
+
+        old_manifest_id, old_manifest_path = installed
+        try:
+            return plan_update(
+                depot_id,
+                old_manifest_id,
+                old_manifest_path,
+                manifest_id,
+                manifest_path,
+                download_dir,
+                game_data["depots"].get(depot_id, {}).get("key"),
+                installed_manifests.repair_files(download_dir, depot_id),
+            )
+        except Exception as e:
+            logger.warning(
+                f"Could not diff manifests of depot {depot_id}, downloading it fully: {e}"
+            )
+            return None
+
+    def _progress_sizes(self, game_data):
+        """Bytes each depot downloads; only the changed files for updates."""
+        sizes = dict(game_data.get("depot_sizes", {}))
+        for depot_id, plan in self._update_plans.items():
+            sizes[depot_id] = plan.download_size
+        return sizes
 
-            logger.debug(
-                f"Depot {depot_id} - Downloaded {downloaded} bytes ({uncompressed} bytes uncompressed)"
+    def _record_installed_depot(self, depot_id):
+        """
+        Deletes the files an update dropped and keeps the depot's manifest
+        as the base of its next update.
+        """
+        target = self._depot_targets.get(depot_id)
+        if not target:
+            return
+        manifest_id, manifest_path, download_dir = target
+
+        plan = self._update_plans.get(depot_id)
+        if plan and plan.removed:
+            deleted = delete_removed_files(download_dir, plan.removed)
+            self.progress.emit(
+                f"Depot {depot_id}: deleted {deleted} files removed by the update"
             )
-            logger.debug(
-                f"Total downloaded: {self.total_downloaded} bytes ({self.total_uncompressed} bytes uncompressed) from {len(self.game_data.get('depots', {}) if self.game_data else [])} depots"
+
+        if os.path.exists(manifest_path):
+            installed_manifests.record(
+                download_dir,
+                depot_id,
+                manifest_id,
+                manifest_path,
+                self.game_data["depots"].get(depot_id, {}).get("key"),
             )
-        else:
-            # Try alternative patterns for different DepotDownloader versions
-            for pattern in self.alt_bytes_patterns:
-                alt_match = pattern.search(line)
-                if alt_match:
-                    try:
-                        if "bytes" in line.lower():
-                            downloaded = int(alt_match.group(1))
-                        else:
-                            # Handle percentage-based progress
-                            percentage = float(alt_match.group(1))
-                            if self.game_data and self.game_data.get("depot_sizes"):
-                                depot_sizes = self.game_data.get("depot_sizes", {})
-                                total_size = sum(
-                                    depot_sizes.get(depot_id, 0)
-                                    for depot_id in depot_sizes.keys()
-                                )
-                                downloaded = int((percentage / 100.0) * total_size)
-                            else:
-                                downloaded = 0
-
-                        self.total_downloaded += downloaded
-
-                        # Emit with available total size
-                        if self.game_data and self.game_data.get("depot_sizes"):
-                            depot_sizes = self.game_data.get("depot_sizes", {})
-                            total_size = sum(
-                                depot_sizes.get(depot_id, 0)
-                                for depot_id in depot_sizes.keys()
-                            )
-                            self.bytes_downloaded.emit(
-                                self.total_downloaded, total_size
-                            )
-
-                        break  # Stop after first match
-                    except (ValueError, IndexError) as e:
-                        logger.debug(f"Failed to parse alt pattern: {e}")
-                        continue
+
+    def _handle_output_batch(self, depot_id, lines):
+        """Processes a batch of complete output lines from one depot process."""
+        stripped_lines = [line.strip() for line in lines]
+        if self._log_file:
+            # Full, unsummarized output for troubleshooting
+            self._log_file.writelines(f"[{depot_id}] {line}\n" for line in stripped_lines)
+        self.progress_coalescer.add_lines(depot_id, stripped_lines)
+        self.progress_parser.feed(depot_id, stripped_lines)
+
+    def _flush_progress(self, force=False):
+        """Sends buffered output and progress to the GUI if a flush is due."""
+        if not self.progress_coalescer:
+            return
+        batch = self.progress_coalescer.flush(force=force)
+        if batch:
+            self.progress_batch.emit(batch)
+        if self.progress_parser:
+            # Keep the counters in step with the lines that were just sent
+            self._emit_progress_update(force=force or bool(batch))
+
+    def _emit_progress_update(self, force=False):
+        """Emits the aggregated progress, at most once per frame interval."""
+        update = self.progress_parser.take_update(force=force)
+        if not update:
+            return
+
+        for depot_id, percentage in update.depot_percentages:
+            self.depot_progress.emit(depot_id, percentage)
+        if update.percentage is not None:
+            self.progress_percentage.emit(update.percentage)
+        if update.total_bytes > 0 or update.downloaded_bytes > 0:
+            self.bytes_downloaded.emit(update.downloaded_bytes, update.total_bytes)
 
     def _is_steamless_enabled(self):
         """Check if Steamless DRM removal is enabled in settings"""
@@ -586,6 +726,8 @@ class DownloadDepotsTask(QObject):
     def request_cancellation(self):
         """Solicita cancelamento do download"""
         self._should_stop = True
+        if self._output:
+            self._output.wake()
         self.cancellation_requested.emit()
         logger.info("Download cancellation requested")
 
@@ -600,22 +742,8 @@ class DownloadDepotsTask(QObject):
     def cleanup(self):
         """Clean up all resources properly"""
         try:
-            # Stop reader thread
-            self._cleanup_reader_thread()
-
-            # Terminate any running process
-            if self._current_process and self._current_process.poll() is None:
-                try:
-                    self._current_process.terminate()
-                    self._current_process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    self._current_process.kill()
-                    self._current_process.wait(timeout=2)
-                except Exception as e:
-                    logger.warning(f"Error terminating process during cleanup: {e}")
-
-            # Clear references
-            self._current_process = None
-
+            # Terminate any running process and stop watching its output
+            if self._active_downloads:
+                self._terminate_active_downloads()
         except Exception as e:
             logger.error(f"Error during DownloadDepotsTask cleanup: {e}")
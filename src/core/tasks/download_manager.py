@@ -10,7 +10,7 @@ import signal
 import sys
 import uuid
 from datetime import datetime
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 
 import psutil
 from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
@@ -21,6 +21,7 @@ from utils.task_runner import TaskRunner
 
 from .download_depots_task import DownloadDepotsTask
 from .download_session import DownloadSession, DownloadState
+from .workspace import SessionWorkspace
 
 logger = get_internationalized_logger()
 
@@ -41,13 +42,15 @@ class DownloadManager(QObject):
     # State signals
     state_changed = pyqtSignal(str)  # DownloadState value
     depot_completed = pyqtSignal(str)  # depot_id
+    depot_progress = pyqtSignal(str, int)  # depot_id, percentage
     steamless_progress = pyqtSignal(str)  # Steamless processing message
 
     def __init__(self):
         super().__init__()
         self.current_session: Optional[DownloadSession] = None
         self.download_task: Optional[DownloadDepotsTask] = None
-        self.current_process: Optional[psutil.Process] = None
+        # DepotDownloaderMod processes currently running, keyed by PID
+        self.active_processes: Dict[int, psutil.Process] = {}
         self.task_runner: Optional[TaskRunner] = None
         self.download_state = DownloadState.IDLE
 
@@ -126,33 +129,99 @@ class DownloadManager(QObject):
             # Salvar estado inicial
             self.current_session.save()
 
-            # Reset completion control
-            self._task_finishing = False
+            # The session downloads from its own workspace, which also keeps
+            # the manifests so the session survives a crash or reboot
+            ingest_workspace = SessionWorkspace.from_game_data(game_data)
+            manifest_source = (
+                ingest_workspace.manifest_dir
+                if ingest_workspace
+                else os.path.join(os.getcwd(), "manifest")
+            )
+            self.current_session.store_manifests(manifest_source)
 
-            # Configurar task de download
-            self.download_task = DownloadDepotsTask()
-            self._setup_task_connections()
+            self._launch_session(selected_depots)
 
-            # Mudar estado
-            self._set_state(DownloadState.DOWNLOADING)
+            logger.debug(f"Download started with session_id: {session_id}")
+            return session_id
 
-            # Iniciar download em thread controlada
-            self._run_download_task(game_data, selected_depots, dest_path)
+        except Exception as e:
+            logger.error(f"Failed to start download: {e}")
+            self.download_error.emit(f"Failed to start download: {e}")
+            return ""
 
-            # Iniciar monitoramento
-            self.monitor_timer.start()
+    def resume_session(self, session_id: str) -> str:
+        """
+        Resume a session interrupted by a crash, power loss or reboot.
 
-            # Emitir signal
-            self.download_started.emit(session_id)
+        Keys are regenerated from the persisted game data and the manifests
+        are read from the session workspace. Only depots that did not
+        complete are started again; files already written to the install
+        directory are kept and reused through DepotDownloaderMod's
+        ``--validate``, so only missing or damaged chunks are downloaded.
 
-            logger.debug(f"Download started with session_id: {session_id}")
+        Returns:
+            str: The session ID or empty string in case of error
+        """
+        try:
+            session = DownloadSession.load_session(session_id)
+            if not session:
+                raise ValueError(f"Session not found: {session_id}")
+
+            if not session.dest_path or not os.path.exists(session.dest_path):
+                raise ValueError(
+                    f"Destination path does not exist: {session.dest_path}"
+                )
+
+            remaining_depots = session.get_remaining_depots()
+            if not remaining_depots:
+                raise ValueError(f"Session {session_id} has no depots left to download")
+
+            missing = session.get_missing_manifests()
+            if missing:
+                logger.warning(
+                    f"No stored manifest for depots {', '.join(missing)}; they will be skipped"
+                )
+
+            session.download_state = DownloadState.DOWNLOADING
+            session.error_message = ""
+            self.current_session = session
+            session.save()
+
+            logger.info(
+                f"Resuming session {session_id}: {len(session.completed_depots)}/"
+                f"{len(session.selected_depots)} depots already completed"
+            )
+            self._launch_session(remaining_depots)
             return session_id
 
         except Exception as e:
-            logger.error(f"Failed to start download: {e}")
-            self.download_error.emit(f"Failed to start download: {e}")
+            logger.error(f"Failed to resume download: {e}")
+            self.download_error.emit(f"Failed to resume download: {e}")
             return ""
 
+    def _launch_session(self, depots: list):
+        """Starts the download task for the given depots of the current session"""
+        session = self.current_session
+
+        # Reset completion control
+        self._task_finishing = False
+
+        # Configurar task de download
+        self.download_task = DownloadDepotsTask()
+        self._setup_task_connections()
+
+        # Mudar estado
+        self._set_state(DownloadState.DOWNLOADING)
+
+        # Iniciar download em thread controlada
+        self._run_download_task(session.game_data, depots, session.dest_path)
+
+        # Iniciar monitoramento
+        self.monitor_timer.start()
+
+        # Emitir signal
+        self.download_started.emit(session.session_id)
+
     def pause_download(self):
         """Pausa download atual"""
         try:
@@ -160,24 +229,15 @@ class DownloadManager(QObject):
                 logger.warning(f"Cannot pause: download state is {self.download_state.value}")
                 return
 
-            if not self.current_process:
+            processes = self._get_running_processes()
+            if not processes:
                 logger.warning("Cannot pause: no active process")
                 return
 
-            try:
-                if not self.current_process.is_running():
-                    logger.warning("Cannot pause: process is not running")
-                    return
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                logger.warning("Cannot pause: process no longer exists")
-                return
+            logger.debug(f"Pausing download ({len(processes)} processes)...")
 
-            logger.debug("Pausing download...")
-
-            if sys.platform in ["linux", "darwin"]:
-                os.kill(self.current_process.pid, signal.SIGSTOP)
-            elif sys.platform == "win32":
-                self.current_process.suspend()
+            for process in processes:
+                self._suspend_process(process)
 
             self._set_state(DownloadState.PAUSED)
             if self.current_session:
@@ -198,24 +258,15 @@ class DownloadManager(QObject):
                 logger.warning(f"Cannot resume: download state is {self.download_state.value}")
                 return
 
-            if not self.current_process:
+            processes = self._get_running_processes()
+            if not processes:
                 logger.warning("Cannot resume: no active process")
                 return
 
-            try:
-                if not self.current_process.is_running():
-                    logger.warning("Cannot resume: process is not running")
-                    return
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                logger.warning("Cannot resume: process no longer exists")
-                return
-
-            logger.debug("Resuming download...")
+            logger.debug(f"Resuming download ({len(processes)} processes)...")
 
-            if sys.platform in ["linux", "darwin"]:
-                os.kill(self.current_process.pid, signal.SIGCONT)
-            elif sys.platform == "win32":
-                self.current_process.resume()
+            for process in processes:
+                self._resume_process(process)
 
             self._set_state(DownloadState.DOWNLOADING)
             if self.current_session:
@@ -252,14 +303,9 @@ class DownloadManager(QObject):
             if self.download_task:
                 self.download_task.request_cancellation()
 
-            # Terminate process with validation
-            if self.current_process:
-                try:
-                    if self.current_process.is_running():
-                        self._terminate_process()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    logger.warning("Process already terminated or inaccessible")
-                    self.current_process = None
+            # Terminate processes with validation
+            if self.active_processes:
+                self._terminate_processes()
 
             # ENHANCED CLEANUP: Aggressive but Steam-safe cleanup
             if self.current_session and self.current_session.dest_path:
@@ -451,9 +497,12 @@ class DownloadManager(QObject):
         """Configura conexões com a task de download"""
         if self.download_task:
             self.download_task.progress.connect(self._handle_progress)
+            self.download_task.progress_batch.connect(self._handle_progress_batch)
             self.download_task.progress_percentage.connect(self._handle_percentage)
             self.download_task.bytes_downloaded.connect(self._handle_bytes_downloaded)
             self.download_task.process_started.connect(self._on_process_started)
+            self.download_task.process_finished.connect(self._on_process_finished)
+            self.download_task.depot_progress.connect(self.depot_progress.emit)
             self.download_task.depot_completed.connect(self._on_depot_completed)
             self.download_task.finished.connect(self._on_task_finished)
             self.download_task.cancelled.connect(
@@ -471,8 +520,17 @@ class DownloadManager(QObject):
                 raise ValueError("Download task not initialized")
 
             self.task_runner = TaskRunner()
+            workspace_dir = (
+                DownloadSession.get_session_dir(self.current_session.session_id)
+                if self.current_session
+                else None
+            )
             worker = self.task_runner.run(
-                self.download_task.run, game_data, selected_depots, dest_path
+                self.download_task.run,
+                game_data,
+                selected_depots,
+                dest_path,
+                workspace_dir,
             )
             # Conectar signals do worker para tratamento de erros
             if hasattr(worker, "error"):
@@ -488,65 +546,99 @@ class DownloadManager(QObject):
         self.state_changed.emit(new_state.value)
         logger.debug(f"Download state changed to: {new_state.value}")
 
-    def _terminate_process(self):
-        """Terminate process with proper resource cleanup"""
+    def _get_running_processes(self) -> List[psutil.Process]:
+        """Return the tracked processes that are still alive"""
+        running = []
+        for process in list(self.active_processes.values()):
+            try:
+                if process.is_running():
+                    running.append(process)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return running
+
+    def _suspend_process(self, process: psutil.Process):
+        """Suspend a single DepotDownloaderMod process"""
         try:
-            if self.current_process and self.current_process.is_running():
-                # Tentar terminação gentil primeiro
-                self.current_process.terminate()
+            if sys.platform in ["linux", "darwin"]:
+                os.kill(process.pid, signal.SIGSTOP)
+            elif sys.platform == "win32":
+                process.suspend()
+        except (psutil.NoSuchProcess, ProcessLookupError):
+            logger.debug(f"Process {process.pid} exited before it could be paused")
 
-                # Aguardar até 5 segundos
-                try:
-                    self.current_process.wait(timeout=5)
-                except psutil.TimeoutExpired:
-                    # Forçar kill se não responder
-                    logger.warning("Process didn't terminate, forcing kill")
-                    self.current_process.kill()
-                    self.current_process.wait(timeout=2)
+    def _resume_process(self, process: psutil.Process):
+        """Resume a single DepotDownloaderMod process"""
+        try:
+            if sys.platform in ["linux", "darwin"]:
+                os.kill(process.pid, signal.SIGCONT)
+            elif sys.platform == "win32":
+                process.resume()
+        except (psutil.NoSuchProcess, ProcessLookupError):
+            logger.debug(f"Process {process.pid} exited before it could be resumed")
 
+    def _terminate_processes(self):
+        """Terminate all tracked processes with proper resource cleanup"""
+        processes = self._get_running_processes()
+        try:
+            for process in processes:
+                # Processos pausados precisam continuar para receber SIGTERM
+                self._resume_process(process)
+                # Tentar terminação gentil primeiro
+                process.terminate()
+
+            # Aguardar até 5 segundos
+            gone, alive = psutil.wait_procs(processes, timeout=5)
+            if alive:
+                # Forçar kill se não responder
+                logger.warning("Process didn't terminate, forcing kill")
+                for process in alive:
+                    process.kill()
+                psutil.wait_procs(alive, timeout=2)
+
+            if processes:
                 logger.info("Process terminated successfully")
         except Exception as e:
             logger.error(f"Error terminating process: {e}")
         finally:
-            # Explicitly close process handle to prevent leaks
-            try:
-                if self.current_process:
-                    # Close the process handle
-                    self.current_process = None
-            except Exception as e:
-                logger.warning(f"Error closing process handle: {e}")
+            # Explicitly drop process handles to prevent leaks
+            self.active_processes.clear()
 
     def _monitor_download(self):
-        """Monitora estado do processo e download com race condition prevention"""
+        """Monitora estado dos processos e download com race condition prevention"""
         try:
-            if not self.current_process:
-                return
-
-            # Verificar se processo ainda existe e está rodando
-            is_running = False
-            try:
-                if self.current_process:
-                    is_running = self.current_process.is_running()
-            except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
+            for pid, process in list(self.active_processes.items()):
+                # Verificar se processo ainda existe e está rodando
                 is_running = False
-
-            if not is_running:
-                # Processo terminou - verificar se foi esperado
-                if self.download_state == DownloadState.DOWNLOADING:
-                    # Se não estamos em finalização controlada, verificar terminação inesperada
-                    if not self._task_finishing:
-                        # Delay reduzido para melhor responsividade
-                        QTimer.singleShot(1000, self._check_process_termination)
+                try:
+                    is_running = process.is_running()
+                except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
+                    is_running = False
+
+                if not is_running:
+                    # Processo terminou - verificar se foi esperado
+                    if self.download_state == DownloadState.DOWNLOADING:
+                        # Se não estamos em finalização controlada, verificar terminação inesperada
+                        if not self._task_finishing:
+                            # Delay reduzido para melhor responsividade
+                            QTimer.singleShot(
+                                1000,
+                                lambda pid=pid: self._check_process_termination(pid),
+                            )
         except Exception as e:
             logger.error(f"Error monitoring download: {e}")
 
-    def _check_process_termination(self):
+    def _check_process_termination(self, pid: int):
         """Verifica se a terminação do processo foi inesperada após um delay"""
         try:
             # Se a task está finalizando ou não está mais em DOWNLOADING, ignorar
             if self._task_finishing or self.download_state != DownloadState.DOWNLOADING:
                 return
 
+            # A task reporta processos que terminaram normalmente
+            if pid not in self.active_processes:
+                return
+
             # Se o estado ainda está em DOWNLOADING após 2 segundos, é inesperado
             logger.warning("Process terminated unexpectedly")
             self._handle_unexpected_termination()
@@ -565,6 +657,16 @@ class DownloadManager(QObject):
         logger.debug(f"Download progress: {message}")
         self.download_progress.emit(0, message)  # Percentage será calculado depois
 
+    def _handle_progress_batch(self, lines: list):
+        """Handle a coalesced batch of depot output lines from task"""
+        if not lines:
+            return
+        # One log record per batch instead of per line
+        logger.debug("Download progress:\n" + "\n".join(lines))
+        # The status line only ever shows the newest message, so one emit per
+        # batch is enough; every line is already in the log record above
+        self.download_progress.emit(0, lines[-1])
+
     def _handle_percentage(self, percentage: int):
         """Handle percentage updates"""
         self.download_progress.emit(percentage, "")
@@ -581,15 +683,25 @@ class DownloadManager(QObject):
     def _on_process_started(self, process):
         """Handle process start"""
         try:
-            self.current_process = psutil.Process(process.pid)
+            tracked_process = psutil.Process(process.pid)
+            self.active_processes[process.pid] = tracked_process
             logger.debug(f"Process started with PID: {process.pid}")
+
+            # Depots started by the scheduler while paused must not run
+            if self.download_state == DownloadState.PAUSED:
+                self._suspend_process(tracked_process)
         except Exception as e:
             logger.error(f"Error tracking process: {e}")
 
+    def _on_process_finished(self, pid: int):
+        """Handle process exit reported by the task"""
+        self.active_processes.pop(pid, None)
+
     def _on_depot_completed(self, depot_id: str):
         """Handle depot completion"""
         if self.current_session:
-            self.current_session.completed_depots.append(depot_id)
+            if depot_id not in self.current_session.completed_depots:
+                self.current_session.completed_depots.append(depot_id)
             self.current_session.save()
 
             # Check if this was the last depot
@@ -612,8 +724,8 @@ class DownloadManager(QObject):
         # Marcar que a task está finalizando
         self._task_finishing = True
 
-        # Limpar referência do processo
-        self.current_process = None
+        # Limpar referência dos processos
+        self.active_processes.clear()
 
         # Se já foi cancelado, não fazer nada
         if self.download_state == DownloadState.CANCELLED:
@@ -625,6 +737,7 @@ class DownloadManager(QObject):
         if self.current_session:
             self.current_session.download_state = DownloadState.COMPLETED
             self.current_session.save()
+            DownloadSession.delete_stored_manifests(self.current_session.session_id)
 
             # Calcular caminho de instalação para Online-Fixes
             install_path = self._get_game_install_directory(
@@ -642,14 +755,15 @@ class DownloadManager(QObject):
         # Marcar que a task está finalizando
         self._task_finishing = True
 
-        # Limpar referência ao processo
-        self.current_process = None
+        # Limpar referência aos processos
+        self.active_processes.clear()
 
         # Mudar estado para cancelled
         self._set_state(DownloadState.CANCELLED)
         if self.current_session:
             self.current_session.download_state = DownloadState.CANCELLED
             self.current_session.save()
+            DownloadSession.delete_stored_manifests(self.current_session.session_id)
 
         # Emitir signal de cancelamento
         self.download_cancelled.emit()
@@ -691,20 +805,9 @@ class DownloadManager(QObject):
             if hasattr(self, "monitor_timer"):
                 self.monitor_timer.stop()
 
-            # Terminar processo ativo com cleanup completo
-            if self.current_process:
-                try:
-                    if self.current_process.is_running():
-                        self._terminate_process()
-                    else:
-                        # Even if not running, close the handle
-                        self.current_process = None
-                except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                    logger.debug(f"Process already terminated: {e}")
-                    self.current_process = None
-                except Exception as e:
-                    logger.error(f"Error in process cleanup: {e}")
-                    self.current_process = None
+            # Terminar processos ativos com cleanup completo
+            if self.active_processes:
+                self._terminate_processes()
 
             # Limpar threads ativas
             if hasattr(self, "_active_threads"):
@@ -759,7 +862,7 @@ class DownloadManager(QObject):
                     self.task_runner = None
 
             # Limpar referências
-            self.current_process = None
+            self.active_processes.clear()
             self.current_session = None
 
             logger.debug("DownloadManager cleanup completed")
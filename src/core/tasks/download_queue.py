@@ -0,0 +1,398 @@
+"""
+Download Queue - Persistent queue of download jobs run back to back
+"""
+
+import json
+import os
+import shutil
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from utils.logger import get_internationalized_logger
+
+from .download_session import DownloadSession, DownloadState
+from .workspace import SessionWorkspace
+
+logger = get_internationalized_logger()
+
+QUEUE_DIR = "data/queue"
+
+
+class JobState(Enum):
+    """Possible states of a queued download job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class QueuedJob:
+    """A processed zip waiting to be downloaded into a library"""
+
+    job_id: str
+    game_data: Dict[str, Any] = field(repr=False)
+    selected_depots: List[str]
+    dest_path: str
+    priority: int = 0
+    position: int = 0
+    state: JobState = JobState.QUEUED
+    created: datetime = field(default_factory=datetime.now)
+    zip_path: str = ""
+    session_id: str = ""
+    error_message: str = ""
+
+    @property
+    def game_name(self) -> str:
+        return self.game_data.get("game_name") or f"App_{self.game_data.get('appid')}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to serializable dictionary (game_data is stored separately)"""
+        return {
+            "job_id": self.job_id,
+            "selected_depots": self.selected_depots,
+            "dest_path": self.dest_path,
+            "priority": self.priority,
+            "position": self.position,
+            "state": self.state.value,
+            "created": self.created.isoformat(),
+            "zip_path": self.zip_path,
+            "session_id": self.session_id,
+            "error_message": self.error_message,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], game_data: Dict[str, Any]) -> "QueuedJob":
+        """Create instance from dictionary"""
+        return cls(
+            job_id=data["job_id"],
+            game_data=game_data,
+            selected_depots=data["selected_depots"],
+            dest_path=data["dest_path"],
+            priority=data.get("priority", 0),
+            position=data.get("position", 0),
+            state=JobState(data.get("state", JobState.QUEUED.value)),
+            created=datetime.fromisoformat(data["created"]),
+            zip_path=data.get("zip_path", ""),
+            session_id=data.get("session_id", ""),
+            error_message=data.get("error_message", ""),
+        )
+
+
+class DownloadQueue(QObject):
+    """
+    Persistent queue of download jobs (zip -> selected depots -> library).
+
+    Jobs are ordered by priority (higher first) and then by their position in
+    the queue. Each job keeps its own copy of the game data and manifests in
+    ``data/queue/<job_id>/`` so it can start long after the zip was
+    processed, and the queue itself is saved to ``data/queue/queue.json`` on
+    every change so it survives restarts. A job that was running when the
+    application exited goes back to the queue and resumes its download
+    session when it is started again.
+
+    Jobs run back to back through the DownloadManager; the depots of the
+    running job share the download connection budget.
+    """
+
+    queue_changed = pyqtSignal()
+    job_started = pyqtSignal(str)  # job_id
+    job_finished = pyqtSignal(str, str)  # job_id, JobState value
+
+    def __init__(self, download_manager, queue_dir: str = QUEUE_DIR):
+        super().__init__()
+        self.download_manager = download_manager
+        self.queue_dir = queue_dir
+        self.queue_path = os.path.join(queue_dir, "queue.json")
+        self.jobs: Dict[str, QueuedJob] = {}
+        self.current_job_id: Optional[str] = None
+        # False once the user cancels a job, until the queue is started again
+        self.running = False
+
+        self._load()
+
+        download_manager.download_completed.connect(self._on_download_completed)
+        download_manager.download_cancelled.connect(self._on_download_cancelled)
+        download_manager.download_error.connect(self._on_download_error)
+
+    # --- Persistence ---
+
+    def _job_dir(self, job_id: str) -> str:
+        return os.path.join(self.queue_dir, job_id)
+
+    def _load(self):
+        """Load the saved queue"""
+        try:
+            if not os.path.exists(self.queue_path):
+                return
+            with open(self.queue_path, "r", encoding="utf-8") as f:
+                saved_jobs = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load download queue: {e}")
+            return
+
+        for job_data in saved_jobs:
+            try:
+                job_id = job_data["job_id"]
+                with open(
+                    os.path.join(self._job_dir(job_id), "game_data.json"),
+                    "r",
+                    encoding="utf-8",
+                ) as f:
+                    game_data = json.load(f)
+                job = QueuedJob.from_dict(job_data, game_data)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable queued job: {e}")
+                continue
+
+            # The application exited while this job was downloading
+            if job.state == JobState.RUNNING:
+                job.state = JobState.QUEUED
+            self.jobs[job.job_id] = job
+
+        if self.jobs:
+            logger.debug(f"Loaded {len(self.jobs)} queued download jobs")
+
+    def _save(self):
+        """Save the queue atomically"""
+        try:
+            os.makedirs(self.queue_dir, exist_ok=True)
+            temp_path = f"{self.queue_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    [job.to_dict() for job in self.jobs.values()], f, indent=2
+                )
+            os.replace(temp_path, self.queue_path)
+        except OSError as e:
+            logger.error(f"Failed to save download queue: {e}")
+        self.queue_changed.emit()
+
+    def _store_job_files(self, job: QueuedJob, manifest_source_dir: str):
+        job_dir = self._job_dir(job.job_id)
+        manifest_dir = os.path.join(job_dir, "manifest")
+        os.makedirs(manifest_dir, exist_ok=True)
+
+        temp_path = os.path.join(job_dir, "game_data.json.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(job.game_data, f)
+        os.replace(temp_path, os.path.join(job_dir, "game_data.json"))
+
+        manifests = job.game_data.get("manifests", {})
+        for depot_id in job.selected_depots:
+            manifest_id = manifests.get(depot_id)
+            if not manifest_id:
+                continue
+            filename = f"{depot_id}_{manifest_id}.manifest"
+            source = os.path.join(manifest_source_dir, filename)
+            if os.path.exists(source):
+                shutil.copy2(source, os.path.join(manifest_dir, filename))
+            else:
+                logger.warning(f"Manifest {filename} not found for queued job")
+
+    # --- Queue management ---
+
+    def enqueue(
+        self,
+        game_data: Dict[str, Any],
+        selected_depots: List[str],
+        dest_path: str,
+        priority: int = 0,
+        zip_path: str = "",
+    ) -> Optional[QueuedJob]:
+        """
+        Add a job to the end of the queue.
+
+        The manifests of the selected depots are copied from the workspace
+        the zip was ingested into, so the job no longer depends on it.
+        """
+        try:
+            job = QueuedJob(
+                job_id=str(uuid.uuid4()),
+                game_data=game_data,
+                selected_depots=list(selected_depots),
+                dest_path=dest_path,
+                priority=priority,
+                position=max((j.position for j in self.jobs.values()), default=-1) + 1,
+                zip_path=zip_path,
+            )
+            ingest_workspace = SessionWorkspace.from_game_data(game_data)
+            manifest_source_dir = (
+                ingest_workspace.manifest_dir
+                if ingest_workspace
+                else os.path.join(os.getcwd(), "manifest")
+            )
+            self._store_job_files(job, manifest_source_dir)
+            self.jobs[job.job_id] = job
+            self._save()
+            logger.info(f"Queued download of {job.game_name} ({len(selected_depots)} depots)")
+            return job
+        except Exception as e:
+            logger.error(f"Failed to queue download: {e}")
+            return None
+
+    def pending_jobs(self) -> List[QueuedJob]:
+        """Jobs waiting to run, in the order they will run"""
+        pending = [job for job in self.jobs.values() if job.state == JobState.QUEUED]
+        pending.sort(key=lambda job: (-job.priority, job.position))
+        return pending
+
+    def all_jobs(self) -> List[QueuedJob]:
+        """Every job: running first, then pending in run order, then finished"""
+        running = [job for job in self.jobs.values() if job.state == JobState.RUNNING]
+        finished = sorted(
+            (
+                job
+                for job in self.jobs.values()
+                if job.state not in (JobState.QUEUED, JobState.RUNNING)
+            ),
+            key=lambda job: job.created,
+        )
+        return running + self.pending_jobs() + finished
+
+    def has_pending(self) -> bool:
+        return any(job.state == JobState.QUEUED for job in self.jobs.values())
+
+    def get_current_job(self) -> Optional[QueuedJob]:
+        return self.jobs.get(self.current_job_id) if self.current_job_id else None
+
+    def set_priority(self, job_id: str, priority: int):
+        job = self.jobs.get(job_id)
+        if job and job.priority != priority:
+            job.priority = priority
+            self._save()
+
+    def move_job(self, job_id: str, offset: int):
+        """Move a pending job up (negative offset) or down in the run order"""
+        pending = self.pending_jobs()
+        index = next((i for i, job in enumerate(pending) if job.job_id == job_id), None)
+        if index is None:
+            return
+        new_index = max(0, min(len(pending) - 1, index + offset))
+        if new_index == index:
+            return
+
+        job = pending.pop(index)
+        pending.insert(new_index, job)
+        # Moving across a priority boundary adopts the neighbour's priority
+        neighbour = pending[new_index + 1] if offset < 0 else pending[new_index - 1]
+        job.priority = neighbour.priority
+        for position, pending_job in enumerate(pending):
+            pending_job.position = position
+        self._save()
+
+    def remove_job(self, job_id: str) -> bool:
+        """Remove a job that is not running"""
+        job = self.jobs.get(job_id)
+        if not job or job.state == JobState.RUNNING:
+            return False
+        del self.jobs[job_id]
+        shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+        self._save()
+        return True
+
+    def clear_finished(self):
+        """Remove every completed, failed or cancelled job"""
+        finished = [
+            job.job_id
+            for job in self.jobs.values()
+            if job.state not in (JobState.QUEUED, JobState.RUNNING)
+        ]
+        for job_id in finished:
+            del self.jobs[job_id]
+            shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+        if finished:
+            self._save()
+
+    # --- Scheduling ---
+
+    def is_download_active(self) -> bool:
+        return self.download_manager.get_current_state() in (
+            DownloadState.DOWNLOADING,
+            DownloadState.PAUSED,
+            DownloadState.CANCELLING,
+        )
+
+    def should_start_next(self) -> bool:
+        """True if the queue is running, idle and has work left"""
+        return self.running and not self.is_download_active() and self.has_pending()
+
+    def start_job(self, job: QueuedJob) -> str:
+        """
+        Start a queued job through the DownloadManager.
+
+        Returns:
+            str: The download session ID or empty string in case of error
+        """
+        if self.is_download_active():
+            logger.warning("Cannot start queued job: a download is already running")
+            return ""
+
+        self.running = True
+        # The job directory doubles as the ingest workspace of the download
+        game_data = dict(job.game_data, ingest_workspace=self._job_dir(job.job_id))
+
+        session_id = ""
+        # A job interrupted by a restart continues its own session
+        if job.session_id:
+            session = DownloadSession.load_session(job.session_id)
+            if session and session.is_interrupted():
+                session_id = self.download_manager.resume_session(job.session_id)
+        if not session_id:
+            session_id = self.download_manager.start_download(
+                game_data, list(job.selected_depots), job.dest_path
+            )
+
+        if not session_id:
+            job.state = JobState.FAILED
+            job.error_message = "Failed to start download"
+            self._save()
+            self.job_finished.emit(job.job_id, job.state.value)
+            return ""
+
+        job.session_id = session_id
+        job.state = JobState.RUNNING
+        job.error_message = ""
+        self.current_job_id = job.job_id
+        self._save()
+        self.job_started.emit(job.job_id)
+        logger.info(f"Started queued download of {job.game_name}")
+        return session_id
+
+    def _finish_current_job(self, state: JobState, error_message: str = ""):
+        job = self.get_current_job()
+        if not job:
+            return
+        self.current_job_id = None
+        job.state = state
+        job.error_message = error_message
+        if state == JobState.COMPLETED:
+            # Only the game data is kept for the job history
+            shutil.rmtree(
+                os.path.join(self._job_dir(job.job_id), "manifest"), ignore_errors=True
+            )
+        self._save()
+        self.job_finished.emit(job.job_id, state.value)
+        logger.info(f"Queued download of {job.game_name} finished: {state.value}")
+
+    def _on_download_completed(self, session_id: str, install_path: str):
+        job = self.get_current_job()
+        if job and job.session_id == session_id:
+            self._finish_current_job(JobState.COMPLETED)
+
+    def _on_download_cancelled(self):
+        # A cancelled job stops the queue until the user starts it again
+        self.running = False
+        self._finish_current_job(JobState.CANCELLED)
+
+    def _on_download_error(self, error_message: str):
+        # Errors while pausing or resuming leave the download running
+        if self.is_download_active():
+            return
+        self._finish_current_job(JobState.FAILED, error_message)
@@ -2,17 +2,33 @@
 Download Session - Data model for download state persistence
 """
 
-import json
 import logging
 import os
+import shutil
 
 from utils.logger import get_internationalized_logger
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
+
+from .session_store import SessionStore
+from .workspace import SessionWorkspace
+
 logger = get_internationalized_logger()
 
+SESSIONS_DIR = "data/sessions"
+
+_session_store: Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    """Shared journal store for all download sessions"""
+    global _session_store
+    if _session_store is None:
+        _session_store = SessionStore(SESSIONS_DIR)
+    return _session_store
+
 
 class DownloadState(Enum):
     """Possible states of a download"""
@@ -44,9 +60,14 @@ class DownloadSession:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to serializable dictionary"""
+        data = self.to_metadata()
+        data["game_data"] = self.game_data
+        return data
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """Serializable dictionary without the bulky game_data"""
         return {
             "session_id": self.session_id,
-            "game_data": self.game_data,
             "selected_depots": self.selected_depots,
             "current_depot_index": self.current_depot_index,
             "completed_depots": self.completed_depots,
@@ -61,9 +82,12 @@ class DownloadSession:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "DownloadSession":
         """Create instance from dictionary"""
+        game_data = data.get("game_data")
+        if game_data is None:
+            game_data = get_session_store().load_game_data(data["session_id"])
         return cls(
             session_id=data["session_id"],
-            game_data=data["game_data"],
+            game_data=game_data,
             selected_depots=data["selected_depots"],
             current_depot_index=data["current_depot_index"],
             completed_depots=data["completed_depots"],
@@ -78,14 +102,10 @@ class DownloadSession:
     def save(self):
         """Save session to file"""
         try:
-            sessions = DownloadSession.load_all_sessions()
-            sessions[self.session_id] = self.to_dict()
-
-            # Ensure directory exists
-            os.makedirs("data/sessions", exist_ok=True)
-
-            with open("data/sessions/download_sessions.json", "w") as f:
-                json.dump(sessions, f, indent=2)
+            store = get_session_store()
+            # game_data is written once, every later save is a journal append
+            store.store_game_data(self.session_id, self.game_data)
+            store.put(self.session_id, self.to_metadata())
 
             logger.debug(f"Session {self.session_id} saved successfully")
 
@@ -96,20 +116,18 @@ class DownloadSession:
     def load_session(cls, session_id: str) -> Optional["DownloadSession"]:
         """Load specific session"""
         try:
-            sessions = cls.load_all_sessions()
-            if session_id in sessions:
-                return cls.from_dict(sessions[session_id])
+            session_data = get_session_store().get(session_id)
+            if session_data is not None:
+                return cls.from_dict(session_data)
         except Exception as e:
             logger.error(f"Failed to load session {session_id}: {e}")
         return None
 
     @classmethod
     def load_all_sessions(cls) -> Dict[str, Dict[str, Any]]:
-        """Load all sessions"""
+        """Load the metadata of all sessions (without game_data)"""
         try:
-            if os.path.exists("data/sessions/download_sessions.json"):
-                with open("data/sessions/download_sessions.json", "r") as f:
-                    return json.load(f)
+            return get_session_store().get_all()
         except Exception as e:
             logger.error(f"Failed to load sessions: {e}")
         return {}
@@ -117,38 +135,135 @@ class DownloadSession:
     @classmethod
     def delete_session(cls, session_id: str):
         """Remove saved session"""
+        cls.delete_sessions([session_id])
+
+    @classmethod
+    def delete_sessions(cls, session_ids: List[str]):
+        """Remove several saved sessions with a single journal append"""
         try:
-            sessions = cls.load_all_sessions()
-            if session_id in sessions:
-                del sessions[session_id]
+            get_session_store().delete(session_ids)
+            logger.debug(f"Sessions deleted: {', '.join(session_ids)}")
+        except Exception as e:
+            logger.error(f"Failed to delete sessions {', '.join(session_ids)}: {e}")
 
-                os.makedirs("data/sessions", exist_ok=True)
-                with open("data/sessions/download_sessions.json", "w") as f:
-                    json.dump(sessions, f, indent=2)
+        for session_id in session_ids:
+            session_dir = cls.get_session_dir(session_id)
+            if os.path.isdir(session_dir):
+                try:
+                    shutil.rmtree(session_dir)
+                except OSError as e:
+                    logger.warning(f"Failed to remove files of session {session_id}: {e}")
 
-                logger.debug(f"Session {session_id} deleted")
-        except Exception as e:
-            logger.error(f"Failed to delete session {session_id}: {e}")
+    @classmethod
+    def load_interrupted_sessions(cls) -> List["DownloadSession"]:
+        """
+        Load sessions that were still running when the application exited
+        (crash, power loss, reboot), newest first.
+        """
+        resumable_states = {DownloadState.DOWNLOADING.value, DownloadState.PAUSED.value}
+        interrupted = []
+        for session_id, session_data in cls.load_all_sessions().items():
+            if session_data.get("download_state") not in resumable_states:
+                continue
+            try:
+                session = cls.from_dict(session_data)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable session {session_id}: {e}")
+                continue
+            if session.is_interrupted():
+                interrupted.append(session)
+
+        interrupted.sort(key=lambda session: session.timestamp, reverse=True)
+        return interrupted
 
     @classmethod
-    def cleanup_old_sessions(cls, days: int = 7):
-        """Remove old sessions (default: 7 days)"""
+    def get_session_dir(cls, session_id: str) -> str:
+        """Directory holding the files a session needs to be resumed"""
+        return os.path.join(SESSIONS_DIR, session_id)
+
+    @classmethod
+    def get_session_workspace(cls, session_id: str) -> SessionWorkspace:
+        """Workspace (keys, manifests, logs) the session downloads from"""
+        return SessionWorkspace(cls.get_session_dir(session_id))
+
+    @classmethod
+    def delete_stored_manifests(cls, session_id: str):
+        """Remove the manifests and keys kept for resuming a session"""
+        workspace = cls.get_session_workspace(session_id)
+        workspace.remove_keys()
+        if os.path.isdir(workspace.manifest_dir):
+            try:
+                shutil.rmtree(workspace.manifest_dir)
+                logger.debug(f"Removed stored manifests of session {session_id}")
+            except OSError as e:
+                logger.warning(f"Failed to remove manifests of session {session_id}: {e}")
+
+    def _manifest_filenames(self) -> Dict[str, str]:
+        manifests = self.game_data.get("manifests", {})
+        return {
+            depot_id: f"{depot_id}_{manifests[depot_id]}.manifest"
+            for depot_id in self.selected_depots
+            if manifests.get(depot_id)
+        }
+
+    def store_manifests(self, source_dir: str) -> int:
+        """
+        Copy the manifests of the selected depots into the session workspace,
+        which the download runs from and which outlives the ingest workspace
+        so the session can be resumed later.
+
+        Returns:
+            int: Number of manifests stored
+        """
+        workspace = self.get_session_workspace(self.session_id)
+        stored = 0
+        try:
+            workspace.ensure()
+            for filename in self._manifest_filenames().values():
+                source = os.path.join(source_dir, filename)
+                if os.path.exists(source):
+                    shutil.copy2(source, os.path.join(workspace.manifest_dir, filename))
+                    stored += 1
+        except OSError as e:
+            logger.error(f"Failed to store manifests of session {self.session_id}: {e}")
+        return stored
+
+    def get_missing_manifests(self) -> List[str]:
+        """Remaining depots whose manifest is not in the session workspace"""
+        manifest_dir = self.get_session_workspace(self.session_id).manifest_dir
+        filenames = self._manifest_filenames()
+        return [
+            depot_id
+            for depot_id in self.get_remaining_depots()
+            if not filenames.get(depot_id)
+            or not os.path.exists(os.path.join(manifest_dir, filenames[depot_id]))
+        ]
+
+    @classmethod
+    def cleanup_old_sessions(cls, days: int = 7, keep: Optional[Iterable[str]] = None):
+        """
+        Remove old sessions (default: 7 days) and their files. Interrupted
+        sessions are kept so they can still be resumed, as are the sessions
+        in ``keep`` (e.g. those of queued jobs).
+        """
         try:
             sessions = cls.load_all_sessions()
             cutoff_date = datetime.now().timestamp() - (days * 24 * 3600)
+            resumable_states = {DownloadState.DOWNLOADING.value, DownloadState.PAUSED.value}
+            keep = set(keep or ())
 
             to_delete = []
             for session_id, session_data in sessions.items():
+                if session_id in keep or session_data.get("download_state") in resumable_states:
+                    continue
                 session_timestamp = datetime.fromisoformat(
                     session_data["timestamp"]
                 ).timestamp()
                 if session_timestamp < cutoff_date:
                     to_delete.append(session_id)
 
-            for session_id in to_delete:
-                cls.delete_session(session_id)
-
             if to_delete:
+                cls.delete_sessions(to_delete)
                 logger.debug(f"Cleaned up {len(to_delete)} old sessions")
 
         except Exception as e:
@@ -186,6 +301,18 @@ class DownloadSession:
             DownloadState.CANCELLED,
         ] and len(self.completed_depots) < len(self.selected_depots)
 
+    def is_interrupted(self) -> bool:
+        """Verifica se a sessão foi interrompida antes de terminar (crash, queda de energia)"""
+        return self.download_state in [
+            DownloadState.DOWNLOADING,
+            DownloadState.PAUSED,
+        ] and bool(self.get_remaining_depots())
+
+    def get_remaining_depots(self) -> List[str]:
+        """Retorna depots selecionados que ainda não foram concluídos"""
+        completed = set(self.completed_depots)
+        return [depot_id for depot_id in self.selected_depots if depot_id not in completed]
+
     def calculate_total_size(self, depot_sizes: Dict[str, int]) -> int:
         """Calcula tamanho total baseado nos tamanhos dos depots selecionados"""
         total = 0
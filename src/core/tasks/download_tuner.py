@@ -0,0 +1,175 @@
+"""
+Download Tuner - Adaptive -max-downloads selection based on measured throughput
+"""
+
+import json
+import os
+import socket
+import time
+from typing import Dict, Optional
+
+from utils.logger import get_internationalized_logger
+
+logger = get_internationalized_logger()
+
+
+class ConnectionTuner:
+    """
+    Picks the -max-downloads value for the next DepotDownloaderMod process.
+
+    Every finished depot reports how many bytes it moved, how long it took and
+    how many connections it used. The tuner keeps an exponential moving average
+    of the throughput seen for each connection count, probes the neighbouring
+    values once and then settles on the fastest one. Measurements are stored
+    per host in a small JSON profile so the next run starts from the best
+    known setting.
+    """
+
+    PROFILE_PATH = "data/download_profile.json"
+
+    # Depots smaller than this are dominated by login/validation time
+    MIN_SAMPLE_BYTES = 64 * 1024 * 1024
+    MIN_SAMPLE_SECONDS = 10.0
+
+    # Weight of the newest sample in the moving average
+    SMOOTHING = 0.5
+
+    # Multiplicative step used when probing neighbouring values
+    PROBE_FACTOR = 1.5
+
+    MIN_CONNECTIONS = 2
+
+    def __init__(self, default_connections: int, max_connections: int, profile_path=None):
+        self.profile_path = profile_path or self.PROFILE_PATH
+        self.host = socket.gethostname() or "localhost"
+        self.max_connections = max(1, int(max_connections))
+        self.default_connections = self._clamp(default_connections)
+        self.throughput: Dict[int, float] = {}
+        self._load_profile()
+
+    def _clamp(self, connections: int) -> int:
+        floor = min(self.MIN_CONNECTIONS, self.max_connections)
+        return max(floor, min(int(connections), self.max_connections))
+
+    def _load_profile(self):
+        """Load the measurements stored for this host"""
+        try:
+            if not os.path.exists(self.profile_path):
+                return
+            with open(self.profile_path, "r", encoding="utf-8") as f:
+                profile = json.load(f)
+            host_profile = profile.get(self.host, {})
+            self.throughput = {
+                int(connections): float(rate)
+                for connections, rate in host_profile.get("throughput", {}).items()
+            }
+            logger.debug(
+                f"Loaded download profile for {self.host}: best={host_profile.get('best_connections')}"
+            )
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Could not read download profile {self.profile_path}: {e}")
+            self.throughput = {}
+
+    def _save_profile(self):
+        """Persist the measurements for this host atomically"""
+        try:
+            profile = {}
+            if os.path.exists(self.profile_path):
+                try:
+                    with open(self.profile_path, "r", encoding="utf-8") as f:
+                        profile = json.load(f)
+                except (OSError, ValueError):
+                    profile = {}
+
+            profile[self.host] = {
+                "best_connections": self.best_connections(),
+                "throughput": {
+                    str(connections): round(rate, 1)
+                    for connections, rate in sorted(self.throughput.items())
+                },
+                "updated": int(time.time()),
+            }
+
+            directory = os.path.dirname(self.profile_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.profile_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(profile, f, indent=2)
+            os.replace(temp_path, self.profile_path)
+        except OSError as e:
+            logger.warning(f"Could not save download profile {self.profile_path}: {e}")
+
+    def best_connections(self) -> Optional[int]:
+        """Return the connection count with the highest measured throughput"""
+        candidates = {
+            connections: rate
+            for connections, rate in self.throughput.items()
+            if connections <= self.max_connections
+        }
+        if not candidates:
+            return None
+        return max(candidates, key=candidates.get)
+
+    def next_connections(self, max_connections: Optional[int] = None) -> int:
+        """
+        Choose the -max-downloads value for the next depot process.
+
+        Args:
+            max_connections: Upper bound for this process (e.g. its share of
+                the global connection budget)
+        """
+        limit = self.max_connections
+        if max_connections is not None:
+            limit = max(1, min(limit, int(max_connections)))
+
+        best = self.best_connections()
+        if best is None:
+            return min(self.default_connections, limit)
+
+        measured = sorted(c for c in self.throughput if c <= self.max_connections)
+        upper = min(int(round(best * self.PROBE_FACTOR)), self.max_connections)
+        lower = max(int(round(best / self.PROBE_FACTOR)), min(self.MIN_CONNECTIONS, best))
+
+        # Probe upwards while the best value is the highest one tried so far
+        if best == measured[-1] and upper > best and upper not in self.throughput:
+            choice = upper
+        # Probe downwards while the best value is the lowest one tried so far
+        elif best == measured[0] and lower < best and lower not in self.throughput:
+            choice = lower
+        else:
+            choice = best
+
+        return max(1, min(choice, limit))
+
+    def record(self, connections: int, bytes_transferred: int, elapsed_seconds: float):
+        """
+        Record the throughput of a finished depot.
+
+        Returns:
+            bool: True if the sample was large enough to be used
+        """
+        if (
+            bytes_transferred < self.MIN_SAMPLE_BYTES
+            or elapsed_seconds < self.MIN_SAMPLE_SECONDS
+        ):
+            logger.debug(
+                f"Ignoring throughput sample ({bytes_transferred} bytes in {elapsed_seconds:.1f}s)"
+            )
+            return False
+
+        rate = bytes_transferred / elapsed_seconds
+        previous = self.throughput.get(connections)
+        if previous is None:
+            self.throughput[connections] = rate
+        else:
+            self.throughput[connections] = (
+                self.SMOOTHING * rate + (1 - self.SMOOTHING) * previous
+            )
+
+        logger.debug(
+            f"Throughput with {connections} connections: {rate / (1024 * 1024):.2f} MB/s "
+            f"(best now {self.best_connections()})"
+        )
+        self._save_profile()
+        return True
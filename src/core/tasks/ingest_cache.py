@@ -0,0 +1,171 @@
+"""
+Ingest Cache - Remembers processed zips so dropping one again is instant
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import zipfile
+from typing import Any, Dict, Optional
+
+from utils.logger import get_internationalized_logger
+
+logger = get_internationalized_logger()
+
+INGEST_CACHE_DIR = "data/ingest_cache"
+
+
+class IngestCache:
+    """
+    Cache of fully enriched game data, keyed by the identity of the zip.
+
+    The key is built from the zip's size and modification time plus the
+    name, CRC and size of every member in its central directory, so it is
+    cheap to compute (nothing is decompressed) and changes whenever the
+    contents change. Each entry is a directory holding the game data as
+    compact JSON and hard links to the extracted manifests; a hit creates
+    the new ingest workspace by linking them instead of extracting again.
+
+    Entries expire after ``max_age_seconds`` because they embed Steam API
+    data, and the newest entries are kept up to ``max_size_bytes`` in
+    total, so a batch of hundreds of small packages is not evicted by its
+    own results.
+    """
+
+    VERSION = 2
+    GAME_DATA_FILENAME = "game_data.json"
+    MANIFEST_DIRNAME = "manifest"
+
+    def __init__(
+        self,
+        cache_dir: str = INGEST_CACHE_DIR,
+        max_age_seconds: int = 24 * 3600,
+        max_size_bytes: int = 1024**3,
+    ):
+        self.cache_dir = cache_dir
+        self.max_age_seconds = max_age_seconds
+        self.max_size_bytes = max_size_bytes
+
+    def key_for(self, zip_path: str, zip_ref: zipfile.ZipFile) -> str:
+        """Cache key of an open zip"""
+        stat = os.stat(zip_path)
+        digest = hashlib.sha1(f"{self.VERSION}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        for info in zip_ref.infolist():
+            digest.update(f"|{info.filename}:{info.CRC:08x}:{info.file_size}".encode())
+        return digest.hexdigest()
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key: str, manifest_dir: str) -> Optional[Dict[str, Any]]:
+        """
+        Game data of a cached zip, with its manifests linked into
+        manifest_dir. Returns None on a miss.
+        """
+        entry_dir = self._entry_dir(key)
+        game_data_path = os.path.join(entry_dir, self.GAME_DATA_FILENAME)
+        try:
+            if time.time() - os.path.getmtime(game_data_path) > self.max_age_seconds:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                return None
+            with open(game_data_path, "r", encoding="utf-8") as f:
+                game_data = json.load(f)
+
+            source_dir = os.path.join(entry_dir, self.MANIFEST_DIRNAME)
+            os.makedirs(manifest_dir, exist_ok=True)
+            if os.path.isdir(source_dir):
+                for filename in os.listdir(source_dir):
+                    _link_or_copy(
+                        os.path.join(source_dir, filename),
+                        os.path.join(manifest_dir, filename),
+                    )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable ingest cache entry {key}: {e}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        logger.debug(f"Ingest cache hit for {key}")
+        return game_data
+
+    def store(
+        self, key: str, game_data: Dict[str, Any], manifest_dir: str, prune: bool = True
+    ):
+        """
+        Cache the game data and manifests of a processed zip. Batch ingests
+        pass prune=False and prune once when the whole batch is stored.
+        """
+        entry_dir = self._entry_dir(key)
+        temp_dir = f"{entry_dir}.tmp"
+        try:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            target_manifest_dir = os.path.join(temp_dir, self.MANIFEST_DIRNAME)
+            os.makedirs(target_manifest_dir)
+            if os.path.isdir(manifest_dir):
+                for filename in os.listdir(manifest_dir):
+                    _link_or_copy(
+                        os.path.join(manifest_dir, filename),
+                        os.path.join(target_manifest_dir, filename),
+                    )
+
+            cached_data = {k: v for k, v in game_data.items() if k != "ingest_workspace"}
+            with open(
+                os.path.join(temp_dir, self.GAME_DATA_FILENAME), "w", encoding="utf-8"
+            ) as f:
+                json.dump(cached_data, f, separators=(",", ":"))
+
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(temp_dir, entry_dir)
+            logger.debug(f"Stored ingest cache entry {key}")
+        except OSError as e:
+            logger.warning(f"Failed to store ingest cache entry {key}: {e}")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return
+
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """Remove the oldest entries until the cache fits in max_size_bytes"""
+        try:
+            entries = [
+                os.path.join(self.cache_dir, name)
+                for name in os.listdir(self.cache_dir)
+                if not name.endswith(".tmp")
+            ]
+            entries.sort(key=os.path.getmtime, reverse=True)
+            total = 0
+            removed = 0
+            for entry_dir in entries:
+                total += _directory_size(entry_dir)
+                if total > self.max_size_bytes:
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                    removed += 1
+            if removed:
+                logger.debug(f"Pruned {removed} ingest cache entries")
+        except OSError as e:
+            logger.warning(f"Failed to prune ingest cache: {e}")
+
+
+def _directory_size(path: str) -> int:
+    size = 0
+    for root, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                size += os.path.getsize(os.path.join(root, filename))
+            except OSError:
+                pass
+    return size
+
+
+def _link_or_copy(source: str, target: str):
+    """Hard link a file, copying it when links are not possible"""
+    if os.path.exists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
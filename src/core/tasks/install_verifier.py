@@ -0,0 +1,238 @@
+"""
+Install Verifier - Check installed game files against their depot manifests
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.logger import get_internationalized_logger
+
+from .installed_manifests import installed_manifests, read_manifest_files
+
+logger = get_internationalized_logger()
+
+VERIFY_REPORTS_DIR = "data/verify_reports"
+# Hashing is bound by the disk more than by the CPU; past a few readers
+# they only compete for the same drive
+MAX_VERIFY_WORKERS = 8
+READ_BUFFER_SIZE = 8 * 1024 * 1024
+# Files are sent to the workers in batches of about this many bytes, so
+# small files do not cost one round trip each
+BATCH_BYTES = 64 * 1024 * 1024
+BATCH_FILES = 256
+# Filesystems with coarse timestamps can report a file as written
+# slightly after the depot was recorded
+MTIME_TOLERANCE_SECONDS = 2
+
+
+def hash_files(paths: List[str]) -> List[Optional[str]]:
+    """
+    SHA1 of each file as hex, or None when it cannot be read (runs in a
+    worker process). Files are read sequentially in large blocks into one
+    reused buffer.
+    """
+    buffer = bytearray(READ_BUFFER_SIZE)
+    view = memoryview(buffer)
+    digests = []
+    for path in paths:
+        try:
+            sha = hashlib.sha1()
+            with open(path, "rb", buffering=0) as f:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                while True:
+                    read = f.readinto(buffer)
+                    if not read:
+                        break
+                    sha.update(view[:read])
+            digests.append(sha.hexdigest())
+        except OSError:
+            digests.append(None)
+    return digests
+
+
+@dataclass
+class VerifyReport:
+    """Outcome of verifying one install directory"""
+
+    install_dir: str
+    mode: str  # "full" (SHA1 of every file) or "fast" (size and mtime)
+    started_at: float
+    duration: float = 0.0
+    checked_files: int = 0
+    checked_bytes: int = 0
+    # Relative paths per depot id
+    missing: Dict[str, List[str]] = field(default_factory=dict)
+    corrupt: Dict[str, List[str]] = field(default_factory=dict)
+    # Fast mode only: right size, but written after the depot was installed
+    modified: Dict[str, List[str]] = field(default_factory=dict)
+    unverifiable_depots: List[str] = field(default_factory=list)
+    error: str = ""
+    cancelled: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not (self.error or self.cancelled or self.missing or self.corrupt or self.modified)
+
+    def repair_files(self) -> Dict[str, List[str]]:
+        """Files per depot a repair download has to fetch again"""
+        files = {}
+        for depot_id in set(self.missing) | set(self.corrupt):
+            files[depot_id] = sorted(self.missing.get(depot_id, []) + self.corrupt.get(depot_id, []))
+        return files
+
+    def count(self, bucket: Dict[str, List[str]]) -> int:
+        return sum(len(files) for files in bucket.values())
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    def save(self, reports_dir: str = VERIFY_REPORTS_DIR) -> str:
+        """Write the report as JSON and return its path"""
+        os.makedirs(reports_dir, exist_ok=True)
+        name = os.path.basename(os.path.normpath(self.install_dir)) or "install"
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at))
+        path = os.path.join(reports_dir, f"{name}-{stamp}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+
+def _batches(files: List[Tuple[str, str, str, int]]):
+    """Group (depot_id, filename, path, size) entries for the workers"""
+    batch = []
+    batch_bytes = 0
+    for entry in files:
+        batch.append(entry)
+        batch_bytes += entry[3]
+        if batch_bytes >= BATCH_BYTES or len(batch) >= BATCH_FILES:
+            yield batch
+            batch = []
+            batch_bytes = 0
+    if batch:
+        yield batch
+
+
+def verify_install(
+    install_dir: str,
+    fast: bool = False,
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> VerifyReport:
+    """
+    Verify the files of an install against the manifests its depots were
+    downloaded with.
+
+    Every file is stat'ed first: missing files and files of the wrong size
+    are reported without reading them. In full mode the remaining files
+    are hashed across a pool of worker processes and compared with the
+    manifest SHA1s. In fast mode nothing is read; files written after
+    their depot was installed are reported as modified instead, since a
+    game may legitimately rewrite files in its own directory.
+
+    Args:
+        install_dir: The game directory (steamapps/common/<installdir>)
+        fast: Check size and modification time only
+        max_workers: Hashing processes; defaults to the CPU count, capped
+        progress_callback: Called with (done_bytes, total_bytes)
+        should_stop: Polled between batches; True cancels the verification
+
+    Returns:
+        VerifyReport: also when verification could not run, with error set
+    """
+    report = VerifyReport(
+        install_dir=install_dir, mode="fast" if fast else "full", started_at=time.time()
+    )
+    depots = installed_manifests.installed_depots(install_dir)
+    if not depots:
+        report.error = (
+            "No manifests are recorded for this install; download the game once "
+            "with Bifrost to be able to verify it"
+        )
+        return report
+
+    to_hash = []
+    expected = {}
+    for depot_id, (manifest_id, manifest_path, installed_at) in depots.items():
+        try:
+            files = read_manifest_files(manifest_path)
+        except Exception as e:
+            logger.warning(f"Cannot verify depot {depot_id}: {e}")
+            report.unverifiable_depots.append(depot_id)
+            continue
+
+        for filename, manifest_file in files.items():
+            report.checked_files += 1
+            path = os.path.join(install_dir, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                report.missing.setdefault(depot_id, []).append(filename)
+                continue
+            if stat.st_size != manifest_file.size:
+                report.corrupt.setdefault(depot_id, []).append(filename)
+            elif fast:
+                if installed_at and stat.st_mtime > installed_at + MTIME_TOLERANCE_SECONDS:
+                    report.modified.setdefault(depot_id, []).append(filename)
+                report.checked_bytes += stat.st_size
+            else:
+                to_hash.append((depot_id, filename, path, manifest_file.size))
+                expected[path] = manifest_file.sha.hex()
+
+    if to_hash:
+        _hash_and_compare(report, to_hash, expected, max_workers, progress_callback, should_stop)
+
+    report.duration = time.time() - report.started_at
+    logger.info(
+        f"Verified {install_dir} ({report.mode}): {report.checked_files} files, "
+        f"{report.count(report.missing)} missing, {report.count(report.corrupt)} corrupt, "
+        f"{report.count(report.modified)} modified in {report.duration:.1f}s"
+    )
+    return report
+
+
+def _hash_and_compare(report, to_hash, expected, max_workers, progress_callback, should_stop):
+    """Hash files across worker processes and record mismatches in report"""
+    # Largest files first, so one big archive does not finish alone at the end
+    to_hash.sort(key=lambda entry: entry[3], reverse=True)
+    total_bytes = sum(entry[3] for entry in to_hash)
+    done_bytes = 0
+    workers = max(1, min(max_workers or os.cpu_count() or 1, MAX_VERIFY_WORKERS))
+
+    # Workers are spawned, not forked: this process runs Qt threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {
+            executor.submit(hash_files, [entry[2] for entry in batch]): batch
+            for batch in _batches(to_hash)
+        }
+        for future in as_completed(futures):
+            if should_stop and should_stop():
+                report.cancelled = True
+                for pending in futures:
+                    pending.cancel()
+                break
+
+            batch = futures[future]
+            try:
+                digests = future.result()
+            except Exception as e:
+                # The worker process itself died
+                logger.error(f"Hashing worker failed: {e}")
+                digests = [None] * len(batch)
+
+            for (depot_id, filename, path, size), digest in zip(batch, digests):
+                # Unreadable files count as corrupt
+                if digest != expected[path]:
+                    report.corrupt.setdefault(depot_id, []).append(filename)
+                report.checked_bytes += size
+                done_bytes += size
+            if progress_callback:
+                progress_callback(done_bytes, total_bytes)
@@ -0,0 +1,341 @@
+"""
+Installed Manifests - Manifests of installed depots and incremental update plans
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.logger import get_internationalized_logger
+
+logger = get_internationalized_logger()
+
+INSTALLED_MANIFESTS_DIR = "data/installed_manifests"
+
+# EDepotFileFlag.Directory
+DIRECTORY_FLAG = 64
+
+
+@dataclass
+class ManifestFile:
+    """One file listed in a depot manifest"""
+
+    size: int
+    sha: bytes
+
+
+@dataclass
+class UpdatePlan:
+    """What has to change on disk to go from one manifest to another"""
+
+    depot_id: str
+    old_manifest_id: str
+    new_manifest_id: str
+    changed: List[str] = field(default_factory=list)  # changed or added files
+    removed: List[str] = field(default_factory=list)  # files gone from the depot
+    download_size: int = 0  # bytes of the changed files
+    unchanged_size: int = 0  # bytes left alone
+
+    @property
+    def up_to_date(self) -> bool:
+        return not self.changed
+
+
+def read_manifest_files(path: str, depot_key: Optional[str] = None) -> Dict[str, ManifestFile]:
+    """
+    Files of a binary depot manifest by relative path, with forward slashes.
+
+    Raises:
+        ImportError: If the steam package is not installed
+        Exception: If the file is not a valid depot manifest
+    """
+    from steam.core.manifest import DepotManifest
+
+    with open(path, "rb") as f:
+        manifest = DepotManifest(f.read())
+    if manifest.filenames_encrypted:
+        if not depot_key:
+            raise ValueError("manifest filenames are encrypted and no depot key is known")
+        manifest.decrypt_filenames(bytes.fromhex(depot_key))
+
+    files = {}
+    for mapping in manifest.payload.mappings:
+        if mapping.flags & DIRECTORY_FLAG:
+            continue
+        # Manifests use Windows separators
+        filename = mapping.filename.rstrip("\x00").replace("\\", "/")
+        files[filename] = ManifestFile(size=mapping.size, sha=mapping.sha_content)
+    return files
+
+
+def install_dir_for(game_data: Dict[str, Any], dest_path: str) -> str:
+    """Directory the game is installed into in the library at dest_path"""
+    safe_game_name_fallback = (
+        re.sub(r"[^\w\s-]", "", game_data.get("game_name", ""))
+        .strip()
+        .replace(" ", "_")
+    )
+    install_folder_name = game_data.get("installdir", safe_game_name_fallback)
+    if not install_folder_name:
+        install_folder_name = f"App_{game_data['appid']}"
+
+    # Sanitize directory name to remove filesystem-invalid characters
+    install_folder_name = re.sub(r'[<>:"/\\|?*]', "_", str(install_folder_name))
+    return os.path.join(dest_path, "steamapps", "common", install_folder_name)
+
+
+def _on_disk_size(install_dir: str, filename: str) -> Optional[int]:
+    try:
+        return os.stat(os.path.join(install_dir, filename)).st_size
+    except OSError:
+        return None
+
+
+def plan_update(
+    depot_id: str,
+    old_manifest_id: str,
+    old_manifest_path: str,
+    new_manifest_id: str,
+    new_manifest_path: str,
+    install_dir: str,
+    depot_key: Optional[str] = None,
+    repair: Iterable[str] = (),
+) -> UpdatePlan:
+    """
+    Diff the installed manifest of a depot against the new one.
+
+    A file goes on the download list when it is new, when its SHA or size
+    changed, or when it is missing or has the wrong size on disk (a stat,
+    no file is read), or when it is in ``repair`` (files a verification
+    found corrupt). Files the new manifest no longer lists are returned
+    as removed.
+
+    Raises:
+        ImportError: If the steam package is not installed
+        Exception: If either manifest cannot be decoded
+    """
+    old_files = read_manifest_files(old_manifest_path, depot_key)
+    new_files = read_manifest_files(new_manifest_path, depot_key)
+
+    plan = UpdatePlan(
+        depot_id=str(depot_id),
+        old_manifest_id=str(old_manifest_id),
+        new_manifest_id=str(new_manifest_id),
+    )
+    repair = set(repair)
+    for filename, new_file in new_files.items():
+        old_file = old_files.get(filename)
+        if (
+            filename in repair
+            or old_file is None
+            or old_file.sha != new_file.sha
+            or old_file.size != new_file.size
+            or _on_disk_size(install_dir, filename) != new_file.size
+        ):
+            plan.changed.append(filename)
+            plan.download_size += new_file.size
+        else:
+            plan.unchanged_size += new_file.size
+    plan.removed = [filename for filename in old_files if filename not in new_files]
+    return plan
+
+
+def write_filelist(path: str, filenames: List[str]):
+    """Write a DepotDownloaderMod -filelist, one relative path per line"""
+    with open(path, "w", encoding="utf-8") as f:
+        for filename in filenames:
+            f.write(f"{filename}\n")
+
+
+def delete_removed_files(install_dir: str, filenames: List[str]) -> int:
+    """
+    Delete files a depot update dropped, and the directories they leave
+    empty. Paths outside install_dir are ignored.
+
+    Returns:
+        int: Number of files deleted
+    """
+    root = os.path.normpath(os.path.abspath(install_dir))
+    deleted = 0
+    for filename in filenames:
+        path = os.path.normpath(os.path.join(root, filename))
+        if not path.startswith(root + os.sep):
+            logger.warning(f"Not deleting {filename}: outside of {install_dir}")
+            continue
+        try:
+            os.remove(path)
+            deleted += 1
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.warning(f"Could not delete removed file {filename}: {e}")
+            continue
+
+        parent = os.path.dirname(path)
+        while parent != root:
+            try:
+                os.rmdir(parent)
+            except OSError:
+                break
+            parent = os.path.dirname(parent)
+    return deleted
+
+
+class InstalledManifestStore:
+    """
+    Keeps the manifest every depot of an install was last downloaded with.
+
+    Each install directory gets its own entry, named after a hash of its
+    absolute path, holding the manifests (with decrypted filenames) and an
+    index of the manifest id and install time per depot, plus the files a
+    verification flagged for repair. The next download of the same depots
+    into the same directory can then be planned as a diff between the two
+    manifests.
+    """
+
+    INDEX_FILENAME = "installed.json"
+
+    def __init__(self, root: str = INSTALLED_MANIFESTS_DIR):
+        self.root = root
+
+    def _entry_dir(self, install_dir: str) -> str:
+        key = hashlib.sha1(os.path.abspath(install_dir).encode("utf-8")).hexdigest()
+        return os.path.join(self.root, key)
+
+    def _read_index(self, entry_dir: str) -> Dict:
+        try:
+            with open(os.path.join(entry_dir, self.INDEX_FILENAME), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read installed manifests index in {entry_dir}: {e}")
+            return {}
+
+    def installed_manifest(self, install_dir: str, depot_id: str) -> Optional[tuple]:
+        """
+        Manifest the depot was installed with.
+
+        Returns:
+            tuple: (manifest_id, manifest_path) or None if unknown
+        """
+        entry_dir = self._entry_dir(install_dir)
+        manifest_id = self._read_index(entry_dir).get("depots", {}).get(str(depot_id))
+        if not manifest_id:
+            return None
+        path = os.path.join(entry_dir, f"{depot_id}_{manifest_id}.manifest")
+        if not os.path.exists(path):
+            return None
+        return manifest_id, path
+
+    def installed_depots(self, install_dir: str) -> Dict[str, tuple]:
+        """
+        Every depot with a known manifest in install_dir.
+
+        Returns:
+            dict: (manifest_id, manifest_path, installed_at) per depot id;
+                  installed_at is None for depots recorded before it was kept
+        """
+        entry_dir = self._entry_dir(install_dir)
+        index = self._read_index(entry_dir)
+        installed_at = index.get("installed_at", {})
+        depots = {}
+        for depot_id, manifest_id in index.get("depots", {}).items():
+            path = os.path.join(entry_dir, f"{depot_id}_{manifest_id}.manifest")
+            if os.path.exists(path):
+                depots[depot_id] = (manifest_id, path, installed_at.get(depot_id))
+        return depots
+
+    def _write_index(self, entry_dir: str, index: Dict):
+        temp_path = os.path.join(entry_dir, f"{self.INDEX_FILENAME}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(temp_path, os.path.join(entry_dir, self.INDEX_FILENAME))
+
+    @staticmethod
+    def _store_manifest(manifest_path: str, target: str, depot_key: Optional[str]):
+        """Copy a manifest, decrypting its filenames when the key is known"""
+        if depot_key:
+            try:
+                from steam.core.manifest import DepotManifest
+
+                with open(manifest_path, "rb") as f:
+                    manifest = DepotManifest(f.read())
+                if manifest.filenames_encrypted:
+                    manifest.decrypt_filenames(bytes.fromhex(depot_key))
+                    with open(target, "wb") as f:
+                        f.write(manifest.serialize())
+                    return
+            except Exception as e:
+                logger.debug(f"Keeping {os.path.basename(manifest_path)} as is: {e}")
+        shutil.copyfile(manifest_path, target)
+
+    def record(
+        self,
+        install_dir: str,
+        depot_id: str,
+        manifest_id: str,
+        manifest_path: str,
+        depot_key: Optional[str] = None,
+    ):
+        """
+        Remember manifest_path as the installed manifest of the depot. The
+        depot's files are now as the manifest describes, so files it had
+        flagged for repair are cleared.
+        """
+        entry_dir = self._entry_dir(install_dir)
+        depot_id = str(depot_id)
+        manifest_id = str(manifest_id)
+        try:
+            os.makedirs(entry_dir, exist_ok=True)
+            target = os.path.join(entry_dir, f"{depot_id}_{manifest_id}.manifest")
+            if not os.path.exists(target):
+                self._store_manifest(manifest_path, target, depot_key)
+
+            index = self._read_index(entry_dir)
+            index["install_dir"] = os.path.abspath(install_dir)
+            depots = index.setdefault("depots", {})
+            previous = depots.get(depot_id)
+            depots[depot_id] = manifest_id
+            index.setdefault("installed_at", {})[depot_id] = time.time()
+            index.setdefault("repair", {}).pop(depot_id, None)
+            self._write_index(entry_dir, index)
+
+            if previous and previous != manifest_id:
+                os.remove(os.path.join(entry_dir, f"{depot_id}_{previous}.manifest"))
+        except OSError as e:
+            logger.warning(f"Could not record installed manifest of depot {depot_id}: {e}")
+
+    def repair_files(self, install_dir: str, depot_id: str) -> List[str]:
+        """Files of the depot a verification found missing or corrupt"""
+        index = self._read_index(self._entry_dir(install_dir))
+        return index.get("repair", {}).get(str(depot_id), [])
+
+    def mark_for_repair(self, install_dir: str, files: Dict[str, List[str]]):
+        """Flag files per depot to be downloaded again on the next update"""
+        entry_dir = self._entry_dir(install_dir)
+        index = self._read_index(entry_dir)
+        if not index:
+            return
+        repair = index.setdefault("repair", {})
+        for depot_id, filenames in files.items():
+            if filenames:
+                repair[str(depot_id)] = sorted(filenames)
+            else:
+                repair.pop(str(depot_id), None)
+        try:
+            self._write_index(entry_dir, index)
+        except OSError as e:
+            logger.warning(f"Could not flag files for repair in {install_dir}: {e}")
+
+    def forget(self, install_dir: str):
+        """Drop everything known about an install (e.g. after uninstalling)"""
+        shutil.rmtree(self._entry_dir(install_dir), ignore_errors=True)
+
+
+installed_manifests = InstalledManifestStore()
@@ -13,7 +13,9 @@ class MergeFilesTask(QObject):
     progress = pyqtSignal(str)
     merge_complete = pyqtSignal(bool)
 
-    def run(self, game_data, dest_path, slssteam_mode):
+    def run(self, game_data, dest_path, slssteam_mode, workspace_dir=None):
+        # Depots and manifests are read from the session workspace if given
+        self.base_dir = workspace_dir or os.getcwd()
         self.progress.emit(f"Starting merge task. SLSsteam Mode: {slssteam_mode}")
 
         safe_game_name_fallback = (
@@ -41,7 +43,7 @@ class MergeFilesTask(QObject):
         self.merge_complete.emit(slssteam_mode)
 
     def _copy_depot_files(self, merge_root):
-        depots_dir = os.path.join(os.getcwd(), "depots")
+        depots_dir = os.path.join(self.base_dir, "depots")
         if not os.path.isdir(depots_dir):
             self.progress.emit("No 'depots' directory found to merge.")
             return
@@ -98,7 +100,7 @@ class MergeFilesTask(QObject):
     def _cleanup_source_dirs(self):
         self.progress.emit("Cleaning up temporary download directories...")
         for dirname in ["depots", "manifest"]:
-            dir_path = os.path.join(os.getcwd(), dirname)
+            dir_path = os.path.join(self.base_dir, dirname)
             if os.path.isdir(dir_path):
                 try:
                     shutil.rmtree(dir_path)
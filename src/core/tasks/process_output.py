@@ -0,0 +1,226 @@
+"""
+Process Output - Event-driven reader for the stdout of many child processes
+"""
+
+import codecs
+import io
+import os
+import queue
+import selectors
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logger import get_internationalized_logger
+
+logger = get_internationalized_logger()
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class _OutputStream:
+    """Decoding state of one watched stream"""
+
+    key: Any
+    stream: Any
+    decoder: io.IncrementalNewlineDecoder
+    pending: str = ""
+    reader_thread: Optional[threading.Thread] = field(default=None, repr=False)
+
+    def feed(self, data: bytes, final: bool = False) -> List[str]:
+        """Decode a chunk and return the complete lines it finished"""
+        text = self.pending + self.decoder.decode(data, final=final)
+        lines = text.split("\n")
+        self.pending = "" if final else lines.pop()
+        if final and lines and lines[-1] == "":
+            lines.pop()
+        return lines
+
+
+class ProcessOutputMultiplexer:
+    """
+    Watches the stdout of many child processes from a single thread.
+
+    Streams are registered with a key (e.g. the depot id). ``wait()`` blocks
+    until one of them produces output, reaches EOF or ``wake()`` is called
+    from another thread. Bytes are decoded incrementally (UTF-8, universal
+    newlines) and complete lines are handed to ``line_handler(key, lines)``
+    in one batch per read. A stream reaching EOF means its process closed
+    stdout, which is how process exit is noticed without polling.
+
+    On POSIX a selector watches the pipes directly. Windows cannot select on
+    pipes, so there one lightweight reader thread per stream feeds a queue.
+    """
+
+    def __init__(self, line_handler: Callable[[Any, List[str]], None]):
+        self.line_handler = line_handler
+        self._streams: Dict[Any, _OutputStream] = {}
+        self._use_selector = sys.platform != "win32"
+        self._closed = False
+        self._lock = threading.Lock()
+
+        if self._use_selector:
+            self._selector = selectors.DefaultSelector()
+            self._wake_read, self._wake_write = os.pipe()
+            os.set_blocking(self._wake_read, False)
+            os.set_blocking(self._wake_write, False)
+            self._selector.register(self._wake_read, selectors.EVENT_READ, None)
+        else:
+            self._events: "queue.Queue" = queue.Queue()
+
+    def __len__(self):
+        return len(self._streams)
+
+    def add(self, key: Any, stream):
+        """Start watching a binary stream (e.g. ``process.stdout``)"""
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(errors="replace"), translate=True
+        )
+        output = _OutputStream(key=key, stream=stream, decoder=decoder)
+        self._streams[key] = output
+
+        if self._use_selector:
+            fd = stream.fileno()
+            os.set_blocking(fd, False)
+            self._selector.register(fd, selectors.EVENT_READ, output)
+        else:
+            output.reader_thread = threading.Thread(
+                target=self._read_stream_blocking,
+                args=(output,),
+                name=f"output-{key}",
+                daemon=True,
+            )
+            output.reader_thread.start()
+
+    def remove(self, key: Any):
+        """Stop watching a stream and close it"""
+        output = self._streams.pop(key, None)
+        if not output:
+            return
+        if self._use_selector:
+            try:
+                self._selector.unregister(output.stream.fileno())
+            except (KeyError, ValueError, OSError):
+                pass
+        try:
+            output.stream.close()
+        except OSError:
+            pass
+
+    def wake(self):
+        """Interrupt a blocking ``wait()`` from another thread"""
+        with self._lock:
+            if self._closed:
+                return
+            if self._use_selector:
+                try:
+                    os.write(self._wake_write, b"\0")
+                except (BlockingIOError, OSError):
+                    pass  # A wake-up is already pending
+            else:
+                self._events.put(None)
+
+    def wait(self, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Wait for output and dispatch it.
+
+        Returns:
+            list: Keys of the streams that reached EOF during this call. They
+            are no longer watched.
+        """
+        if self._use_selector:
+            return self._wait_selector(timeout)
+        return self._wait_queue(timeout)
+
+    def _wait_selector(self, timeout):
+        finished = []
+        for selector_key, _ in self._selector.select(timeout):
+            output = selector_key.data
+            if output is None:
+                self._drain_wake_pipe()
+                continue
+
+            try:
+                data = os.read(selector_key.fd, READ_CHUNK_SIZE)
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                logger.debug(f"Error reading output of {output.key}: {e}")
+                data = b""
+
+            if data:
+                self._dispatch(output, output.feed(data))
+            else:
+                self._dispatch(output, output.feed(b"", final=True))
+                self.remove(output.key)
+                finished.append(output.key)
+        return finished
+
+    def _wait_queue(self, timeout):
+        finished = []
+        try:
+            event = self._events.get(timeout=timeout)
+        except queue.Empty:
+            return finished
+
+        while event is not None or not self._events.empty():
+            if event is not None:
+                key, data = event
+                output = self._streams.get(key)
+                if output:
+                    if data:
+                        self._dispatch(output, output.feed(data))
+                    else:
+                        self._dispatch(output, output.feed(b"", final=True))
+                        self.remove(key)
+                        finished.append(key)
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+        return finished
+
+    def _read_stream_blocking(self, output):
+        """Reader thread body used where pipes cannot be selected"""
+        read = getattr(output.stream, "read1", output.stream.read)
+        try:
+            while True:
+                data = read(READ_CHUNK_SIZE)
+                self._events.put((output.key, data))
+                if not data:
+                    break
+        except (OSError, ValueError):
+            self._events.put((output.key, b""))
+
+    def _drain_wake_pipe(self):
+        try:
+            while os.read(self._wake_read, 4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _dispatch(self, output, lines):
+        if not lines:
+            return
+        try:
+            self.line_handler(output.key, lines)
+        except Exception as e:
+            logger.error(f"Error handling output of {output.key}: {e}", exc_info=True)
+
+    def close(self):
+        """Stop watching all streams and release the selector"""
+        for key in list(self._streams):
+            self.remove(key)
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._use_selector:
+                self._selector.close()
+                for fd in (self._wake_read, self._wake_write):
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
@@ -1,93 +1,90 @@
+import io
 import zipfile
 import re
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from ui.assets import DEPOT_BLACKLIST
 from core.steam_api import get_depot_info_from_api
-from core.ini_parser import parse_depots_ini
+from core.depot_catalog import depot_catalog
+from core.lua_parser import LuaParseError, LuaParser
+from core.manifest_info import summarize_manifests
+from core.tasks.ingest_cache import IngestCache
+from core.tasks.workspace import SessionWorkspace
 from utils.logger import get_internationalized_logger
 from utils.i18n import tr
 
 logger = get_internationalized_logger("ProcessZip")
 
-KNOWN_DEPOT_DESCRIPTIONS = parse_depots_ini()
+
+# Manifests are copied out of the zip in chunks of this size
+MANIFEST_COPY_BUFFER_SIZE = 256 * 1024
+
+# Processed zips, so dropping the same package again skips the whole ingest
+ingest_cache = IngestCache()
 
 class ProcessZipTask:
-    def _parse_lua(self, content, game_data):
+    def _parse_lua(self, parser, game_data):
         logger.debug("Starting LUA content parsing...")
+        for diagnostic in parser.diagnostics:
+            logger.warning(f"LUA {diagnostic}")
         try:
-            all_app_matches = list(re.finditer(r'addappid\((.*?)\)(.*)', content, re.IGNORECASE))
-            if not all_app_matches:
-                raise ValueError("LUA file is invalid; no 'addappid' entries found.")
-
-            first_app_match = all_app_matches.pop(0)
-            first_app_args = first_app_match.group(1).strip()
-            game_data['appid'] = first_app_args.split(',')[0].strip()
-            
-            comment_part = first_app_match.group(2)
-            game_name_match = re.search(r'--\s*(.*)', comment_part)
-            game_data['game_name'] = game_name_match.group(1).strip() if game_name_match else f"App_{game_data['appid']}"
-
-            game_data['depots'] = {}
-            game_data['dlcs'] = {}
-            for match in all_app_matches:
-                args_str = match.group(1).strip()
-                args = [arg.strip() for arg in args_str.split(',')]
-                app_id = args[0]
-                
-                comment_part = match.group(2)
-                desc_match = re.search(r'--\s*(.*)', comment_part)
-                desc = desc_match.group(1).strip() if desc_match else f"Depot {app_id}"
-
-                if len(args) > 2 and args[2].strip('"'):
-                    depot_key = args[2].strip('"') 
-                    game_data['depots'][app_id] = {'key': depot_key, 'desc': desc}
-                else:
-                    game_data['dlcs'][app_id] = desc
-        except Exception as e:
-            logger.error(f"Critical error during LUA parsing: {e}", exc_info=True)
+            parser.apply(game_data)
+        except LuaParseError as e:
+            logger.error(f"Critical error during LUA parsing: {e}")
             raise
+        logger.debug(
+            f"LUA parsing done: {parser.line_number} lines, {len(parser.depots)} depots, "
+            f"{len(parser.dlcs)} DLCs, {len(parser.diagnostics)} warnings"
+        )
 
-    def run(self, zip_path):
+    def run(self, zip_path, prune_cache=True):
         logger.info(tr("ProcessZip", "Starting zip processing task for") + f": {zip_path}")
         game_data = {}
+        workspace = None
+        api_executor = ThreadPoolExecutor(max_workers=1)
         try:
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
                 lua_files = [f for f in zip_ref.namelist() if f.endswith('.lua')]
                 if not lua_files:
                     raise FileNotFoundError("No .lua file found in the zip archive.")
-                
-                # Processar manifest files com streaming para economizar memória
-                manifest_files = {}
-                for file_info in zip_ref.infolist():
-                    if file_info.filename.endswith('.manifest'):
-                        with zip_ref.open(file_info) as manifest_file:
-                            manifest_content = manifest_file.read()
-                            manifest_files[os.path.basename(file_info.filename)] = manifest_content
-                
-                for depot_id_manifest in manifest_files:
-                    parts = depot_id_manifest.replace('.manifest', '').split('_')
-                    if len(parts) == 2:
-                        game_data.setdefault('manifests', {})[parts[0]] = parts[1]
 
-                # Ler arquivo LUA com streaming para evitar carregar arquivos grandes em memória
-                with zip_ref.open(lua_files[0]) as lua_file:
-                    # Ler em chunks para arquivos muito grandes
-                    lua_content = ""
-                    while True:
-                        chunk = lua_file.read(8192)  # 8KB chunks
-                        if not chunk:
-                            break
-                        lua_content += chunk.decode('utf-8')
-                
-                self._parse_lua(lua_content, game_data)
+                # Each zip gets its own workspace so a running download is never touched
+                workspace = SessionWorkspace.create("ingest")
+
+                cache_key = ingest_cache.key_for(zip_path, zip_ref)
+                cached_game_data = ingest_cache.load(cache_key, workspace.manifest_dir)
+                if cached_game_data is not None:
+                    cached_game_data['ingest_workspace'] = workspace.path
+                    logger.info(tr("ProcessZip", "Zip already processed, using cached game data"))
+                    return cached_game_data
+
+                # The Steam API round trip is the slowest step of the ingest, so
+                # it starts as soon as the appid is known and runs while the rest
+                # of the LUA is parsed and the manifests are extracted
+                api_future = None
+                api_appid = None
+
+                def start_api_fetch(appid):
+                    nonlocal api_future, api_appid
+                    logger.debug(f"Prefetching Steam API data for AppID {appid}")
+                    api_appid = appid
+                    api_future = api_executor.submit(get_depot_info_from_api, appid)
+
+                lua_parser = self._read_lua(zip_ref, lua_files[0], start_api_fetch)
+                self._parse_lua(lua_parser, game_data)
                 
+                known_descriptions = depot_catalog.describe(
+                    list(game_data.get('dlcs', {})) + list(game_data.get('depots', {}))
+                )
                 if game_data.get('dlcs'):
                     enriched_dlcs = {}
                     for dlc_id, lua_desc in game_data['dlcs'].items():
-                        enriched_dlcs[dlc_id] = KNOWN_DEPOT_DESCRIPTIONS.get(dlc_id, lua_desc)
+                        enriched_dlcs[dlc_id] = known_descriptions.get(dlc_id, lua_desc)
                     game_data['dlcs'] = enriched_dlcs
 
                 unfiltered_depots = game_data.get('depots', {})
+                filtered_depots = {}
                 if not unfiltered_depots:
                     logger.warning("LUA parsing did not identify any depots with keys.")
                 else:
@@ -101,80 +98,162 @@ class ProcessZipTask:
                     }
                     if len(unfiltered_depots) > len(filtered_depots):
                         logger.debug(f"Removed {len(unfiltered_depots) - len(filtered_depots)} depots based on blacklist.")
+                    game_data['blacklisted_depots'] = sorted(set(unfiltered_depots) - set(filtered_depots))
                     
                     game_data['depots'] = filtered_depots
                     
                     if not filtered_depots:
                         logger.warning("All depots were filtered out. No depots to download.")
+
+                for name in self._extract_manifests(zip_ref, workspace.manifest_dir):
+                    parts = name.replace('.manifest', '').split('_')
+                    if len(parts) == 2:
+                        game_data.setdefault('manifests', {})[parts[0]] = parts[1]
+                game_data['ingest_workspace'] = workspace.path
+
+                # Exact sizes and file counts straight from the manifests: known
+                # offline and before the Steam API answers
+                manifest_summaries = {}
+                # Without Steam API data the result is incomplete and not cached
+                cacheable = True
+                if filtered_depots:
+                    manifest_summaries = summarize_manifests(
+                        workspace.manifest_dir,
+                        {
+                            depot_id: manifest_id
+                            for depot_id, manifest_id in game_data.get('manifests', {}).items()
+                            if depot_id in filtered_depots
+                        },
+                    )
+                    game_data['manifest_info'] = {
+                        depot_id: summary.to_dict() for depot_id, summary in manifest_summaries.items()
+                    }
+                    logger.debug(f"Decoded {len(manifest_summaries)}/{len(filtered_depots)} depot manifests")
+
+                if filtered_depots:
+                    if game_data.get('appid') and api_appid != game_data['appid']:
+                        # The prefetch guessed a different appid than the parser found
+                        if api_future:
+                            api_future.cancel()
+                        start_api_fetch(game_data['appid'])
+                    try:
+                        api_data = api_future.result() if api_future else {}
+                    except Exception as e:
+                        # Offline: the manifests still provide the sizes
+                        logger.warning(f"Steam API lookup failed for AppID {game_data['appid']}: {e}")
+                        api_data = {}
+                    
+                    # --- MODIFICATION START ---
+                    if api_data.get('installdir'):
+                        game_data['installdir'] = api_data['installdir']
+                        logger.debug(f"Found official install directory: {game_data['installdir']}")
+                    
+                    # Update game name from Steam API if available
+                    if api_data.get('game_name'):
+                        game_data['game_name'] = api_data['game_name']
+                        logger.debug(f"Found game name from Steam API: {game_data['game_name']}")
+                    
+                    api_details = api_data.get('depots', {})
+                    cacheable = bool(api_details)
+                    
+                    # Transfer depot sizes to game_data
+                    depot_sizes = dict(api_data.get('depot_sizes', {}))
+                    for depot_id, details in api_details.items():
+                        if details.get('size') and depot_id not in depot_sizes:
+                            depot_sizes[depot_id] = details['size']
+                    # Manifest sizes are exact, the API ones describe the public branch
+                    depot_sizes.update({depot_id: summary.size for depot_id, summary in manifest_summaries.items()})
+                    if depot_sizes:
+                        game_data['depot_sizes'] = depot_sizes
+                        logger.debug(f"Transferred {len(game_data['depot_sizes'])} depot size entries to game_data")
                     else:
-                        api_data = get_depot_info_from_api(game_data['appid']) if game_data.get('appid') else {}
-                        
-                        # --- MODIFICATION START ---
-                        if api_data.get('installdir'):
-                            game_data['installdir'] = api_data['installdir']
-                            logger.debug(f"Found official install directory: {game_data['installdir']}")
-                        
-                        # Update game name from Steam API if available
-                        if api_data.get('game_name'):
-                            game_data['game_name'] = api_data['game_name']
-                            logger.debug(f"Found game name from Steam API: {game_data['game_name']}")
-                        
-                        api_details = api_data.get('depots', {})
-                        
-                        # Transfer depot sizes to game_data
-                        depot_sizes = api_data.get('depot_sizes', {})
-                        if depot_sizes:
-                            game_data['depot_sizes'] = depot_sizes
-                            logger.debug(f"Transferred {len(game_data['depot_sizes'])} depot size entries to game_data")
-                        else:
-                            logger.warning(tr("SteamApi", "Empty depot_sizes in api_data"))
-                            game_data['depot_sizes'] = {}
+                        logger.warning(tr("SteamApi", "Empty depot_sizes in api_data"))
+                        game_data['depot_sizes'] = {}
+                    
+                    # Transfer total game size to game_data
+                    total_game_size = api_data.get('total_game_size', 0)
+                    if manifest_summaries and (
+                        len(manifest_summaries) == len(filtered_depots) or not total_game_size
+                    ):
+                        total_game_size = sum(summary.size for summary in manifest_summaries.values())
+                    if total_game_size > 0:
+                        game_data['total_game_size'] = total_game_size
+                        logger.debug(f"Transferred total game size: {total_game_size} bytes ({total_game_size/1024/1024/1024:.2f} GB)")
+                    else:
+                        logger.warning("Empty total_game_size in api_data")
+                        game_data['total_game_size'] = 0
+                    # --- MODIFICATION END ---
+
+                    if not api_details:
+                        logger.warning("Could not retrieve supplementary details from Steam API.")
+                    
+                    enriched_depots = {}
+                    for depot_id, lua_data in filtered_depots.items():
+                        final_depot_data = {'key': lua_data['key']}
+                        details = api_details.get(str(depot_id))
+                        base_description = known_descriptions.get(depot_id, lua_data['desc'])
                         
-                        # Transfer total game size to game_data
-                        total_game_size = api_data.get('total_game_size', 0)
-                        if total_game_size > 0:
-                            game_data['total_game_size'] = total_game_size
-                            logger.debug(f"Transferred total game size: {total_game_size} bytes ({total_game_size/1024/1024/1024:.2f} GB)")
+                        if details:
+                            tags = []
+                            if details.get('oslist'): tags.append(f"[{details['oslist'].upper()}]")
+                            if details.get('steamdeck'): tags.append("[DECK]")
+                            if details.get('language'): base_description += f" ({details['language'].capitalize()})"
+                            final_description = ' '.join(tags) + ' ' + base_description if tags else base_description
                         else:
-                            logger.warning("Empty total_game_size in api_data")
-                            game_data['total_game_size'] = 0
-                        # --- MODIFICATION END ---
+                            final_description = base_description
+
+                        lower_desc = final_description.lower()
+                        if "soundtrack" in lower_desc or re.search(r'\bost\b', lower_desc):
+                            logger.debug(f"Filtering out soundtrack depot {depot_id} ('{final_description}').")
+                            continue
 
-                        if not api_details:
-                            logger.warning("Could not retrieve supplementary details from Steam API.")
+                        final_depot_data['desc'] = final_description
+                        enriched_depots[depot_id] = final_depot_data
                         
-                        enriched_depots = {}
-                        for depot_id, lua_data in filtered_depots.items():
-                            final_depot_data = {'key': lua_data['key']}
-                            details = api_details.get(str(depot_id))
-                            base_description = KNOWN_DEPOT_DESCRIPTIONS.get(depot_id, lua_data['desc'])
-                            
-                            if details:
-                                tags = []
-                                if details.get('oslist'): tags.append(f"[{details['oslist'].upper()}]")
-                                if details.get('steamdeck'): tags.append("[DECK]")
-                                if details.get('language'): base_description += f" ({details['language'].capitalize()})"
-                                final_description = ' '.join(tags) + ' ' + base_description if tags else base_description
-                            else:
-                                final_description = base_description
-
-                            lower_desc = final_description.lower()
-                            if "soundtrack" in lower_desc or re.search(r'\bost\b', lower_desc):
-                                logger.debug(f"Filtering out soundtrack depot {depot_id} ('{final_description}').")
-                                continue
-
-                            final_depot_data['desc'] = final_description
-                            enriched_depots[depot_id] = final_depot_data
-                            
-                        game_data['depots'] = enriched_depots
-                
-                manifest_dir = os.path.join(os.getcwd(), 'manifest')
-                os.makedirs(manifest_dir, exist_ok=True)
-                for name, content in manifest_files.items():
-                    with open(os.path.join(manifest_dir, name), 'wb') as f: f.write(content)
+                    game_data['depots'] = enriched_depots
+
+                if cacheable:
+                    ingest_cache.store(
+                        cache_key, game_data, workspace.manifest_dir, prune=prune_cache
+                    )
 
             logger.info(tr("ProcessZip", "Zip processing task completed successfully"))
             return game_data
         except Exception as e:
             logger.error(f"Zip processing failed: {e}", exc_info=True)
-            raise
\ No newline at end of file
+            if workspace:
+                workspace.remove()
+            raise
+        finally:
+            # An unneeded prefetch must not delay the result
+            api_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _read_lua(self, zip_ref, lua_name, on_appid):
+        """
+        Tokenize the LUA file in one pass while it is decoded, calling
+        on_appid as soon as the line with the first addappid has been read.
+        """
+        parser = LuaParser()
+        with zip_ref.open(lua_name) as lua_file:
+            lines = io.TextIOWrapper(lua_file, encoding='utf-8')
+            for line in lines:
+                parser.feed(line)
+                if parser.appid is not None:
+                    on_appid(parser.appid)
+                    break
+            # The rest of the file, without checking for the appid again
+            parser.feed_lines(lines)
+        return parser
+
+    def _extract_manifests(self, zip_ref, manifest_dir):
+        """Stream every .manifest member into manifest_dir, one bounded buffer at a time"""
+        names = []
+        for file_info in zip_ref.infolist():
+            if not file_info.filename.endswith('.manifest'):
+                continue
+            name = os.path.basename(file_info.filename)
+            with zip_ref.open(file_info) as source, open(os.path.join(manifest_dir, name), 'wb') as target:
+                shutil.copyfileobj(source, target, MANIFEST_COPY_BUFFER_SIZE)
+            names.append(name)
+        logger.debug(f"Extracted {len(names)} manifests to {manifest_dir}")
+        return names
\ No newline at end of file
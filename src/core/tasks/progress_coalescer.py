@@ -0,0 +1,113 @@
+"""
+Progress Coalescer - Batches depot output lines before they cross into the GUI
+"""
+
+import time
+from typing import List, Optional
+
+from .progress_parser import PERCENT_SEARCH_LIMIT
+
+
+class ProgressCoalescer:
+    """
+    Buffers output lines on the worker side and releases them in batches.
+
+    DepotDownloaderMod prints one line per file. Forwarding each one as its
+    own cross-thread signal (and log append) freezes the GUI on depots with
+    many small files, so lines are collected here and flushed at most every
+    ``flush_interval`` seconds as a single batch.
+
+    Per-file progress lines are summarized: only the most recent one is kept,
+    together with a count of how many were folded into it. Other lines
+    (warnings, errors, depot summaries) are kept verbatim up to
+    ``max_lines_per_flush``; anything beyond that is counted and reported as
+    dropped.
+    """
+
+    FLUSH_INTERVAL = 0.1  # 10 Hz
+    MAX_LINES_PER_FLUSH = 50
+
+    def __init__(
+        self,
+        flush_interval: Optional[float] = None,
+        max_lines_per_flush: Optional[int] = None,
+        clock=time.monotonic,
+    ):
+        self.flush_interval = (
+            self.FLUSH_INTERVAL if flush_interval is None else flush_interval
+        )
+        self.max_lines_per_flush = (
+            self.MAX_LINES_PER_FLUSH
+            if max_lines_per_flush is None
+            else max_lines_per_flush
+        )
+        self._clock = clock
+        self._last_flush_at = clock()
+
+        self._lines: List[str] = []
+        self._dropped_lines = 0
+        self._file_lines = 0
+        self._last_file_line = ""
+        self._last_file_depot = None
+        self._dirty = False
+
+    def add_lines(self, depot_id: str, lines: List[str]):
+        """Buffer a batch of stripped output lines from one depot process"""
+        for line in lines:
+            if not line:
+                continue
+            self._dirty = True
+
+            # Per-file progress: keep only the latest one
+            if line.find("%", 0, PERCENT_SEARCH_LIMIT) > 0:
+                self._file_lines += 1
+                self._last_file_line = line
+                self._last_file_depot = depot_id
+                continue
+
+            if len(self._lines) < self.max_lines_per_flush:
+                self._lines.append(line)
+            else:
+                self._dropped_lines += 1
+
+    def time_until_flush(self) -> Optional[float]:
+        """
+        Seconds until the next flush is due, 0 if it is due now, or None if
+        nothing is buffered (the caller may block indefinitely).
+        """
+        if not self._dirty:
+            return None
+        remaining = self._last_flush_at + self.flush_interval - self._clock()
+        return max(0.0, remaining)
+
+    def flush(self, force: bool = False) -> List[str]:
+        """
+        Return the buffered lines as one batch if the flush interval has
+        elapsed (or ``force`` is set), otherwise an empty list.
+        """
+        if not self._dirty:
+            return []
+        now = self._clock()
+        if not force and now - self._last_flush_at < self.flush_interval:
+            return []
+        self._last_flush_at = now
+
+        batch = self._lines
+        if self._dropped_lines:
+            batch.append(f"... {self._dropped_lines} more lines not shown")
+        if self._file_lines:
+            if self._file_lines > 1:
+                batch.append(
+                    f"[depot {self._last_file_depot}] {self._last_file_line} "
+                    f"(+{self._file_lines - 1} files)"
+                )
+            else:
+                batch.append(f"[depot {self._last_file_depot}] {self._last_file_line}")
+
+        self._lines = []
+        self._dropped_lines = 0
+        self._file_lines = 0
+        self._last_file_line = ""
+        self._last_file_depot = None
+        self._dirty = False
+        return batch
@@ -0,0 +1,215 @@
+"""
+Progress Parser - Cheap parsing of DepotDownloaderMod output into progress updates
+"""
+
+import re
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.logger import get_internationalized_logger
+
+logger = get_internationalized_logger()
+
+# "Depot 228988 - Downloaded 1048576 bytes (2097152 bytes uncompressed)"
+DEPOT_BYTES_REGEX = re.compile(
+    r"Depot (\d+) - Downloaded (\d+) bytes \((\d+) bytes uncompressed\)"
+)
+# Older DepotDownloader builds report the byte count in other shapes
+ALT_BYTES_REGEX = re.compile(r"Downloaded\s+(\d+)\s+bytes|(\d+)\s+bytes\s+downloaded")
+
+# A per-file progress line starts with the percentage: " 12.34% path/to/file"
+PERCENT_SEARCH_LIMIT = 8
+
+
+@dataclass
+class ProgressUpdate:
+    """Aggregated progress produced at most once per frame interval"""
+
+    percentage: Optional[int]
+    downloaded_bytes: int
+    total_bytes: int
+    depot_percentages: List[Tuple[str, int]] = field(default_factory=list)
+
+
+class DepotProgressParser:
+    """
+    Turns DepotDownloaderMod output into aggregated progress for a session.
+
+    Lines are dispatched on a cheap prefix check, so the common per-file
+    percentage line costs one ``str.find`` and one ``float()`` and never
+    touches a regex. Per-depot state lives in flat arrays indexed by the
+    position of the depot in the session, and the size totals and weights are
+    computed once when the parser is created. ``take_update()`` returns at
+    most one update per ``frame_interval``.
+    """
+
+    FRAME_INTERVAL = 1 / 30
+
+    def __init__(
+        self,
+        depot_ids: Iterable[str],
+        depot_sizes: Optional[Dict[str, int]] = None,
+        total_game_size: int = 0,
+        frame_interval: Optional[float] = None,
+        clock=time.monotonic,
+    ):
+        depot_sizes = depot_sizes or {}
+        self.depot_ids = [str(depot_id) for depot_id in depot_ids]
+        self._index = {depot_id: i for i, depot_id in enumerate(self.depot_ids)}
+        count = len(self.depot_ids)
+
+        self._percent = array("d", [0.0]) * count
+        self._reported_bytes = array("q", [-1]) * count
+        self._uncompressed_bytes = array("q", [0]) * count
+        self._sizes = array("q", [int(depot_sizes.get(d, 0) or 0) for d in self.depot_ids])
+        self._emitted_depot_percent = array("i", [-1]) * count
+
+        # Totals are fixed for the whole session
+        known_size = sum(self._sizes)
+        self.total_size = known_size if known_size > 0 else int(total_game_size or 0)
+        self._weighted = count > 0 and all(self._sizes)
+        self._weight_total = float(known_size) if self._weighted else float(count or 1)
+
+        self.frame_interval = (
+            self.FRAME_INTERVAL if frame_interval is None else frame_interval
+        )
+        self._clock = clock
+        self._last_update_at = 0.0
+        self._last_percentage = -1
+        self._last_bytes = -1
+        self._dirty = False
+
+    def feed(self, depot_id: str, lines: Iterable[str]):
+        """Parse a batch of stripped output lines from one depot process"""
+        index = self._index.get(depot_id)
+        if index is None:
+            return
+
+        for line in lines:
+            # Hot path: per-file progress line
+            percent_end = line.find("%", 0, PERCENT_SEARCH_LIMIT)
+            if percent_end > 0:
+                try:
+                    self._set_percent(index, float(line[:percent_end]))
+                except ValueError:
+                    pass
+                continue
+
+            if line.startswith("Depot "):
+                match = DEPOT_BYTES_REGEX.match(line)
+                if match:
+                    reported_index = self._index.get(match.group(1), index)
+                    self._set_reported_bytes(reported_index, int(match.group(2)))
+                    self._uncompressed_bytes[reported_index] = int(match.group(3))
+                    logger.debug(
+                        f"Depot {match.group(1)} - Downloaded {match.group(2)} bytes ({match.group(3)} bytes uncompressed)"
+                    )
+                continue
+
+            if line.startswith("Progress:"):
+                try:
+                    self._set_percent(index, float(line[9:].strip().rstrip("%")))
+                except ValueError:
+                    pass
+                continue
+
+            if "bytes" in line and "ownloaded" in line:
+                match = ALT_BYTES_REGEX.search(line)
+                if match:
+                    self._set_reported_bytes(index, int(match.group(1) or match.group(2)))
+
+    def _set_percent(self, index: int, percentage: float):
+        # Never move a depot backwards
+        if percentage > self._percent[index]:
+            self._percent[index] = min(percentage, 100.0)
+            self._dirty = True
+
+    def _set_reported_bytes(self, index: int, downloaded: int):
+        # Reports are absolute per depot, so a repeated line never double-counts
+        if downloaded > self._reported_bytes[index]:
+            self._reported_bytes[index] = downloaded
+            self._dirty = True
+
+    def mark_completed(self, depot_id: str):
+        """Mark a depot whose process exited successfully as fully downloaded"""
+        index = self._index.get(depot_id)
+        if index is not None and self._percent[index] < 100.0:
+            self._percent[index] = 100.0
+            self._dirty = True
+
+    def reported_bytes(self, depot_id: str) -> Optional[int]:
+        """Bytes DepotDownloaderMod reported for a depot, if it printed them"""
+        index = self._index.get(depot_id)
+        if index is None or self._reported_bytes[index] < 0:
+            return None
+        return self._reported_bytes[index]
+
+    def depot_percentage(self, depot_id: str) -> float:
+        index = self._index.get(depot_id)
+        return self._percent[index] if index is not None else 0.0
+
+    def overall_percentage(self) -> float:
+        """Overall progress, weighted by depot size when every size is known"""
+        if not self.depot_ids:
+            return 0.0
+        if self._weighted:
+            done = 0.0
+            for percent, size in zip(self._percent, self._sizes):
+                done += percent * size
+            return done / self._weight_total
+        return sum(self._percent) / self._weight_total
+
+    def downloaded_bytes(self) -> int:
+        """Best estimate of the bytes downloaded so far"""
+        downloaded = 0
+        for percent, size, reported in zip(
+            self._percent, self._sizes, self._reported_bytes
+        ):
+            estimate = int(percent * size / 100.0) if size else 0
+            downloaded += reported if reported > estimate else estimate
+
+        if downloaded == 0 and self.total_size and not self._weighted:
+            downloaded = int(self.overall_percentage() / 100.0 * self.total_size)
+        return downloaded
+
+    def take_update(self, force: bool = False) -> Optional[ProgressUpdate]:
+        """
+        Return the aggregated progress if something changed and the frame
+        interval has elapsed (or ``force`` is set), otherwise None.
+        """
+        if not self._dirty:
+            return None
+
+        now = self._clock()
+        if not force and now - self._last_update_at < self.frame_interval:
+            return None
+        self._last_update_at = now
+        self._dirty = False
+
+        depot_percentages = []
+        for index, percent in enumerate(self._percent):
+            int_percent = int(percent)
+            if int_percent != self._emitted_depot_percent[index]:
+                self._emitted_depot_percent[index] = int_percent
+                depot_percentages.append((self.depot_ids[index], int_percent))
+
+        int_percentage = int(self.overall_percentage())
+        percentage = None
+        if int_percentage != self._last_percentage:
+            self._last_percentage = int_percentage
+            percentage = int_percentage
+
+        downloaded = self.downloaded_bytes()
+        total = max(self.total_size, downloaded)
+        if percentage is None and not depot_percentages and downloaded == self._last_bytes:
+            return None
+        self._last_bytes = downloaded
+
+        return ProgressUpdate(
+            percentage=percentage,
+            downloaded_bytes=downloaded,
+            total_bytes=total,
+            depot_percentages=depot_percentages,
+        )
@@ -0,0 +1,210 @@
+"""
+Session Store - Append-only journal for download session persistence
+"""
+
+import copy
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from utils.logger import get_internationalized_logger
+
+logger = get_internationalized_logger()
+
+
+class SessionStore:
+    """
+    Journaled storage for download sessions.
+
+    Session metadata (state, completed depots, sizes...) is kept in an
+    append-only JSON-lines journal: every save or delete appends one record,
+    and the current state is obtained by replaying the journal once when the
+    store is opened. The bulky ``game_data`` (every depot key and manifest id)
+    is written once per session to its own file and never rewritten.
+
+    When the journal grows well beyond the number of live sessions it is
+    compacted: the live records are written to a temporary file which then
+    atomically replaces the journal. A torn last line left by a crash during
+    an append is ignored on replay.
+    """
+
+    JOURNAL_FILENAME = "sessions.journal"
+    GAME_DATA_FILENAME = "game_data.json"
+    LEGACY_FILENAME = "download_sessions.json"
+
+    # Compact once the journal holds this many records...
+    COMPACT_MIN_RECORDS = 256
+    # ...and more than this many records per live session
+    COMPACT_RATIO = 4
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self.journal_path = os.path.join(base_dir, self.JOURNAL_FILENAME)
+        self._lock = threading.RLock()
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._stored_game_data = set()
+        self._record_count = 0
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        self._replay()
+        self._migrate_legacy_file()
+
+    def _replay(self):
+        """Rebuild the current state from the journal"""
+        if not os.path.exists(self.journal_path):
+            return
+        torn_tail = False
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    torn_tail = not line.endswith("\n")
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        logger.warning(
+                            f"Ignoring corrupt session journal record at line {line_number}"
+                        )
+                        continue
+                    self._apply(record)
+                    self._record_count += 1
+        except OSError as e:
+            logger.error(f"Failed to read session journal: {e}")
+            return
+
+        # Appending after a torn line would glue the next record onto it
+        if torn_tail:
+            self.compact()
+
+    def _apply(self, record: Dict[str, Any]):
+        op = record.get("op")
+        session_id = record.get("session_id")
+        if not session_id:
+            return
+        if op == "put":
+            self._sessions[session_id] = record.get("session", {})
+        elif op == "delete":
+            self._sessions.pop(session_id, None)
+
+    def _migrate_legacy_file(self):
+        """Import sessions saved by the old whole-file JSON format"""
+        legacy_path = os.path.join(self.base_dir, self.LEGACY_FILENAME)
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                legacy_sessions = json.load(f)
+            for session_id, session_data in legacy_sessions.items():
+                if session_id in self._sessions:
+                    continue
+                session_data = dict(session_data)
+                game_data = session_data.pop("game_data", None)
+                if game_data is not None:
+                    self.store_game_data(session_id, game_data)
+                self._sessions[session_id] = session_data
+
+            self.compact()
+            os.replace(legacy_path, f"{legacy_path}.migrated")
+            logger.info(f"Migrated {len(legacy_sessions)} sessions to the session journal")
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Failed to migrate legacy sessions file: {e}")
+
+    def _append(self, records: Iterable[Dict[str, Any]]):
+        payload = "".join(
+            json.dumps(record, separators=(",", ":")) + "\n" for record in records
+        )
+        if not payload:
+            return
+        os.makedirs(self.base_dir, exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        self._record_count += payload.count("\n")
+
+        if (
+            self._record_count >= self.COMPACT_MIN_RECORDS
+            and self._record_count > self.COMPACT_RATIO * max(1, len(self._sessions))
+        ):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the journal with one record per live session"""
+        with self._lock:
+            os.makedirs(self.base_dir, exist_ok=True)
+            temp_path = f"{self.journal_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for session_id, session in self._sessions.items():
+                    record = {"op": "put", "session_id": session_id, "session": session}
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.journal_path)
+            self._record_count = len(self._sessions)
+            logger.debug(f"Compacted session journal to {self._record_count} records")
+
+    def get_all(self) -> Dict[str, Dict[str, Any]]:
+        """Metadata of every live session, keyed by session id"""
+        with self._lock:
+            self._ensure_loaded()
+            return copy.deepcopy(self._sessions)
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._ensure_loaded()
+            return copy.deepcopy(self._sessions.get(session_id))
+
+    def put(self, session_id: str, session: Dict[str, Any]):
+        """Record the current metadata of a session (one journal append)"""
+        with self._lock:
+            self._ensure_loaded()
+            if self._sessions.get(session_id) == session:
+                return
+            # Keep a private copy: callers keep mutating their lists
+            session = copy.deepcopy(session)
+            self._sessions[session_id] = session
+            self._append([{"op": "put", "session_id": session_id, "session": session}])
+
+    def delete(self, session_ids: Iterable[str]):
+        """Remove sessions (one journal append for the whole batch)"""
+        with self._lock:
+            self._ensure_loaded()
+            records = []
+            for session_id in session_ids:
+                if session_id in self._sessions:
+                    del self._sessions[session_id]
+                    records.append({"op": "delete", "session_id": session_id})
+                self._stored_game_data.discard(session_id)
+            self._append(records)
+
+    def _game_data_path(self, session_id: str) -> str:
+        return os.path.join(self.base_dir, session_id, self.GAME_DATA_FILENAME)
+
+    def store_game_data(self, session_id: str, game_data: Dict[str, Any]):
+        """Write the game data of a session once"""
+        with self._lock:
+            if session_id in self._stored_game_data:
+                return
+            path = self._game_data_path(session_id)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(game_data, f)
+                os.replace(temp_path, path)
+            self._stored_game_data.add(session_id)
+
+    def load_game_data(self, session_id: str) -> Dict[str, Any]:
+        path = self._game_data_path(session_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load game data of session {session_id}: {e}")
+            return {}
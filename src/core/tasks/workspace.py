@@ -0,0 +1,105 @@
+"""
+Workspace - Private directory for the transient files of one session
+"""
+
+import os
+import shutil
+import time
+import uuid
+from typing import Optional
+
+from utils.logger import get_internationalized_logger
+
+logger = get_internationalized_logger()
+
+WORKSPACES_DIR = "data/workspaces"
+
+
+class SessionWorkspace:
+    """
+    Directory holding the keys, manifests and logs of one zip ingest or
+    download session.
+
+    Nothing is shared through the working directory any more, so several
+    zips can be processed and several sessions downloaded at the same time
+    without overwriting or deleting each other's files. Each workspace is
+    removed by whoever owns it: ingest workspaces once their manifests were
+    handed to a download session or queue job, download workspaces together
+    with their session.
+    """
+
+    KEYS_FILENAME = "keys.vdf"
+    MANIFEST_DIRNAME = "manifest"
+    LOG_FILENAME = "download.log"
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @classmethod
+    def create(cls, prefix: str = "session") -> "SessionWorkspace":
+        """Create a new, empty workspace under ``data/workspaces``"""
+        workspace = cls(os.path.join(WORKSPACES_DIR, f"{prefix}-{uuid.uuid4()}"))
+        workspace.ensure()
+        return workspace
+
+    @classmethod
+    def from_game_data(cls, game_data) -> Optional["SessionWorkspace"]:
+        """Workspace the zip of this game was ingested into, if any"""
+        path = game_data.get("ingest_workspace") if game_data else None
+        return cls(path) if path else None
+
+    @property
+    def keys_path(self) -> str:
+        return os.path.join(self.path, self.KEYS_FILENAME)
+
+    @property
+    def manifest_dir(self) -> str:
+        return os.path.join(self.path, self.MANIFEST_DIRNAME)
+
+    @property
+    def log_path(self) -> str:
+        return os.path.join(self.path, self.LOG_FILENAME)
+
+    def manifest_path(self, depot_id, manifest_id) -> str:
+        return os.path.join(self.manifest_dir, f"{depot_id}_{manifest_id}.manifest")
+
+    def filelist_path(self, depot_id) -> str:
+        return os.path.join(self.path, f"{depot_id}_filelist.txt")
+
+    def exists(self) -> bool:
+        return os.path.isdir(self.path)
+
+    def ensure(self):
+        os.makedirs(self.manifest_dir, exist_ok=True)
+
+    def remove_keys(self):
+        """Remove the depot keys file, which is only needed while downloading"""
+        try:
+            if os.path.exists(self.keys_path):
+                os.remove(self.keys_path)
+        except OSError as e:
+            logger.warning(f"Failed to remove {self.keys_path}: {e}")
+
+    def remove(self):
+        """Remove the whole workspace"""
+        if os.path.isdir(self.path):
+            try:
+                shutil.rmtree(self.path)
+                logger.debug(f"Removed workspace {self.path}")
+            except OSError as e:
+                logger.warning(f"Failed to remove workspace {self.path}: {e}")
+
+    @classmethod
+    def cleanup_stale(cls, max_age_hours: int = 24):
+        """Remove workspaces nobody claimed (e.g. a zip whose dialog was closed)"""
+        if not os.path.isdir(WORKSPACES_DIR):
+            return
+        cutoff = time.time() - max_age_hours * 3600
+        for name in os.listdir(WORKSPACES_DIR):
+            path = os.path.join(WORKSPACES_DIR, name)
+            try:
+                if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path)
+                    logger.debug(f"Removed stale workspace {path}")
+            except OSError as e:
+                logger.warning(f"Failed to remove stale workspace {path}: {e}")
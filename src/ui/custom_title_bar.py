@@ -153,6 +153,14 @@ class CustomTitleBar(QFrame):
         )
         right_layout.addWidget(self.select_file_button)
 
+        # Add download queue button
+        self.download_queue_button = self._create_text_button(
+            tr("CustomTitleBar", "QU"),
+            getattr(parent, "_open_download_queue", lambda: None),
+            tr("CustomTitleBar", "Download Queue"),
+        )
+        right_layout.addWidget(self.download_queue_button)
+
         # Add game manager button
         self.game_manager_button = self._create_text_button(
             tr("CustomTitleBar", "UN"),
@@ -0,0 +1,184 @@
+from utils.logger import get_internationalized_logger
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QListWidget,
+    QListWidgetItem,
+    QVBoxLayout,
+)
+
+from core.tasks.download_queue import JobState
+from ui.interactions import HoverButton
+from ui.theme import BorderRadius, Spacing, Typography, theme
+
+try:
+    from utils.i18n import tr
+except (ImportError, ModuleNotFoundError):
+
+    def tr(context, text):
+        return text
+
+
+logger = get_internationalized_logger()
+
+
+class DownloadQueueDialog(QDialog):
+    """
+    Dialog for reviewing and reordering the download queue.
+    """
+
+    def __init__(self, download_queue, parent=None):
+        super().__init__(parent)
+        self.download_queue = download_queue
+        self.setWindowTitle(tr("DownloadQueueDialog", "Download Queue"))
+        self.setModal(True)
+        self.setMinimumSize(560, 380)
+        self.setup_ui()
+        self.refresh_job_list()
+        self.download_queue.queue_changed.connect(self.refresh_job_list)
+
+    def setup_ui(self):
+        main_layout = QVBoxLayout(self)
+        main_layout.setSpacing(Spacing.SM)
+
+        title = QLabel(tr("DownloadQueueDialog", "Download Queue"))
+        title.setStyleSheet(f"""
+            QLabel {{
+                color: {theme.colors.TEXT_PRIMARY};
+                {Typography.get_font_style(Typography.H3_SIZE)};
+                font-weight: bold;
+                padding: {Spacing.SM}px 0;
+            }}
+        """)
+        main_layout.addWidget(title)
+
+        self.job_list = QListWidget()
+        self.job_list.setStyleSheet(f"""
+            QListWidget {{
+                background: {theme.colors.SURFACE};
+                border: 1px solid {theme.colors.BORDER};
+                {BorderRadius.get_border_radius(BorderRadius.SMALL)};
+                {Typography.get_font_style(Typography.BODY_SIZE)};
+                padding: {Spacing.XS}px;
+            }}
+            QListWidget::item {{
+                padding: {Spacing.SM}px;
+                border-bottom: 1px solid {theme.colors.BORDER};
+                color: {theme.colors.TEXT_PRIMARY};
+            }}
+            QListWidget::item:selected {{
+                background: {theme.colors.PRIMARY};
+                color: {theme.colors.TEXT_ON_PRIMARY};
+            }}
+        """)
+        self.job_list.itemSelectionChanged.connect(self._update_buttons)
+        main_layout.addWidget(self.job_list)
+
+        button_layout = QHBoxLayout()
+
+        self.move_up_btn = HoverButton(tr("DownloadQueueDialog", "Move Up"))
+        self.move_up_btn.clicked.connect(lambda: self._move_selected(-1))
+        button_layout.addWidget(self.move_up_btn)
+
+        self.move_down_btn = HoverButton(tr("DownloadQueueDialog", "Move Down"))
+        self.move_down_btn.clicked.connect(lambda: self._move_selected(1))
+        button_layout.addWidget(self.move_down_btn)
+
+        self.priority_btn = HoverButton(tr("DownloadQueueDialog", "High Priority"))
+        self.priority_btn.setCheckable(True)
+        self.priority_btn.clicked.connect(self._toggle_priority)
+        button_layout.addWidget(self.priority_btn)
+
+        self.remove_btn = HoverButton(tr("DownloadQueueDialog", "Remove"))
+        self.remove_btn.clicked.connect(self._remove_selected)
+        button_layout.addWidget(self.remove_btn)
+
+        clear_btn = HoverButton(tr("DownloadQueueDialog", "Clear Finished"))
+        clear_btn.clicked.connect(self.download_queue.clear_finished)
+        button_layout.addWidget(clear_btn)
+
+        button_layout.addStretch()
+
+        close_btn = HoverButton(tr("DownloadQueueDialog", "Close"))
+        close_btn.clicked.connect(self.close)
+        button_layout.addWidget(close_btn)
+
+        main_layout.addLayout(button_layout)
+
+        self.setStyleSheet(f"""
+            QDialog {{
+                background: {theme.colors.BACKGROUND};
+                border: 2px solid {theme.colors.BORDER};
+                {BorderRadius.get_border_radius(BorderRadius.MEDIUM)};
+            }}
+        """)
+
+    def refresh_job_list(self):
+        """Refresh the job list, keeping the selection"""
+        selected_id = self._selected_job_id()
+        self.job_list.clear()
+
+        jobs = self.download_queue.all_jobs()
+        if not jobs:
+            item = QListWidgetItem(tr("DownloadQueueDialog", "The queue is empty"))
+            item.setData(Qt.ItemDataRole.UserRole, None)
+            self.job_list.addItem(item)
+            self._update_buttons()
+            return
+
+        state_labels = {
+            JobState.QUEUED: tr("DownloadQueueDialog", "Queued"),
+            JobState.RUNNING: tr("DownloadQueueDialog", "Downloading"),
+            JobState.COMPLETED: tr("DownloadQueueDialog", "Completed"),
+            JobState.FAILED: tr("DownloadQueueDialog", "Failed"),
+            JobState.CANCELLED: tr("DownloadQueueDialog", "Cancelled"),
+        }
+        for job in jobs:
+            text = f"[{state_labels[job.state]}] {job.game_name} - " + tr(
+                "DownloadQueueDialog", "{0} depots"
+            ).format(len(job.selected_depots))
+            if job.priority > 0:
+                text += " ★"
+            if job.error_message:
+                text += f" ({job.error_message})"
+
+            item = QListWidgetItem(text)
+            item.setData(Qt.ItemDataRole.UserRole, job.job_id)
+            self.job_list.addItem(item)
+            if job.job_id == selected_id:
+                item.setSelected(True)
+
+        self._update_buttons()
+
+    def _selected_job_id(self):
+        items = self.job_list.selectedItems()
+        return items[0].data(Qt.ItemDataRole.UserRole) if items else None
+
+    def _update_buttons(self):
+        job = self.download_queue.jobs.get(self._selected_job_id() or "")
+        pending = job is not None and job.state == JobState.QUEUED
+        self.move_up_btn.setEnabled(pending)
+        self.move_down_btn.setEnabled(pending)
+        self.priority_btn.setEnabled(pending)
+        self.priority_btn.setChecked(pending and job.priority > 0)
+        self.remove_btn.setEnabled(job is not None and job.state != JobState.RUNNING)
+
+    def _move_selected(self, offset):
+        job_id = self._selected_job_id()
+        if job_id:
+            self.download_queue.move_job(job_id, offset)
+
+    def _toggle_priority(self):
+        job_id = self._selected_job_id()
+        if job_id:
+            self.download_queue.set_priority(
+                job_id, 1 if self.priority_btn.isChecked() else 0
+            )
+
+    def _remove_selected(self):
+        job_id = self._selected_job_id()
+        if job_id:
+            self.download_queue.remove_job(job_id)
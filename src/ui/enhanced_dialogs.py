@@ -14,6 +14,7 @@ from PyQt6.QtWidgets import (
     QListWidgetItem,
     QMessageBox,
     QScrollArea,
+    QSpinBox,
     QVBoxLayout,
     QWidget,
     QTextEdit,
@@ -25,9 +26,11 @@ from ui.theme import BorderRadius, Spacing, Typography
 from utils.i18n import tr
 from utils.logger import get_internationalized_logger
 from utils.settings import (
+    get_download_setting,
     get_logging_setting,
     get_settings,
     is_steam_schema_enabled,
+    set_download_setting,
     set_logging_setting,
     set_steam_schema_setting,
     should_auto_setup_credentials,
@@ -402,6 +405,88 @@ class SettingsDialog(ModernDialog):
 
         scroll_layout.addWidget(drm_frame)
 
+        # Downloads Section
+        downloads_frame = ModernFrame()
+        downloads_layout = QVBoxLayout(downloads_frame)
+
+        downloads_title = QLabel(tr("EnhancedDialogs", "Downloads"))
+        downloads_title.setStyleSheet(
+            f"{Typography.get_font_style(Typography.H3_SIZE, Typography.WEIGHT_BOLD)}; color: {theme.colors.TEXT_ACCENT};"
+        )
+        downloads_layout.addWidget(downloads_title)
+
+        parallel_layout = QHBoxLayout()
+        parallel_label = QLabel(tr("EnhancedDialogs", "Parallel depot downloads:"))
+        parallel_label.setStyleSheet(
+            f"color: {theme.colors.TEXT_SECONDARY}; {Typography.get_font_style(Typography.BODY_SIZE)};"
+        )
+        parallel_layout.addWidget(parallel_label)
+
+        self.max_parallel_depots_spin = QSpinBox()
+        self.max_parallel_depots_spin.setRange(1, 16)
+        self.max_parallel_depots_spin.setValue(
+            get_download_setting("max_parallel_depots", 3)
+        )
+        self.max_parallel_depots_spin.setToolTip(
+            tr(
+                "EnhancedDialogs",
+                "How many depots are downloaded at the same time.",
+            )
+        )
+        parallel_layout.addWidget(self.max_parallel_depots_spin)
+        downloads_layout.addLayout(parallel_layout)
+
+        budget_layout = QHBoxLayout()
+        budget_label = QLabel(tr("EnhancedDialogs", "Total connections:"))
+        budget_label.setStyleSheet(
+            f"color: {theme.colors.TEXT_SECONDARY}; {Typography.get_font_style(Typography.BODY_SIZE)};"
+        )
+        budget_layout.addWidget(budget_label)
+
+        self.connection_budget_spin = QSpinBox()
+        self.connection_budget_spin.setRange(1, 256)
+        self.connection_budget_spin.setValue(
+            get_download_setting("connection_budget", 25)
+        )
+        self.connection_budget_spin.setToolTip(
+            tr(
+                "EnhancedDialogs",
+                "Connections shared by all depots being downloaded at the same time.",
+            )
+        )
+        budget_layout.addWidget(self.connection_budget_spin)
+        downloads_layout.addLayout(budget_layout)
+
+        self.preallocate_files_checkbox = CustomCheckBox(
+            tr("EnhancedDialogs", "Preallocate large files")
+        )
+        self.preallocate_files_checkbox.setChecked(
+            get_download_setting("preallocate_files", False)
+        )
+        self.preallocate_files_checkbox.setToolTip(
+            tr(
+                "EnhancedDialogs",
+                "Reserve the space of large game files before downloading them. Reduces fragmentation on hard disks and stops a download early when the disk is full.",
+            )
+        )
+        downloads_layout.addWidget(self.preallocate_files_checkbox)
+
+        self.incremental_updates_checkbox = CustomCheckBox(
+            tr("EnhancedDialogs", "Incremental updates")
+        )
+        self.incremental_updates_checkbox.setChecked(
+            get_download_setting("incremental_updates", True)
+        )
+        self.incremental_updates_checkbox.setToolTip(
+            tr(
+                "EnhancedDialogs",
+                "When a newer version of an installed game is downloaded, compare its manifests with the installed ones and only download the files that changed, instead of validating the whole game.",
+            )
+        )
+        downloads_layout.addWidget(self.incremental_updates_checkbox)
+
+        scroll_layout.addWidget(downloads_frame)
+
         # Online Fixes Section
         online_fixes_frame = ModernFrame()
         online_fixes_layout = QVBoxLayout(online_fixes_frame)
@@ -491,6 +576,10 @@ class SettingsDialog(ModernDialog):
             "simple_mode": bool(get_logging_setting("simple_mode", False)),
             "log_level": str(get_logging_setting("level", "INFO")),
             "language": self.settings.value("language", "en", type=str),
+            "max_parallel_depots": get_download_setting("max_parallel_depots", 3),
+            "connection_budget": get_download_setting("connection_budget", 25),
+            "preallocate_files": get_download_setting("preallocate_files", False),
+            "incremental_updates": get_download_setting("incremental_updates", True),
         }
 
     def _load_online_fixes_config(self):
@@ -672,6 +761,10 @@ class SettingsDialog(ModernDialog):
             "steamless_enabled": self.steamless_enabled_checkbox.isChecked(),
             "simple_mode": self.simple_mode_checkbox.isChecked(),
             "log_level": self.log_level_combo.currentText(),
+            "max_parallel_depots": self.max_parallel_depots_spin.value(),
+            "connection_budget": self.connection_budget_spin.value(),
+            "preallocate_files": self.preallocate_files_checkbox.isChecked(),
+            "incremental_updates": self.incremental_updates_checkbox.isChecked(),
         }
 
         # Get selected language
@@ -712,6 +805,19 @@ class SettingsDialog(ModernDialog):
             f"Logging settings updated: simple_mode={current_values['simple_mode']}, level={current_values['log_level']}"
         )
 
+        # Save download settings
+        set_download_setting(
+            "max_parallel_depots", current_values["max_parallel_depots"]
+        )
+        set_download_setting("connection_budget", current_values["connection_budget"])
+        set_download_setting("preallocate_files", current_values["preallocate_files"])
+        set_download_setting(
+            "incremental_updates", current_values["incremental_updates"]
+        )
+        logger.info(
+            f"Download settings updated: max_parallel_depots={current_values['max_parallel_depots']}, connection_budget={current_values['connection_budget']}, preallocate_files={current_values['preallocate_files']}, incremental_updates={current_values['incremental_updates']}"
+        )
+
         # Save language setting
         self.settings.setValue("language", current_values["language"])
         logger.info(f"Language setting updated: language={current_values['language']}")
@@ -24,6 +24,8 @@ from PyQt6.QtWidgets import (
 )
 
 from core.game_manager import GameManager
+from core.tasks.install_verifier import VERIFY_REPORTS_DIR, verify_install
+from core.tasks.installed_manifests import installed_manifests
 from ui.custom_checkbox import CustomCheckBox
 from ui.enhanced_widgets import EnhancedProgressBar
 from ui.interactions import HoverButton, ModernFrame
@@ -152,6 +154,73 @@ class GameDeletionWorker(QThread):
         return self._current_game or "None"
 
 
+class GameVerificationWorker(QThread):
+    """Worker thread for verifying installed games against their manifests."""
+
+    progress = pyqtSignal(int, str)  # progress, message
+    game_verified = pyqtSignal(str, object)  # game_name, VerifyReport
+    finished = pyqtSignal()
+
+    def __init__(self, games_to_verify: List[Dict], fast: bool = False):
+        super().__init__()
+        self.games_to_verify = games_to_verify
+        self.fast = fast
+        self._is_running = True
+
+    def run(self):
+        """Verify each game in turn; files found bad are flagged for repair."""
+        total_games = len(self.games_to_verify)
+        try:
+            for i, game_info in enumerate(self.games_to_verify):
+                if not self._is_running:
+                    logger.debug("Verification worker stopped by user")
+                    break
+
+                game_name = game_info.get("name", "Unknown Game")
+                game_dir = game_info.get("game_dir") or os.path.join(
+                    game_info.get("library_path", ""),
+                    "steamapps",
+                    "common",
+                    game_info.get("installdir", ""),
+                )
+                self.progress.emit(
+                    int((i / total_games) * 100), f"Verifying {game_name}..."
+                )
+
+                def on_progress(done_bytes, total_bytes, i=i, game_name=game_name):
+                    fraction = done_bytes / total_bytes if total_bytes else 1
+                    self.progress.emit(
+                        int(((i + fraction) / total_games) * 100),
+                        f"Verifying {game_name}... "
+                        f"{done_bytes / 1024**3:.1f} / {total_bytes / 1024**3:.1f} GB",
+                    )
+
+                try:
+                    report = verify_install(
+                        game_dir,
+                        fast=self.fast,
+                        progress_callback=on_progress,
+                        should_stop=lambda: not self._is_running,
+                    )
+                    if not report.error and not report.cancelled:
+                        installed_manifests.mark_for_repair(
+                            game_dir, report.repair_files()
+                        )
+                        report.save()
+                except Exception as e:
+                    logger.error(f"Error verifying {game_name}: {e}", exc_info=True)
+                    continue
+                self.game_verified.emit(game_name, report)
+
+            self.progress.emit(100, "Verification completed")
+        finally:
+            self.finished.emit()
+
+    def stop(self):
+        """Safely stop the worker execution."""
+        self._is_running = False
+
+
 class GameDeletionDialog(QDialog):
     """Main dialog for Bifrost game deletion."""
 
@@ -160,6 +229,8 @@ class GameDeletionDialog(QDialog):
         self.games_list = []
         self.selected_games = []
         self.deletion_worker = None
+        self.verification_worker = None
+        self.verification_results = []
 
         self.setWindowTitle(tr("GameDeletionDialog", "Uninstall Bifrost Games"))
         self.setModal(True)
@@ -583,6 +654,32 @@ class GameDeletionDialog(QDialog):
         self.delete_btn.setFixedHeight(30)  # Increased height for better touch targets
         actions_layout.addWidget(self.delete_btn)
 
+        actions_layout.addSpacing(Spacing.MD)
+
+        # Verify button
+        self.verify_btn = HoverButton(tr("GameDeletionDialog", "Verify Selected Games"))
+        self.verify_btn.clicked.connect(self._start_verification)
+        self.verify_btn.setEnabled(False)
+        self.verify_btn.setFixedHeight(30)
+        self.verify_btn.setToolTip(
+            tr(
+                "GameDeletionDialog",
+                "Check the installed files against the manifests they were downloaded with. Missing or corrupt files are downloaded again the next time the game's zip is downloaded.",
+            )
+        )
+        actions_layout.addWidget(self.verify_btn)
+
+        self.quick_verify_checkbox = CustomCheckBox(
+            tr("GameDeletionDialog", "Quick check")
+        )
+        self.quick_verify_checkbox.setToolTip(
+            tr(
+                "GameDeletionDialog",
+                "Only compare file sizes and modification times instead of hashing every file.",
+            )
+        )
+        actions_layout.addWidget(self.quick_verify_checkbox)
+
         layout.addLayout(actions_layout)
         layout.addStretch()
 
@@ -809,6 +906,7 @@ class GameDeletionDialog(QDialog):
 
         self.selected_games = selected_games
         self.delete_btn.setEnabled(len(selected_games) > 0)
+        self.verify_btn.setEnabled(len(selected_games) > 0)
         self.delete_btn.setText(
             tr("GameDeletionDialog", "Delete Selected Games ({count})").format(
                 count=len(selected_games)
@@ -937,10 +1035,86 @@ class GameDeletionDialog(QDialog):
         self.progress_frame.setVisible(False)
         self.progress_bar.setValue(0)
 
+    def _start_verification(self):
+        """Start background verification of the selected games."""
+        if not self.selected_games:
+            return
+
+        self.games_table.setEnabled(False)
+        self.delete_btn.setEnabled(False)
+        self.verify_btn.setEnabled(False)
+        self.refresh_btn.setEnabled(False)
+        self.progress_label.setText(tr("GameDeletionDialog", "Preparing verification..."))
+        self.progress_frame.setVisible(True)
+
+        self.verification_results = []
+        self.verification_worker = GameVerificationWorker(
+            self.selected_games, fast=self.quick_verify_checkbox.isChecked()
+        )
+        self.verification_worker.progress.connect(self._on_deletion_progress)
+        self.verification_worker.game_verified.connect(self._on_game_verified)
+        self.verification_worker.finished.connect(self._on_verification_finished)
+        self.verification_worker.start()
+
+    def _on_game_verified(self, game_name: str, report):
+        """Collect the result of one game's verification."""
+        self.verification_results.append((game_name, report))
+
+    def _on_verification_finished(self):
+        """Summarize the verification and reset the UI."""
+        self.verification_worker = None
+
+        lines = []
+        needs_repair = False
+        for game_name, report in self.verification_results:
+            if report.error:
+                lines.append(f"• {game_name}: {report.error}")
+            elif report.ok:
+                lines.append(
+                    tr("GameDeletionDialog", "• {0}: all {1} files OK").format(
+                        game_name, report.checked_files
+                    )
+                )
+            else:
+                missing = report.count(report.missing)
+                corrupt = report.count(report.corrupt)
+                needs_repair = needs_repair or bool(missing or corrupt)
+                line = tr(
+                    "GameDeletionDialog", "• {0}: {1} missing, {2} corrupt"
+                ).format(game_name, missing, corrupt)
+                if report.modified:
+                    line += tr("GameDeletionDialog", ", {0} modified").format(
+                        report.count(report.modified)
+                    )
+                lines.append(line)
+
+        message = "\n".join(lines) or tr("GameDeletionDialog", "No games were verified.")
+        if needs_repair:
+            message += tr(
+                "GameDeletionDialog",
+                "\n\nDownload these games again from their zips to repair them: only the missing and corrupt files will be downloaded.",
+            )
+        message += tr(
+            "GameDeletionDialog", "\n\nReports were saved to {0}"
+        ).format(os.path.abspath(VERIFY_REPORTS_DIR))
+        QMessageBox.information(
+            self, tr("GameDeletionDialog", "Verification Complete"), message
+        )
+
+        self.games_table.setEnabled(True)
+        self.refresh_btn.setEnabled(True)
+        self._on_selection_changed()
+        self.progress_frame.setVisible(False)
+        self.progress_bar.setValue(0)
+
     def closeEvent(self, a0):
         """Trata o evento de fechar o dialog."""
         if self.deletion_worker:
             self.deletion_worker.stop()
             self.deletion_worker.wait()
             self.deletion_worker = None
+        if self.verification_worker:
+            self.verification_worker.stop()
+            self.verification_worker.wait()
+            self.verification_worker = None
         super().closeEvent(a0)
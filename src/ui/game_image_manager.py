@@ -12,6 +12,7 @@ import requests
 from PyQt6.QtCore import QObject, QThread, pyqtSignal
 from PyQt6.QtGui import QPixmap
 
+from utils.http_client import http_client
 from utils.image_cache import ImageCacheManager
 
 logger = get_internationalized_logger()
@@ -144,7 +145,7 @@ class GameImageManager(QObject):
             for api_endpoint in self.api_endpoints:
                 try:
                     url = f"{api_endpoint}&appids={app_id}"
-                    response = requests.get(url, headers=headers, timeout=5)
+                    response = http_client.get(url, headers=headers, timeout=5)
                     response.raise_for_status()
 
                     data = response.json()
@@ -248,7 +249,7 @@ class GameImageManager(QObject):
                 "Cache-Control": "no-cache",
             }
 
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = http_client.get(url, headers=headers, timeout=timeout)
             response.raise_for_status()
 
             # Check if response contains image data
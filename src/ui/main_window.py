@@ -1,5 +1,6 @@
 # type: ignore
 from utils.logger import get_internationalized_logger
+import html
 import logging
 import os
 import re
@@ -26,10 +27,15 @@ from PyQt6.QtWidgets import (
 )
 
 from core import steam_helpers
+from core.disk_space import check_disk_space
 from core.online_fixes_manager import OnlineFixesManager
+from core.tasks.batch_ingest_task import BatchIngestTask, format_summary_table
 from core.tasks.download_manager import DownloadManager
+from core.tasks.download_queue import DownloadQueue
+from core.tasks.download_session import DownloadSession
 from core.tasks.monitor_speed_task import SpeedMonitorTask
 from core.tasks.process_zip_task import ProcessZipTask
+from core.tasks.workspace import SessionWorkspace
 from ui.asset_optimizer import AssetManager
 from ui.custom_title_bar import CustomTitleBar
 from ui.enhanced_dialogs import (
@@ -165,6 +171,20 @@ class MainWindow(QMainWindow):
         # Download Manager for pause/cancel/resume
         self.download_manager = DownloadManager()
 
+        # Persistent queue of downloads run back to back
+        self.download_queue = DownloadQueue(self.download_manager)
+
+        # Folder of zips being processed in the background, if any
+        self.batch_ingest_task = None
+
+        # Ingest workspaces of zips that were never downloaded or queued
+        SessionWorkspace.cleanup_stale()
+        # Finished or cancelled sessions from past runs; interrupted ones stay
+        # stored for the resume prompt, queued ones for the queue
+        DownloadSession.cleanup_old_sessions(
+            keep=[job.session_id for job in self.download_queue.jobs.values() if job.session_id]
+        )
+
         # Online Fixes Manager
         self.online_fixes_manager = OnlineFixesManager()
 
@@ -181,6 +201,9 @@ class MainWindow(QMainWindow):
         # Control to avoid multiple completion messages
         self._completion_message_shown = False
 
+        # Percentage of every depot still downloading, in start order
+        self._depot_percentages = {}
+
         # Persist game data for Online-Fixes
         self._current_game_data = None
 
@@ -194,6 +217,9 @@ class MainWindow(QMainWindow):
         # If zip file was provided as argument, start processing it immediately
         if zip_file:
             self._start_zip_processing(zip_file)
+        else:
+            # Offer to resume a download interrupted by a crash or reboot
+            QTimer.singleShot(0, self._offer_interrupted_session_resume)
 
     def _setup_ui(self):
         self.central_widget = QWidget()
@@ -517,13 +543,60 @@ class MainWindow(QMainWindow):
             url = a0.mimeData().urls()[0]
             if url.isLocalFile() and url.toLocalFile().lower().endswith(".zip"):
                 a0.acceptProposedAction()
+            elif url.isLocalFile() and os.path.isdir(url.toLocalFile()):
+                # A folder of zips is ingested as a batch
+                a0.acceptProposedAction()
 
     def dropEvent(self, a0):
         url = a0.mimeData().urls()[0]
         zip_path = url.toLocalFile()
-        self.log_output.clear()
+        if not self.download_queue.is_download_active():
+            self.log_output.clear()
+        if os.path.isdir(zip_path):
+            self._start_batch_ingest(zip_path)
+            return
         self._start_zip_processing(zip_path)
 
+    def _start_batch_ingest(self, folder):
+        """Process every zip of a folder in parallel and show a summary table"""
+        if self.batch_ingest_task:
+            self.log_output.append(
+                tr("MainWindow", "A batch ingest is already running")
+            )
+            return
+        self.log_output.append(
+            tr("MainWindow", "Processing all ZIP files in {0}...").format(folder)
+        )
+        self.batch_ingest_task = BatchIngestTask()
+        self.batch_ingest_task.progress.connect(self.log_output.append)
+        self.batch_task_runner = TaskRunner()
+        worker = self.batch_task_runner.run(self.batch_ingest_task.run, folder)
+        worker.finished.connect(self._on_batch_ingest_finished)
+        worker.error.connect(self._on_batch_ingest_error)
+
+    def _on_batch_ingest_finished(self, rows):
+        self.batch_ingest_task = None
+        if not rows:
+            return
+        failed = sum(1 for row in rows if row["error"])
+        self.log_output.append(
+            f"<pre>{html.escape(format_summary_table(rows))}</pre>"
+        )
+        self.log_output.append(
+            tr(
+                "MainWindow",
+                "Batch ingest finished: {0} zips processed, {1} failed. Drop a zip to download it.",
+            ).format(len(rows) - failed, failed)
+        )
+
+    def _on_batch_ingest_error(self, error_info):
+        self.batch_ingest_task = None
+        _, error_value, _ = error_info
+        logger.error(f"Batch ingest failed: {error_value}")
+        self.log_output.append(
+            tr("MainWindow", "Batch ingest failed: {0}").format(error_value)
+        )
+
     def _setup_download_connections(self):
         """Configure DownloadManager and UI controls connections"""
         # Connect DownloadManager signals
@@ -551,6 +624,7 @@ class MainWindow(QMainWindow):
         self.download_manager.download_error.connect(self._on_download_error)
         self.download_manager.state_changed.connect(self._on_download_state_changed)
         self.download_manager.depot_completed.connect(self._on_depot_completed)
+        self.download_manager.depot_progress.connect(self._on_depot_progress)
 
         # Connect UI controls (minimalist widget)
         self.minimal_download_widget.pause_clicked.connect(
@@ -585,6 +659,21 @@ class MainWindow(QMainWindow):
         # 🐛 FIX: Clean up any previous ZIP task and task runner to prevent conflicts
         self._cleanup_zip_processing()
 
+        # A download is running: process the zip for the queue and leave the
+        # download UI and game data alone
+        if self.download_queue.is_download_active():
+            self.log_output.append(
+                tr("MainWindow", "Processing ZIP file for the download queue: {0}").format(
+                    zip_path
+                )
+            )
+            self.zip_task = ProcessZipTask()
+            self.task_runner = TaskRunner()
+            worker = self.task_runner.run(self.zip_task.run, zip_path)
+            worker.finished.connect(self._on_zip_processed)
+            worker.error.connect(self._handle_task_error)
+            return
+
         # Reset completion message control for new processing
         self._completion_message_shown = False
         if hasattr(self, "_fix_applied_recently"):
@@ -732,6 +821,17 @@ class MainWindow(QMainWindow):
             self._handle_steam_schema_generation()
             logger.debug("Steam schema generation handled")
 
+            # More queued downloads: move on without waiting for the user.
+            # Online-Fixes and the Steam restart prompt wait for the last one.
+            if self.download_queue.should_start_next():
+                self.log_output.append(
+                    tr("MainWindow", "{0} more downloads in the queue").format(
+                        len(self.download_queue.pending_jobs())
+                    )
+                )
+                QTimer.singleShot(2500, self._start_next_queued_job)
+                return
+
             # Check for Online-Fixes after download completion
             if install_path and os.path.exists(install_path):
                 logger.debug("Checking for Online-Fixes...")
@@ -776,14 +876,33 @@ class MainWindow(QMainWindow):
         )
         self.minimal_download_widget.set_idle_state()
 
+        # A failed job does not stop the rest of the queue
+        if self.download_queue.should_start_next():
+            QTimer.singleShot(2500, self._start_next_queued_job)
+
     def _on_download_state_changed(self, state):
         """Handle download state changes"""
         logger.debug(f"Download state changed to: {state}")
 
     def _on_depot_completed(self, depot_id):
         """Handle individual depot completion"""
+        self._depot_percentages.pop(depot_id, None)
         self.log_output.append(tr("MainWindow", "Depot {0} completed").format(depot_id))
 
+    def _on_depot_progress(self, depot_id, percentage):
+        """Show the progress of every depot downloading in parallel"""
+        if percentage >= 100:
+            self._depot_percentages.pop(depot_id, None)
+        else:
+            self._depot_percentages[depot_id] = percentage
+        if self._depot_percentages:
+            self.minimal_download_widget.update_status(
+                ", ".join(
+                    tr("MainWindow", "depot {0}: {1}%").format(depot, value)
+                    for depot, value in self._depot_percentages.items()
+                )
+            )
+
     def _check_for_online_fixes(self):
         """Inicia verificação de Online-Fixes para o jogo baixado"""
         logger.info(tr("OnlineFixes", "_check_for_online_fixes() called"))
@@ -1434,6 +1553,18 @@ class MainWindow(QMainWindow):
             return ""
 
     def _on_zip_processed(self, game_data):
+        if self.download_queue.is_download_active():
+            if game_data and game_data.get("depots"):
+                self._show_depot_selection_dialog(game_data, queue_only=True)
+            else:
+                self.log_output.append(
+                    tr(
+                        "MainWindow",
+                        "Zip file processed, but no downloadable depots were found.",
+                    )
+                )
+            return
+
         # Don't clear current_dest_path - preserve it for potential fix installation
         self.game_data = game_data
         # Reset fix availability for new game
@@ -1464,17 +1595,23 @@ class MainWindow(QMainWindow):
             )
             self._reset_ui_state()
 
-    def _show_depot_selection_dialog(self):
-        if not self.game_data:
+    def _show_depot_selection_dialog(self, game_data=None, queue_only=False):
+        """
+        Ask for depots, DLCs and library, then start the download - or add it
+        to the download queue when ``queue_only`` is set (a download is
+        already running and must keep its own game data and UI).
+        """
+        game_data = game_data or self.game_data
+        if not game_data:
             self.log_output.append(
                 tr("MainWindow", "Error: No game data available for depot selection")
             )
             return
-        depot_sizes = self.game_data.get("depot_sizes", {})
-        total_game_size = self.game_data.get("total_game_size", 0)
+        depot_sizes = game_data.get("depot_sizes", {})
+        total_game_size = game_data.get("total_game_size", 0)
         self.depot_dialog = DepotSelectionDialog(
-            self.game_data["appid"],
-            self.game_data["depots"],
+            game_data["appid"],
+            game_data["depots"],
             depot_sizes,
             self,
             total_game_size,
@@ -1485,11 +1622,11 @@ class MainWindow(QMainWindow):
             total_game_size = self.depot_dialog.get_total_game_size()
             # Store the header image from dialog for later use in download
             dialog_image = self.depot_dialog.get_header_image()
-            if dialog_image and not dialog_image.isNull():
+            if dialog_image and not dialog_image.isNull() and not queue_only:
                 self.game_header_image = dialog_image
                 logger.debug("Stored header image from depot dialog")
             if not selected_depots:
-                self._reset_ui_state()
+                self._abort_depot_selection(queue_only, game_data)
                 return
 
             dest_path = None
@@ -1498,10 +1635,10 @@ class MainWindow(QMainWindow):
             logger.debug(f"SLSsteam mode: {slssteam_mode}")
 
             if slssteam_mode:
-                if self.game_data and self.game_data.get("dlcs"):
-                    dlc_dialog = DlcSelectionDialog(self.game_data["dlcs"], self)
+                if game_data and game_data.get("dlcs"):
+                    dlc_dialog = DlcSelectionDialog(game_data["dlcs"], self)
                     if dlc_dialog.exec():
-                        self.game_data["selected_dlcs"] = dlc_dialog.get_selected_dlcs()
+                        game_data["selected_dlcs"] = dlc_dialog.get_selected_dlcs()
 
                 libraries = steam_helpers.get_steam_libraries()
                 logger.debug(f"Found Steam libraries: {libraries}")
@@ -1510,7 +1647,7 @@ class MainWindow(QMainWindow):
                     if dialog.exec():
                         dest_path = dialog.get_selected_path()
                     else:
-                        self._reset_ui_state()
+                        self._abort_depot_selection(queue_only, game_data)
                         return
                 else:
                     dest_path = QFileDialog.getExistingDirectory(
@@ -1522,16 +1659,243 @@ class MainWindow(QMainWindow):
                 )
 
             if dest_path:
+                self._check_disk_space(
+                    game_data,
+                    selected_depots,
+                    dest_path,
+                    queue_only,
+                    slssteam_mode,
+                    total_game_size,
+                )
+            else:
+                self._abort_depot_selection(queue_only, game_data)
+        else:
+            self._abort_depot_selection(queue_only, game_data)
+
+    def _check_disk_space(
+        self,
+        game_data,
+        selected_depots,
+        dest_path,
+        queue_only,
+        slssteam_mode,
+        total_game_size,
+    ):
+        """
+        Run the pre-flight disk space check in the background - it decodes
+        manifests and stats installed files - and carry on with the download
+        or the queue once it is done.
+        """
+
+        def proceed(check):
+            if check is not None and not self._confirm_disk_space(check, dest_path):
+                self._abort_depot_selection(queue_only, game_data)
+            elif queue_only:
+                self._queue_download(game_data, selected_depots, dest_path)
+            else:
                 self._start_download(
                     selected_depots, dest_path, slssteam_mode, total_game_size
                 )
-            else:
-                self._reset_ui_state()
+
+        def on_error(error_info):
+            _, error_value, _ = error_info
+            logger.warning(f"Could not check free space in {dest_path}: {error_value}")
+            proceed(None)
+
+        self.log_output.append(
+            tr("MainWindow", "Checking free space in {0}...").format(dest_path)
+        )
+        self.disk_space_runner = TaskRunner()
+        worker = self.disk_space_runner.run(
+            check_disk_space, game_data, selected_depots, dest_path
+        )
+        worker.finished.connect(proceed)
+        worker.error.connect(on_error)
+
+    def _confirm_disk_space(self, check, dest_path):
+        """
+        Warn about a failed disk space check. Returns False if the user
+        gives up on the download.
+        """
+        from core.game_manager import GameManager
+
+        if check.unknown_depots:
+            logger.info(
+                f"Unknown size for depots {', '.join(check.unknown_depots)}; "
+                "the disk space check does not include them"
+            )
+        if check.enough:
+            return True
+
+        required = GameManager._format_size(check.required)
+        free = GameManager._format_size(check.free)
+        self.log_output.append(
+            tr("MainWindow", "Not enough disk space in {0}: {1} needed, {2} free").format(
+                dest_path, required, free
+            )
+        )
+        reply = QMessageBox.warning(
+            self,
+            tr("MainWindow", "Not Enough Disk Space"),
+            tr(
+                "MainWindow",
+                "The selected depots need {0} but only {1} is free in {2}.\n\nDownload anyway?",
+            ).format(required, free, dest_path),
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No,
+        )
+        return reply == QMessageBox.StandardButton.Yes
+
+    def _abort_depot_selection(self, queue_only, game_data=None):
+        self._remove_ingest_workspace(game_data)
+        if queue_only:
+            self.log_output.append(tr("MainWindow", "Nothing was added to the queue"))
         else:
             self._reset_ui_state()
 
+    def _remove_ingest_workspace(self, game_data):
+        """Remove the workspace a zip was ingested into once it is not needed"""
+        workspace = SessionWorkspace.from_game_data(game_data)
+        if workspace:
+            workspace.remove()
+            game_data.pop("ingest_workspace", None)
+
+    def _queue_download(self, game_data, selected_depots, dest_path):
+        """Add a game to the download queue while another download runs"""
+        job = self.download_queue.enqueue(game_data, selected_depots, dest_path)
+        if not job:
+            self.log_output.append(tr("MainWindow", "Failed to add download to queue"))
+            return
+        # The job keeps its own copy of the manifests
+        self._remove_ingest_workspace(game_data)
+        # Keep going through the queue once the current download finishes
+        self.download_queue.running = True
+        self.log_output.append(
+            tr("MainWindow", "{0} added to the download queue (position {1})").format(
+                job.game_name, len(self.download_queue.pending_jobs())
+            )
+        )
+
+    def _start_next_queued_job(self):
+        """Start the next queued download, if the queue is idle"""
+        if not self.download_queue.should_start_next():
+            return
+        job = self.download_queue.pending_jobs()[0]
+        self.game_data = job.game_data
+        self.game_header_image = None
+        slssteam_mode = self.settings.value("slssteam_mode", True, type=bool)
+        self.log_output.append(
+            tr("MainWindow", "Starting next queued download: {0}").format(job.game_name)
+        )
+        self._start_download(
+            job.selected_depots, job.dest_path, slssteam_mode, queued_job=job
+        )
+
+    def _open_download_queue(self):
+        """Open the download queue dialog"""
+        try:
+            from ui.download_queue_dialog import DownloadQueueDialog
+
+            dialog = DownloadQueueDialog(self.download_queue, self)
+            dialog.exec()
+        except Exception as e:
+            logger.error(f"Error opening download queue: {e}")
+            QMessageBox.critical(
+                self,
+                tr("MainWindow", "Error"),
+                tr("MainWindow", "Failed to open download queue: {0}").format(e),
+            )
+
+    def _offer_interrupted_session_resume(self):
+        """
+        Offer the interrupted download sessions for resume, newest first.
+        Declined sessions are deleted; once one is resumed, the older ones
+        stay stored and are offered again on the next start.
+        """
+        try:
+            sessions = DownloadSession.load_interrupted_sessions()
+        except Exception as e:
+            logger.warning(f"Could not load interrupted download sessions: {e}")
+            sessions = []
+
+        # Queued jobs resume their own sessions when the queue reaches them
+        queued_sessions = {
+            job.session_id for job in self.download_queue.jobs.values() if job.session_id
+        }
+        sessions = [s for s in sessions if s.session_id not in queued_sessions]
+        if not sessions:
+            self._offer_queue_start()
+            return
+
+        for index, session in enumerate(sessions):
+            game_name = session.game_data.get(
+                "game_name", tr("MainWindow", "Unknown Game")
+            )
+            message = tr(
+                "MainWindow",
+                "The download of {0} was interrupted ({1}/{2} depots completed). Resume it?",
+            ).format(
+                game_name,
+                len(session.completed_depots),
+                len(session.selected_depots),
+            )
+            if len(sessions) > 1:
+                message += tr(
+                    "MainWindow", "\n\nInterrupted download {0} of {1}."
+                ).format(index + 1, len(sessions))
+            reply = QMessageBox.question(
+                self,
+                tr("MainWindow", "Resume Download"),
+                message,
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.Yes,
+            )
+            if reply == QMessageBox.StandardButton.Yes:
+                break
+            DownloadSession.delete_session(session.session_id)
+        else:
+            self._offer_queue_start()
+            return
+
+        # The queue continues after the resumed download
+        self.download_queue.running = self.download_queue.has_pending()
+        self.game_data = session.game_data
+        self.drop_text_label.setVisible(False)
+        self.title_bar.select_file_button.setVisible(False)
+        slssteam_mode = self.settings.value("slssteam_mode", True, type=bool)
+        self._start_download(
+            session.get_remaining_depots(),
+            session.dest_path,
+            slssteam_mode,
+            resume_session_id=session.session_id,
+        )
+
+    def _offer_queue_start(self):
+        """Ask whether to continue a download queue left from a previous run"""
+        pending = self.download_queue.pending_jobs()
+        if not pending:
+            return
+        reply = QMessageBox.question(
+            self,
+            tr("MainWindow", "Download Queue"),
+            tr("MainWindow", "{0} downloads are waiting in the queue. Start them now?").format(
+                len(pending)
+            ),
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes,
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self.download_queue.running = True
+            self._start_next_queued_job()
+
     def _start_download(
-        self, selected_depots, dest_path, slssteam_mode, total_game_size=0
+        self,
+        selected_depots,
+        dest_path,
+        slssteam_mode,
+        total_game_size=0,
+        resume_session_id=None,
+        queued_job=None,
     ):
         # Check SLSsteam prerequisite before starting download
         if not self._check_slssteam_prerequisite():
@@ -1543,6 +1907,7 @@ class MainWindow(QMainWindow):
 
         # Reset completion message control for new download
         self._completion_message_shown = False
+        self._depot_percentages = {}
         if hasattr(self, "_fix_applied_recently"):
             delattr(self, "_fix_applied_recently")
 
@@ -1617,10 +1982,17 @@ class MainWindow(QMainWindow):
         self.minimal_download_widget.set_download_size(total_size)
 
         # Start download using NEW DownloadManager
-        if self.game_data:
+        if queued_job:
+            session_id = self.download_queue.start_job(queued_job)
+        elif resume_session_id:
+            session_id = self.download_manager.resume_session(resume_session_id)
+        elif self.game_data:
             session_id = self.download_manager.start_download(
                 self.game_data, selected_depots, dest_path
             )
+            if session_id:
+                # The session workspace now holds everything the download needs
+                self._remove_ingest_workspace(self.game_data)
         else:
             session_id = None
 
@@ -1812,10 +2184,17 @@ class MainWindow(QMainWindow):
             self.zip_task = None
         if hasattr(self, "task_runner"):
             self.task_runner = None
-        self._reset_ui_state()
-        self._stop_speed_monitor()
+        # A failed zip for the queue must not disturb the running download
+        if not self.download_queue.is_download_active():
+            self._reset_ui_state()
+            self._stop_speed_monitor()
 
     def _reset_ui_state(self):
+        # Delayed resets from a finished download must not hit the next one
+        if self.download_queue.is_download_active():
+            logger.debug("Download in progress, keeping download UI")
+            return
+
         if not self.main_pixmap.isNull():
             self.drop_label.setPixmap(self.main_pixmap)
             self.current_pixmap = self.main_pixmap
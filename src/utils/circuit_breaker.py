@@ -0,0 +1,66 @@
+"""
+Circuit Breaker - Stop calling a failing source until it recovers
+"""
+
+import threading
+import time
+
+from utils.logger import get_internationalized_logger
+
+logger = get_internationalized_logger()
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failures of one source.
+
+    After ``failure_threshold`` failures in a row the circuit opens and
+    allow() returns False, so callers skip the source instead of waiting
+    on its timeouts. Once ``reset_timeout`` seconds have passed a single
+    probe call is let through: a success closes the circuit again, a
+    failure keeps it open for another reset_timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 60):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether the source may be called now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Let one probe through; others keep skipping until it reports
+                self.state = self.HALF_OPEN
+                logger.debug(f"Circuit '{self.name}' half-open, probing the source")
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit '{self.name}' closed, source recovered")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        f"Circuit '{self.name}' open after {self.failures} failures, "
+                        f"skipping it for {self.reset_timeout:.0f}s"
+                    )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
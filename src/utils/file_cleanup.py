@@ -23,6 +23,9 @@ class FileCleanupManager:
         ]
         self.temp_files = ["keys.vdf", "manifest", "appinfo.vdf"]
         self.temp_directories = ["temp", "cache", "tmp"]
+        # Session and queue workspaces hold manifests that other downloads
+        # still need; they are removed by their owners
+        self.protected_directories = [os.path.abspath("data")]
         # Additional patterns for DepotDownloaderMod files
         self.depotdownloader_patterns = [
             # Files that can be created during download
@@ -131,6 +134,8 @@ class FileCleanupManager:
                         if self._is_partial_file(entry.name, session_id):
                             files_to_remove.append(entry.path)
                     elif entry.is_dir():
+                        if os.path.abspath(entry.path) in self.protected_directories:
+                            continue
                         subdirs.append(entry.path)
 
                 # Remover arquivos parciais
@@ -0,0 +1,170 @@
+"""
+HTTP Client - Shared pooled HTTP layer with concurrency and rate limits
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from utils.logger import get_internationalized_logger
+
+logger = get_internationalized_logger()
+
+# Connections kept alive per host, and hosts with a pool
+POOL_SIZE = 10
+POOL_HOSTS = 20
+# Requests in flight across the whole application
+MAX_IN_FLIGHT = 16
+# Requests per second and burst size per host; the Store API throttles
+# to roughly 200 requests per 5 minutes
+HOST_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "store.steampowered.com": (0.6, 10),
+}
+# Base URL of a local stub server every request is sent to, when set
+STUB_SERVER_ENV_VAR = "BIFROST_HTTP_STUB"
+
+
+class TokenBucket:
+    """Allows ``rate`` acquisitions per second with bursts of ``capacity``"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns the wait."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class LocalServerTransport(HTTPAdapter):
+    """
+    Sends every request to a local server instead of its real host,
+    keeping the path and query, so a stub server can stand in for the
+    Steam and GitHub endpoints.
+    """
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.netloc = parts.netloc
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = urlunsplit((self.scheme, self.netloc, parts.path, parts.query, parts.fragment))
+        return super().send(request, **kwargs)
+
+
+class HttpClient:
+    """
+    One requests session for the whole application.
+
+    Connections are pooled and kept alive per host, at most
+    ``max_in_flight`` requests run at once, and hosts listed in
+    ``rate_limits`` are throttled by a token bucket each, so bursts of
+    lookups queue up locally instead of getting the client rate limited.
+    Per-host metrics (requests, errors, time spent waiting and in flight,
+    bytes) are kept for diagnostics.
+
+    The transport is pluggable: any requests adapter can be given at
+    construction or mounted for a URL prefix later.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        pool_size: int = POOL_SIZE,
+        rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        transport: Optional[BaseAdapter] = None,
+    ):
+        self.session = requests.Session()
+        adapter = transport or HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._buckets = {
+            host: TokenBucket(rate, capacity)
+            for host, (rate, capacity) in (rate_limits or {}).items()
+        }
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._metrics_lock = threading.Lock()
+
+    def mount(self, prefix: str, adapter: BaseAdapter):
+        """Use adapter for every URL starting with prefix"""
+        self.session.mount(prefix, adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request; takes the same arguments as requests.request.
+
+        For streamed responses the in-flight slot is released once the
+        headers have arrived.
+        """
+        host = urlsplit(url).hostname or ""
+        bucket = self._buckets.get(host)
+        waited = bucket.acquire() if bucket else 0.0
+
+        with self._in_flight:
+            start = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException:
+                self._record(host, waited, time.monotonic() - start, 0, error=True)
+                raise
+
+        size = 0 if kwargs.get("stream") else len(response.content)
+        self._record(host, waited, time.monotonic() - start, size, error=response.status_code >= 400)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request("HEAD", url, **kwargs)
+
+    def _record(self, host: str, waited: float, elapsed: float, size: int, error: bool):
+        with self._metrics_lock:
+            metrics = self._metrics.setdefault(
+                host,
+                {"requests": 0, "errors": 0, "throttled": 0, "wait_time": 0.0, "time": 0.0, "bytes": 0},
+            )
+            metrics["requests"] += 1
+            metrics["errors"] += int(error)
+            metrics["throttled"] += int(waited > 0)
+            metrics["wait_time"] += waited
+            metrics["time"] += elapsed
+            metrics["bytes"] += size
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-host request metrics since startup"""
+        with self._metrics_lock:
+            return {host: dict(metrics) for host, metrics in self._metrics.items()}
+
+    def close(self):
+        self.session.close()
+
+
+http_client = HttpClient(rate_limits=HOST_RATE_LIMITS)
+if os.environ.get(STUB_SERVER_ENV_VAR):
+    http_client.mount("http://", LocalServerTransport(os.environ[STUB_SERVER_ENV_VAR]))
+    http_client.mount("https://", LocalServerTransport(os.environ[STUB_SERVER_ENV_VAR]))
@@ -14,6 +14,7 @@ from typing import Any, Dict, Optional
 import requests
 from PyQt6.QtCore import QObject, QThread, pyqtSignal
 from PyQt6.QtGui import QPixmap
+from utils.http_client import http_client
 from utils.logger import get_internationalized_logger
 
 logger = get_internationalized_logger("ImageCache")
@@ -195,7 +196,7 @@ class ImageCacheManager(QObject):
 
             headers = {"User-Agent": "Bifrost/1.0 (Steam Game Manager)"}
 
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = http_client.get(url, headers=headers, timeout=timeout)
             response.raise_for_status()
 
             # Create pixmap from downloaded data first
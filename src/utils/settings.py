@@ -58,6 +58,30 @@ LOGGING_SETTINGS = {
     },
 }
 
+# --- Download Settings ---
+DOWNLOAD_SETTINGS = {
+    "max_parallel_depots": {
+        "default": 3,
+        "type": int,
+        "description": "Maximum number of DepotDownloaderMod processes running at once",
+    },
+    "connection_budget": {
+        "default": 25,
+        "type": int,
+        "description": "Total download connections shared by all running depot processes",
+    },
+    "preallocate_files": {
+        "default": False,
+        "type": bool,
+        "description": "Reserve disk space for large files before they are downloaded",
+    },
+    "incremental_updates": {
+        "default": True,
+        "type": bool,
+        "description": "Update installed depots by downloading only the files their new manifest changed",
+    },
+}
+
 
 def get_settings():
     """
@@ -264,3 +288,59 @@ def set_logging_setting(key, value):
 
     settings.setValue(f"logging/{key}", value)
     settings.sync()
+
+
+def get_download_setting(key, default=None):
+    """
+    Get a download setting with proper type conversion.
+
+    Args:
+        key (str): Setting key
+        default: Default value if setting not found
+
+    Returns:
+        Setting value with proper type
+    """
+    settings = get_settings()
+    setting_config = DOWNLOAD_SETTINGS.get(key, {})
+
+    if not setting_config:
+        return default
+
+    value = settings.value(f"download/{key}", setting_config["default"])
+
+    # Type conversion
+    if setting_config["type"] is bool:
+        # INI-backed settings come back as the strings "true"/"false"
+        if isinstance(value, str):
+            return value.lower() in ("true", "1")
+        return bool(value)
+    elif setting_config["type"] is int:
+        try:
+            return int(value) if value is not None else setting_config["default"]
+        except (TypeError, ValueError):
+            return setting_config["default"]
+    else:
+        return value
+
+
+def set_download_setting(key, value):
+    """
+    Set a download setting.
+
+    Args:
+        key (str): Setting key
+        value: Setting value
+    """
+    settings = get_settings()
+    setting_config = DOWNLOAD_SETTINGS.get(key, {})
+
+    if setting_config:
+        # Type validation
+        if setting_config["type"] is bool and not isinstance(value, bool):
+            value = bool(value)
+        elif setting_config["type"] is int and not isinstance(value, int):
+            value = int(value) if value is not None else setting_config["default"]
+
+    settings.setValue(f"download/{key}", value)
+    settings.sync()